@@ -2,46 +2,88 @@ from vector_db_pipeline import logger
 from vector_db_pipeline.pipeline.DataIngestion import DataIngestionPipeline
 from vector_db_pipeline.pipeline.DataValidation import DataValidationPipeline
 from vector_db_pipeline.pipeline.DataUpload import DataUploadPipeline
+from vector_db_pipeline.pipeline.StreamingUpload import StreamingUploadPipeline
+from vector_db_pipeline.pipeline.VectorExpiry import VectorExpiryPipeline
+from vector_db_pipeline.pipeline.CostEstimate import CostEstimatePipeline
 from vector_db_pipeline.utils.common import read_yaml
 from vector_db_pipeline.constants import *
 
 
+if __name__ == '__main__':
+    params = read_yaml(PARAMS_FILE_PATH)
+    delete_vector_database = params.DELETE_DATABSE.DELETE_DATABSE
 
+    if params.COST_ESTIMATE.DRY_RUN:
+        STAGE_NAME = "Cost estimate stage"
+        try:
+            logger.info(f">>>>>>> stage {STAGE_NAME} started <<<<<<<<<<<<")
+            cost_estimate = CostEstimatePipeline()
+            cost_estimate.main()
+            logger.info(f">>>>>>> stage {STAGE_NAME} completed <<<<<<<<<<<<\n\nx===============x")
 
-STAGE_NAME = "Data Ingestion stage"
-try:
-    logger.info(f">>>>>>> stage {STAGE_NAME} started <<<<<<<<<<<<")
-    data_ingestion = DataIngestionPipeline()
-    data_ingestion.main()
-    logger.info(f">>>>>>> stage {STAGE_NAME} completed <<<<<<<<<<<<\n\nx===============x")
+        except Exception as e:
+            logger.error(e)
+            raise(e)
 
-except Exception as e:
-    logger.error(e)
-    raise(e)
+    elif params.STREAMING.ENABLED:
+        STAGE_NAME = "Streaming ingestion to upload stage"
+        try:
+            logger.info(f">>>>>>> stage {STAGE_NAME} started <<<<<<<<<<<<")
+            streaming_upload = StreamingUploadPipeline(should_restart_database=delete_vector_database)
+            streaming_upload.main()
+            logger.info(f">>>>>>> stage {STAGE_NAME} completed <<<<<<<<<<<<\n\nx===============x")
 
+        except Exception as e:
+            logger.error(e)
+            raise(e)
 
-STAGE_NAME = "Data Validation stage"
+    else:
+        STAGE_NAME = "Data Ingestion stage"
+        try:
+            logger.info(f">>>>>>> stage {STAGE_NAME} started <<<<<<<<<<<<")
+            data_ingestion = DataIngestionPipeline()
+            data_ingestion.main()
+            logger.info(f">>>>>>> stage {STAGE_NAME} completed <<<<<<<<<<<<\n\nx===============x")
 
-try:
-    logger.info(f">>>>>>> stage {STAGE_NAME} started <<<<<<<<<<<<")
-    data_val = DataValidationPipeline()
-    data_val.main()
-    logger.info(f">>>>>>> stage {STAGE_NAME} completed <<<<<<<<<<<<\n\nx===============x")
+        except Exception as e:
+            logger.error(e)
+            raise(e)
 
-except Exception as e:
-    logger.error(e)
-    raise(e)
 
-STAGE_NAME = "Data Upload stage"
+        STAGE_NAME = "Data Validation stage"
 
-try: 
-    params = read_yaml(PARAMS_FILE_PATH)
-    delete_vector_database = params.DELETE_DATABSE.DELETE_DATABSE
-    logger.info(f">>>>>>> stage {STAGE_NAME} started <<<<<<<<<<<<")
-    data_upload = DataUploadPipeline(should_restart_database=delete_vector_database)
-    data_upload.main()
-    logger.info(f">>>>>>> stage {STAGE_NAME} completed <<<<<<<<<<<<\n\nx===============x")
-
-except Exception as e:
-    logger.error(e)
-    raise(e)
\ No newline at end of file
+        try:
+            logger.info(f">>>>>>> stage {STAGE_NAME} started <<<<<<<<<<<<")
+            data_val = DataValidationPipeline()
+            data_val.main()
+            logger.info(f">>>>>>> stage {STAGE_NAME} completed <<<<<<<<<<<<\n\nx===============x")
+
+        except Exception as e:
+            logger.error(e)
+            raise(e)
+
+        STAGE_NAME = "Data Upload stage"
+
+        try:
+            logger.info(f">>>>>>> stage {STAGE_NAME} started <<<<<<<<<<<<")
+            data_upload = DataUploadPipeline(should_restart_database=delete_vector_database)
+            data_upload.main()
+            logger.info(f">>>>>>> stage {STAGE_NAME} completed <<<<<<<<<<<<\n\nx===============x")
+
+        except Exception as e:
+            logger.error(e)
+            raise(e)
+
+
+    if params.RETENTION.ENABLED and not params.COST_ESTIMATE.DRY_RUN:
+        STAGE_NAME = "Vector expiry stage"
+
+        try:
+            logger.info(f">>>>>>> stage {STAGE_NAME} started <<<<<<<<<<<<")
+            vector_expiry = VectorExpiryPipeline()
+            vector_expiry.main()
+            logger.info(f">>>>>>> stage {STAGE_NAME} completed <<<<<<<<<<<<\n\nx===============x")
+
+        except Exception as e:
+            logger.error(e)
+            raise(e)
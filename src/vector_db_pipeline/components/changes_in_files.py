@@ -3,13 +3,20 @@ from vector_db_pipeline.utils.common import read_yaml, create_directories, load_
 from vector_db_pipeline import logger
 import os
 import json
-from hashlib import md5
+import time
+from concurrent.futures import ThreadPoolExecutor
+from hashlib import blake2b, md5
 from pathlib import Path
+from typing import Optional
 from vector_db_pipeline.entity.config_entity import ConfigFileChanges
 
 """
 A class to monitor and manage the state of files in a directory.
 
+The state keeps the size, modification time and BLAKE2b hash of every monitored file. A file is only
+read again when its size or modification time changed, and hashing streams the file in blocks across
+WORKERS threads. State files written with MD5 strings per file are still read and compared.
+
 Attributes:
     config (ConfigFileChanges): Configuration object containing paths and file monitoring settings.
     dir_to_monitor (str): Directory path to monitor for file changes.
@@ -17,13 +24,20 @@ Attributes:
     app_files (set): Set of files to monitor in the specified directory.
 
 Methods:
-    get_file_md5(file_path): Computes the MD5 hash of a file.
-    save_directory_state(): Saves the current state of the monitored directory to a file.
+    get_file_md5(file_path, block_size): Computes the MD5 hash of a file, as in the legacy state format.
+    get_file_hash(file_path, block_size): Computes the BLAKE2b hash of a file.
+    file_entry(file_path, previous): Returns the state entry of a file, hashing it only if its stat changed.
+    scan_directory(previous_state): Returns the state of every monitored file.
+    save_directory_state(state): Saves the state of the monitored directory to a file.
     load_directory_state(state_file): Loads the state of the monitored directory from a file.
+    file_changed(file, old_entry, new_entry): Checks whether the content of a file differs between two entries.
     compare_states(old_state, new_state): Compares old and new directory states and classifies changes.
     monitor_directory(): Monitors the directory and reports changes.
 """
 
+# Files modified this close to the scan may change again within the same mtime tick, so they are hashed next time too
+_RACY_WINDOW_NS = 2 * 10**9
+
 
 class FilesState:
     def __init__(self, config:ConfigFileChanges):
@@ -34,36 +48,98 @@ class FilesState:
 
 
     @staticmethod
-    def get_file_md5(file_path):
+    def get_file_md5(file_path, block_size: int = 1 << 20):
         """
-        Compute the MD5 hash of the file.
+        Compute the MD5 hash of the file, the hash of the legacy state format.
 
         Args:
             file_path (str): Path of the file to compute the MD5 hash for.
+            block_size (int, optional): Bytes read at a time. Defaults to 1 MiB.
 
         Returns:
             str: MD5 hash of the file.
         """
         hasher = md5()
         with open(file_path, 'rb') as f:
-            buf = f.read()
-            hasher.update(buf)
+            for block in iter(lambda: f.read(block_size), b''):
+                hasher.update(block)
         return hasher.hexdigest()
 
+    @staticmethod
+    def get_file_hash(file_path, block_size: int = 1 << 20):
+        """
+        Compute the BLAKE2b hash of the file, reading it in blocks.
+
+        Args:
+            file_path (str): Path of the file to hash.
+            block_size (int, optional): Bytes read at a time. Defaults to 1 MiB.
+
+        Returns:
+            str: BLAKE2b hash of the file.
+        """
+        hasher = blake2b(digest_size=16)
+        with open(file_path, 'rb') as f:
+            for block in iter(lambda: f.read(block_size), b''):
+                hasher.update(block)
+        return hasher.hexdigest()
 
-    def save_directory_state(self):
+    def file_entry(self, file_path, previous=None) -> Optional[dict]:
         """
-        Save the current state of the directory to a file.
+        Returns the state entry of a file, reusing the previous hash when its size and modification time did not change.
+
+        Args:
+            file_path (str): Path of the file.
+            previous (dict or str, optional): Previous entry of the file; legacy MD5 strings are always re-hashed.
 
-        This method computes the MD5 hashes of the monitored files and saves the current state
-        to the specified state file in JSON format.
+        Returns:
+            dict or None: {'size', 'mtime_ns', 'blake2b'}, None if the file does not exist.
+        """
+        try:
+            stat = os.stat(file_path)
+        except FileNotFoundError:
+            return None
+        if (isinstance(previous, dict) and previous.get('size') == stat.st_size
+                and previous.get('mtime_ns') == stat.st_mtime_ns):
+            return previous
+        entry = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns,
+                 'blake2b': self.get_file_hash(file_path, self.config.block_size)}
+        if stat.st_mtime_ns > time.time_ns() - _RACY_WINDOW_NS:
+            entry['mtime_ns'] = None
+        return entry
+
+    def scan_directory(self, previous_state: Optional[dict] = None) -> dict:
         """
-        current_state = {}
-       
-        for file in self.app_files:
-            current_state[file] = self.get_file_md5(file)
-        with open(self.state_file, 'w') as f:
-            json.dump(current_state, f, indent=4)
+        Returns the state of every monitored file, hashing only files whose stat changed.
+
+        Args:
+            previous_state (dict, optional): State loaded from the state file.
+
+        Returns:
+            dict: Entry per existing monitored file.
+        """
+        previous_state = previous_state or {}
+        files = sorted(self.app_files)
+        with ThreadPoolExecutor(max_workers=self.config.workers) as executor:
+            entries = executor.map(lambda file: self.file_entry(file, previous_state.get(file)), files)
+            state = {file: entry for file, entry in zip(files, entries) if entry is not None}
+        missing = len(files) - len(state)
+        if missing:
+            logger.warning(f"{missing} monitored files do not exist")
+        return state
+
+    def save_directory_state(self, state: Optional[dict] = None):
+        """
+        Save the state of the directory to a file.
+
+        Args:
+            state (dict, optional): State computed by scan_directory; the directory is scanned when omitted.
+        """
+        if state is None:
+            state = self.scan_directory(self.load_directory_state(self.state_file))
+        tmp_file = f"{self.state_file}.tmp"
+        with open(tmp_file, 'w') as f:
+            json.dump(state, f, indent=4)
+        os.replace(tmp_file, self.state_file)
 
     @staticmethod
     def load_directory_state(state_file):
@@ -81,6 +157,22 @@ class FilesState:
         with open(state_file, 'r') as f:
             return json.load(f)
 
+    def file_changed(self, file, old_entry, new_entry) -> bool:
+        """
+        Checks whether the content of a file differs between two state entries.
+
+        Args:
+            file (str): Path of the file.
+            old_entry (dict or str): Previous entry; legacy MD5 strings are compared with the MD5 of the file.
+            new_entry (dict): Current entry.
+
+        Returns:
+            bool: True if the content changed.
+        """
+        if isinstance(old_entry, str):
+            # Legacy state files store the MD5 hash of each file
+            return old_entry != self.get_file_md5(file, self.config.block_size)
+        return old_entry.get('blake2b') != new_entry['blake2b']
 
     def compare_states(self,old_state, new_state):
         """
@@ -92,6 +184,9 @@ class FilesState:
         Args:
             old_state (dict): The old state of the directory.
             new_state (dict): The new state of the directory.
+
+        Returns:
+            dict: Lists of 'added_files', 'deleted_files' and 'changed_files'.
         """
         old_files = set(old_state.keys())
         new_files = set(new_state.keys())
@@ -101,38 +196,36 @@ class FilesState:
         common_files = old_files & new_files
 
         changed_files = {
-            file for file in common_files if old_state[file] != new_state[file]
+            file for file in common_files if self.file_changed(file, old_state[file], new_state[file])
         }
         
 
         changes = {
-            'added_files': list(added_files),
-            'deleted_files': list(deleted_files),
-            'changed_files': list(changed_files),
+            'added_files': sorted(added_files),
+            'deleted_files': sorted(deleted_files),
+            'changed_files': sorted(changed_files),
         }
 
         with open(self.config.updated_files, 'w') as f:
             json.dump(changes, f, indent=4)
-
-       
+        return changes
 
     def monitor_directory(self):
         """
         Monitor the directory and report changes.
 
-        This method loads the old state of the directory, computes the new state,
-        compares the two states to identify changes, and saves the updated state.
+        This method loads the old state of the directory, computes the new state once,
+        compares the two states to identify changes, and saves the new state.
+
+        Returns:
+            dict: Changes written to the updated files path.
         """
+        start = time.perf_counter()
         old_state = self.load_directory_state(self.state_file)
-        new_state = {}
- 
-        for file in self.app_files:
-            new_state[file] = self.get_file_md5(file)
-    
- 
-
-        self.compare_states(old_state, new_state)
-        self.save_directory_state()
-
-
-
+        new_state = self.scan_directory(old_state)
+        changes = self.compare_states(old_state, new_state)
+        self.save_directory_state(new_state)
+        logger.info(f"{len(new_state)} files scanned in {time.perf_counter() - start:.3f} seconds: "
+                    f"{len(changes['added_files'])} added, {len(changes['deleted_files'])} deleted, "
+                    f"{len(changes['changed_files'])} changed")
+        return changes
@@ -0,0 +1,140 @@
+from vector_db_pipeline import logger
+from pathlib import Path
+from typing import Dict, List, Optional
+import threading
+import sqlite3
+import json
+import zlib
+import os
+
+
+"""
+Local compressed key-value store of the vector metadata fields kept out of the index.
+
+Each vector maps to a zlib compressed JSON object holding the offloaded fields, e.g. the chunk text, so the
+index only stores compact metadata and the query API hydrates results in bulk. Entries are keyed by index,
+namespace and vector id, so namespaces and blue/green targets holding the same ids keep their own fields.
+Stores written before entries were scoped keep their unscoped 'chunks' table, which reads fall back to.
+
+Attributes:
+    store_file (Path): SQLite file of the store.
+
+Methods:
+    put_many(fields_by_id, index_name, namespace): Stores the offloaded fields of many vectors of a namespace.
+    get_many(ids, index_name, namespaces): Returns the offloaded fields of many vectors.
+    delete_many(ids, index_name, namespace): Removes vectors of a namespace from the store.
+    delete_namespaces(index_name, namespaces): Removes every vector of an index or of some of its namespaces.
+"""
+
+# Bound on the number of SQL variables per statement
+_BATCH = 500
+
+
+class ChunkStore:
+    def __init__(self, store_file: Path, compression_level: int = 6):
+        """
+        Opens the store, creating it if needed.
+
+        Args:
+            store_file (Path): SQLite file of the store.
+            compression_level (int, optional): zlib compression level. Defaults to 6.
+        """
+        self.store_file = store_file
+        self.compression_level = compression_level
+        self._lock = threading.Lock()
+        os.makedirs(Path(store_file).parent, exist_ok=True)
+        self._db = sqlite3.connect(str(store_file), check_same_thread=False)
+        self._db.execute("CREATE TABLE IF NOT EXISTS scoped_chunks (index_name TEXT, namespace TEXT, id TEXT, "
+                         "payload BLOB, PRIMARY KEY (index_name, namespace, id))")
+        self._db.commit()
+        self._legacy = self._db.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table' AND name = 'chunks'"
+        ).fetchone() is not None
+
+    def put_many(self, fields_by_id: Dict[str, dict], index_name: str, namespace: str):
+        """
+        Stores the offloaded fields of many vectors of a namespace, replacing previous values.
+
+        Args:
+            fields_by_id (dict): Offloaded fields per vector id.
+            index_name (str): Index the vectors are upserted to.
+            namespace (str): Namespace the vectors are upserted to.
+        """
+        rows = [(index_name, namespace, vector_id,
+                 zlib.compress(json.dumps(fields, default=str).encode('utf-8'), self.compression_level))
+                for vector_id, fields in fields_by_id.items()]
+        with self._lock:
+            self._db.executemany("INSERT OR REPLACE INTO scoped_chunks (index_name, namespace, id, payload) "
+                                 "VALUES (?, ?, ?, ?)", rows)
+            self._db.commit()
+
+    def get_many(self, ids: List[str], index_name: str, namespaces: List[str]) -> Dict[str, dict]:
+        """
+        Returns the offloaded fields of many vectors.
+
+        Args:
+            ids (List[str]): Vector ids.
+            index_name (str): Index the vectors were read from.
+            namespaces (List[str]): Namespaces the vectors may come from, the first match winning.
+
+        Returns:
+            dict: Offloaded fields per vector id. Ids missing from the store are skipped.
+        """
+        ids = list(dict.fromkeys(ids))
+        namespaces = list(dict.fromkeys(namespaces))
+        payloads = {}
+        with self._lock:
+            for start in range(0, len(ids), _BATCH):
+                batch = ids[start:start + _BATCH]
+                rows = self._db.execute(
+                    f"SELECT namespace, id, payload FROM scoped_chunks WHERE index_name = ? "
+                    f"AND namespace IN ({','.join('?' * len(namespaces))}) AND id IN ({','.join('?' * len(batch))})",
+                    [index_name, *namespaces, *batch]
+                ).fetchall()
+                # Earlier namespaces are applied last, so they win
+                for namespace, vector_id, payload in sorted(rows, key=lambda row: -namespaces.index(row[0])):
+                    payloads[vector_id] = payload
+            missing = [vector_id for vector_id in ids if vector_id not in payloads] if self._legacy else []
+            for start in range(0, len(missing), _BATCH):
+                batch = missing[start:start + _BATCH]
+                rows = self._db.execute(
+                    f"SELECT id, payload FROM chunks WHERE id IN ({','.join('?' * len(batch))})", batch
+                ).fetchall()
+                payloads.update(rows)
+        return {vector_id: json.loads(zlib.decompress(payload).decode('utf-8')) for vector_id, payload in payloads.items()}
+
+    def delete_many(self, ids: List[str], index_name: str, namespace: str):
+        """
+        Removes vectors of a namespace from the store. Other namespaces keep their entries for the same ids.
+
+        Args:
+            ids (List[str]): Vector ids.
+            index_name (str): Index the vectors were deleted from.
+            namespace (str): Namespace the vectors were deleted from.
+        """
+        ids = list(ids)
+        with self._lock:
+            for start in range(0, len(ids), _BATCH):
+                batch = ids[start:start + _BATCH]
+                self._db.execute(f"DELETE FROM scoped_chunks WHERE index_name = ? AND namespace = ? "
+                                 f"AND id IN ({','.join('?' * len(batch))})", [index_name, namespace, *batch])
+            self._db.commit()
+        if ids:
+            logger.info(f"Removed {len(ids)} vectors of '{index_name}'/'{namespace}' from the chunk store")
+
+    def delete_namespaces(self, index_name: str, namespaces: Optional[List[str]] = None):
+        """
+        Removes every vector of the given namespaces, or of the whole index, from the store.
+
+        Args:
+            index_name (str): Index that was deleted or emptied.
+            namespaces (List[str], optional): Namespaces that were deleted. Defaults to every namespace.
+        """
+        with self._lock:
+            if namespaces is None:
+                self._db.execute("DELETE FROM scoped_chunks WHERE index_name = ?", [index_name])
+            else:
+                for namespace in namespaces:
+                    self._db.execute("DELETE FROM scoped_chunks WHERE index_name = ? AND namespace = ?",
+                                     [index_name, namespace])
+            self._db.commit()
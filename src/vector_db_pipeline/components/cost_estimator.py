@@ -0,0 +1,238 @@
+from vector_db_pipeline.entity.config_entity import CostEstimateConfig, StreamingConfig, JsonSummaryConfig
+from vector_db_pipeline.components.data_ingestion import TextProcessor
+from vector_db_pipeline.components.lineage_store import text_hash
+from vector_db_pipeline.utils.common import (list_files_in_directory, iter_sourced_records, count_tokens_batch,
+                                             load_set)
+from vector_db_pipeline import logger
+from pathlib import Path
+from typing import Iterator, List, Tuple
+import math
+import json
+import os
+
+
+"""
+Estimates the tokens, requests, cost and wall time of the ingestion and summarization stages without
+calling any model.
+
+Ingestion inputs are streamed from the data directory and chunked by the configured TextProcessor, so
+chunk counts follow TEXT_SPLITER and NORMALIZATION. In batch mode, chunks whose text is already in the
+lineage store are predicted as reused embeddings. Summarization counts the files of files_to_read.json
+through the generation and routing agents, and through the feedback and rewrite agents for the share
+EDIT_RATE of drafts. Tokens are counted with tiktoken, COUNT_BATCH_SIZE texts at a time on WORKERS threads.
+
+The wall time of a stage is the largest of its request latency over its concurrency and the time needed
+to stay under its requests and tokens per minute limits.
+
+Attributes:
+    config (CostEstimateConfig): Prices, rate limits and counting settings.
+    text_processor (TextProcessor): Chunks the ingestion inputs.
+    streaming_config (StreamingConfig): Decides how chunks are grouped into embedding requests.
+    json_summary_config (JsonSummaryConfig): Prompts, model and file list of the summarization stage.
+
+Methods:
+    estimate_ingestion(): Estimates the embedding tokens, requests, cost and wall time of ingestion.
+    estimate_summaries(): Estimates the LLM tokens, requests, cost and wall time of summarization.
+    wall_time(requests, tokens, limits, concurrency): Returns the expected duration of a stage.
+    run(): Writes both estimates to the report file.
+"""
+
+
+class CostEstimator:
+    def __init__(self, config: CostEstimateConfig, text_processor: TextProcessor, streaming_config: StreamingConfig,
+                 json_summary_config: JsonSummaryConfig):
+        """
+        Initializes the estimator.
+
+        Args:
+            config (CostEstimateConfig): Prices, rate limits and counting settings.
+            text_processor (TextProcessor): Chunks the ingestion inputs.
+            streaming_config (StreamingConfig): Decides how chunks are grouped into embedding requests.
+            json_summary_config (JsonSummaryConfig): Prompts, model and file list of the summarization stage.
+        """
+        self.config = config
+        self.text_processor = text_processor
+        self.streaming_config = streaming_config
+        self.json_summary_config = json_summary_config
+
+    @staticmethod
+    def wall_time(requests: float, tokens: float, limits: dict, concurrency: int = 1) -> float:
+        """
+        Returns the expected duration of a stage in seconds.
+
+        Args:
+            requests (float): Number of model requests.
+            tokens (float): Tokens counted against the tokens per minute limit.
+            limits (dict): LATENCY, REQUESTS_PER_MINUTE and TOKENS_PER_MINUTE of the model.
+            concurrency (int, optional): Requests in flight. Defaults to 1.
+
+        Returns:
+            float: Seconds.
+        """
+        return max(requests * limits.LATENCY / max(1, concurrency),
+                   requests / limits.REQUESTS_PER_MINUTE * 60,
+                   tokens / limits.TOKENS_PER_MINUTE * 60)
+
+    def _chunk_batches(self) -> Iterator[List[Tuple[int, str]]]:
+        # Yields (record position, chunk text) batches while streaming the data files
+        json_files = list_files_in_directory(Path(self.text_processor.config.local_data_file))
+        batch = []
+        for position, (_, _, record) in enumerate(iter_sourced_records(sorted(json_files))):
+            chunks, _ = self.text_processor.chunk_record(record)
+            batch.extend((position, chunk['text']) for chunk in chunks)
+            if len(batch) >= self.config.count_batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def estimate_ingestion(self) -> dict:
+        """
+        Estimates the embedding tokens, requests, cost and wall time of ingestion.
+
+        Batch ingestion sends one request per record with chunks to embed and reuses the embeddings of
+        known chunk texts; streaming ingestion sends one request per EMBED_BATCH_SIZE chunks from
+        EMBED_WORKERS threads and embeds every chunk.
+
+        Returns:
+            dict: Chunk, token and request counts, cost in dollars and wall time in seconds.
+        """
+        limits = self.config.embedding
+        model = self.text_processor.config.embedding_model
+        streaming = self.streaming_config.enabled
+        lineage = self.text_processor.lineage if not streaming and self.text_processor.reuse_enabled() else None
+        estimate = {'chunks': 0, 'tokens': 0, 'reused_chunks': 0, 'reused_tokens': 0, 'oversized_chunks': 0}
+        records = set()
+        embedding_records = set()
+
+        for batch in self._chunk_batches():
+            texts = [text for _, text in batch]
+            tokens = count_tokens_batch(texts, model, self.config.workers)
+            reusable = {}
+            if lineage is not None:
+                hashes = [text_hash(text) for text in texts]
+                known = lineage.reusable(hashes, self.text_processor.model_name)
+                reusable = {position: hashed in known for position, hashed in enumerate(hashes)}
+            for position, ((record, _), n_tokens) in enumerate(zip(batch, tokens)):
+                records.add(record)
+                estimate['chunks'] += 1
+                estimate['tokens'] += n_tokens
+                estimate['oversized_chunks'] += int(n_tokens > limits.MAX_INPUT_TOKENS)
+                if reusable.get(position):
+                    estimate['reused_chunks'] += 1
+                    estimate['reused_tokens'] += n_tokens
+                else:
+                    embedding_records.add(record)
+
+        embedded_chunks = estimate['chunks'] - estimate['reused_chunks']
+        embedded_tokens = estimate['tokens'] - estimate['reused_tokens']
+        if streaming:
+            requests = math.ceil(embedded_chunks / self.streaming_config.embed_batch_size)
+            concurrency = self.streaming_config.embed_workers
+        else:
+            requests = len(embedding_records)
+            concurrency = 1
+        estimate.update({
+            'mode': 'streaming' if streaming else 'batch',
+            'model': model,
+            'records': len(records),
+            'embedded_tokens': embedded_tokens,
+            'requests': requests,
+            'cost': embedded_tokens / 1000 * limits.PRICE_PER_1K_TOKENS,
+            'wall_time_seconds': self.wall_time(requests, embedded_tokens, limits, concurrency)
+        })
+        if estimate['oversized_chunks']:
+            logger.warning(f"{estimate['oversized_chunks']} chunks exceed the {limits.MAX_INPUT_TOKENS} "
+                           f"input tokens of {model}")
+        return estimate
+
+    @staticmethod
+    def _read_text(file_path: str) -> str:
+        # The summarization stage reads files through read_file_with_encodings, which latin-1 always decodes
+        try:
+            with open(file_path, 'rb') as f:
+                content = f.read()
+        except OSError:
+            logger.warning(f"Cannot read file to summarize: {file_path}")
+            return ''
+        try:
+            return content.decode('utf-8')
+        except UnicodeDecodeError:
+            return content.decode('latin-1')
+
+    def estimate_summaries(self) -> dict:
+        """
+        Estimates the LLM tokens, requests, cost and wall time of summarization.
+
+        Every non-empty file goes through the generation agent (prompt and file content) and the routing
+        agent (prompt and draft); EDIT_RATE of the drafts also go through the feedback agent (prompt and
+        draft) and the rewrite agent (prompt, draft and feedback). Drafts and feedback count OUTPUT_TOKENS.
+
+        Returns:
+            dict: File, token and request counts, cost in dollars and wall time in seconds.
+        """
+        limits = self.config.summary
+        model = self.json_summary_config.models.Llama3
+        prompts = self.json_summary_config.prompt_generate_json_summary
+        schema_file = Path(self.json_summary_config.read_schema)
+        if schema_file.exists():
+            file_paths = sorted(load_set(schema_file))
+        else:
+            logger.warning(f"No file list to summarize at: {schema_file}")
+            file_paths = []
+
+        generate_prompt, route_prompt, feedback_prompt, rewrite_prompt = count_tokens_batch(
+            [prompts.agent_summary_json_creator, prompts.agent_edit_json_route, prompts.agent_feedbak_json,
+             prompts.agent_rewrite_json], model)
+        output_tokens = limits.OUTPUT_TOKENS
+        edit_rate = limits.EDIT_RATE
+
+        files = 0
+        content_tokens = 0
+        over_context_files = 0
+        batch_size = self.config.count_batch_size
+        for start in range(0, len(file_paths), batch_size):
+            contents = [content for content in map(self._read_text, file_paths[start:start + batch_size]) if content]
+            for n_tokens in count_tokens_batch(contents, model, self.config.workers):
+                files += 1
+                content_tokens += n_tokens
+                over_context_files += int(generate_prompt + n_tokens + output_tokens > limits.CONTEXT_TOKENS)
+
+        # Routing answers with a single word
+        input_tokens = (files * (generate_prompt + route_prompt + output_tokens) + content_tokens
+                        + files * edit_rate * (feedback_prompt + rewrite_prompt + 3 * output_tokens))
+        output_tokens_total = files * (output_tokens + 1 + edit_rate * 2 * output_tokens)
+        requests = files * (2 + 2 * edit_rate)
+        if over_context_files:
+            logger.warning(f"{over_context_files} files do not fit the {limits.CONTEXT_TOKENS} tokens context of {model}")
+        return {
+            'model': model,
+            'files': files,
+            'content_tokens': content_tokens,
+            'input_tokens': round(input_tokens),
+            'output_tokens': round(output_tokens_total),
+            'over_context_files': over_context_files,
+            'requests': math.ceil(requests),
+            'cost': (input_tokens / 1000 * limits.PRICE_PER_1K_INPUT_TOKENS
+                     + output_tokens_total / 1000 * limits.PRICE_PER_1K_OUTPUT_TOKENS),
+            'wall_time_seconds': self.wall_time(requests, input_tokens + output_tokens_total, limits)
+        }
+
+    def run(self) -> dict:
+        """
+        Estimates both stages and writes the report file.
+
+        Returns:
+            dict: Estimates per stage and their total cost.
+        """
+        report = {'ingestion': self.estimate_ingestion(), 'summaries': self.estimate_summaries()}
+        report['total_cost'] = report['ingestion']['cost'] + report['summaries']['cost']
+        for stage in ('ingestion', 'summaries'):
+            estimate = report[stage]
+            logger.info(f"Estimated {stage}: {estimate['requests']} requests to {estimate['model']}, "
+                        f"${estimate['cost']:.4f}, {estimate['wall_time_seconds']:.1f} seconds")
+        os.makedirs(self.config.root_dir, exist_ok=True)
+        with open(self.config.report_file, 'w') as f:
+            json.dump(report, f, indent=4)
+        logger.info(f"Cost estimate written to: {self.config.report_file}")
+        return report
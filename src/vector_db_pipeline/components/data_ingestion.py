@@ -1,25 +1,68 @@
 import pandas as pd
-from langchain.embeddings.openai import OpenAIEmbeddings
-from langchain.text_splitter import CharacterTextSplitter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import replace
+from box import ConfigBox
 from pathlib import Path
-from typing import List
+from typing import Dict, List, Optional, Tuple
 from vector_db_pipeline.entity.config_entity import DataIngestionConfig
+from vector_db_pipeline.components.sparse_encoder import BM25Encoder
+from vector_db_pipeline.components.projection import PCAProjector, l2_normalize, neighbour_recall
+from vector_db_pipeline.components.lineage_store import LineageStore, config_hash, text_hash
+from vector_db_pipeline.components.text_chunking import TextNormalizer, NormalizationReport, SentenceSplitter
 from vector_db_pipeline import logger
+from hashlib import blake2b
+import json
 
 
 
 
 
+# Worker process state of TextProcessor.split_text, created once per process by the pool initializer
+_worker_processor = None
+
+
+def _init_chunk_worker(config: DataIngestionConfig):
+    global _worker_processor
+    # Workers only chunk records, the lineage is written by the parent process
+    _worker_processor = TextProcessor(replace(config, lineage_config=ConfigBox({'ENABLED': False})))
+
+
+def _chunk_record_in_worker(record: dict):
+    return _worker_processor.chunk_record(record)
+
+
 """
 Processes text data by splitting it into chunks and embedding each chunk.
 
 Attributes:
     config (DataIngestionConfig): Configuration object containing text splitting settings.
+    normalizer (TextNormalizer): Cleans text before chunking, None when NORMALIZATION is disabled.
+    normalization_report (NormalizationReport): Bytes and tokens saved per source.
+    lineage (LineageStore): Provenance of every vector, None when LINEAGE is disabled.
+    splitter_hash (str): Hash of the chunking configuration (TEXT_SPLITER and NORMALIZATION).
+    model_name (str): Embedding model, with the PCA target dimension when the projection is enabled.
 
 Methods:
     get_text_chunks(text: str) -> List[str]: Splits input text into chunks based on configuration settings.
-    split_text(data: List[dict]) -> List[dict]: Splits text data in each dictionary entry into chunks and embeds each chunk.
+    get_text_splitter(): Returns the splitter selected by TEXT_SPLITER.MODE.
+    get_embed_model() -> OpenAIEmbeddings: Returns the embedding model used for documents.
+    get_sparse_encoder() -> Optional[BM25Encoder]: Returns the BM25 encoder when sparse vectors are enabled.
+    add_sparse_values(chunks: List[dict], sparse_encoder: BM25Encoder) -> List[dict]: Adds BM25 sparse vectors to chunk entries.
+    chunk_record(record: dict) -> Tuple[List[dict], Optional[dict]]: Normalizes and splits one record, without ids.
+    locate_chunk(text: str, text_chunk: str, cursor: int) -> Optional[Tuple[int, int]]: Returns the offsets of a chunk in its text.
+    source_key(record: dict) -> str: Returns the stable id prefix of a record, derived from its url.
+    reset_source_keys(): Forgets the records seen so far, before a new ingestion run.
+    record_chunks(record: dict) -> List[dict]: Splits one record into chunk entries without embeddings.
+    embed_chunks(chunks: List[dict], embed_model) -> List[dict]: Embeds chunk entries in a single request.
+    get_projector(vectors) -> Optional[PCAProjector]: Returns the PCA projection when dimensionality reduction is enabled.
+    project_chunks(chunks: List[dict], projector: PCAProjector) -> List[dict]: Projects the embeddings of chunk entries.
+    normalize_vectors(chunks: List[dict]) -> List[dict]: L2-normalizes embeddings and keeps their norm under 'vector_norm'.
+    lineage_rows(chunks: List[dict], source: Tuple[str, int]) -> List[dict]: Returns the lineage rows of one record's chunks.
+    reuse_enabled() -> bool: Checks whether batch ingestion can reuse the embeddings of the previous artifact.
+    reusable_embeddings(chunks: List[dict]) -> Dict[str, tuple]: Returns previous embeddings of unchanged chunks.
+    split_text(data: List[dict], sources) -> List[dict]: Splits text data in each dictionary entry into chunks and embeds each chunk.
     load_data_json(splited_text_data: List[dict]): Saves the processed data into a JSON file.
+    write_normalization_report(): Writes the normalization savings per source.
 """
 class TextProcessor:
     def __init__(self, config: DataIngestionConfig):
@@ -30,7 +73,44 @@ class TextProcessor:
             config (DataIngestionConfig): Configuration object containing text splitting settings.
         """
         self.config = config
-        
+        self.text_splitter = self.get_text_splitter()
+        self.normalizer = None
+        if self.config.normalization_config.ENABLED:
+            self.normalizer = TextNormalizer.from_config(self.config.normalization_config)
+        self.normalization_report = NormalizationReport()
+        self.splitter_hash = config_hash(self.config.text_spliter_config, self.config.normalization_config)
+        self.model_name = self.config.embedding_model
+        if self.config.projection_config.ENABLED:
+            self.model_name = f"{self.model_name}+pca{self.config.projection_config.TARGET_DIM}"
+        self.lineage = None
+        if self.config.lineage_config.ENABLED:
+            self.lineage = LineageStore(self.config.lineage_file)
+        self.source_occurrences = {}
+
+    def get_text_splitter(self):
+        """
+        Returns the splitter selected by TEXT_SPLITER.MODE.
+
+        Returns:
+            SentenceSplitter or CharacterTextSplitter: Sentence packing splitter for 'sentence', separator based
+                splitter for 'character'.
+        """
+        text_splitter_config = self.config.text_spliter_config
+        mode = text_splitter_config.get('MODE', 'character')
+        if mode == 'sentence':
+            return SentenceSplitter(chunk_size=text_splitter_config.CHUNK_SIZE,
+                                    overlap_size=text_splitter_config.CHUNK_OVERLAP,
+                                    overlap_sentences=text_splitter_config.OVERLAP_SENTENCES)
+        if mode != 'character':
+            raise ValueError(f"Unknown text splitter mode: {mode}")
+        from langchain.text_splitter import CharacterTextSplitter
+        return CharacterTextSplitter(
+            separator=text_splitter_config.SEPARATOR.encode().decode('unicode_escape'),
+            chunk_size=text_splitter_config.CHUNK_SIZE,
+            chunk_overlap=text_splitter_config.CHUNK_OVERLAP,
+            length_function=len
+        )
+
     def get_text_chunks(self, text: str) -> List[str]:
         """
         Splits input text into chunks based on configuration settings.
@@ -41,48 +121,419 @@ class TextProcessor:
         Returns:
             chunks (List[str]): List of text chunks.
         """
+        chunks = self.text_splitter.split_text(text)
+        return chunks
+
+    def get_embed_model(self):
+        """
+        Returns the embedding model used for documents.
+
+        Returns:
+            OpenAIEmbeddings: Embedding model.
+        """
+        from langchain.embeddings.openai import OpenAIEmbeddings
+        return OpenAIEmbeddings(model=self.config.embedding_model)
+
+    def get_sparse_encoder(self) -> Optional[BM25Encoder]:
+        """
+        Returns the BM25 encoder when SPARSE.ENABLED is set, with the term indices of the persisted vocabulary.
+
+        Statistics are reset: callers refit them on the chunks they process. The frozen document average
+        length is kept unless SPARSE.REFIT is set.
+
+        Returns:
+            BM25Encoder or None: Encoder, or None when sparse vectors are disabled.
+        """
+        sparse_config = self.config.sparse_config
+        if not sparse_config.ENABLED:
+            return None
+        if Path(self.config.sparse_vocab_file).exists():
+            sparse_encoder = BM25Encoder.load(self.config.sparse_vocab_file)
+            sparse_encoder.k1, sparse_encoder.b = sparse_config.K1, sparse_config.B
+            sparse_encoder.reset_statistics()
+            if sparse_config.REFIT:
+                sparse_encoder.refit()
+        else:
+            sparse_encoder = BM25Encoder(k1=sparse_config.K1, b=sparse_config.B)
+        return sparse_encoder
+
+    @staticmethod
+    def add_sparse_values(chunks: List[dict], sparse_encoder: BM25Encoder) -> List[dict]:
+        """
+        Adds BM25 sparse vectors under 'sparse_values' using the current encoder statistics.
+
+        Args:
+            chunks (List[dict]): Chunk entries produced by record_chunks.
+            sparse_encoder (BM25Encoder): Fitted encoder.
+
+        Returns:
+            chunks (List[dict]): The same entries with 'sparse_values' set.
+        """
+        sparse_vectors = sparse_encoder.encode_documents([chunk['text'] for chunk in chunks])
+        for chunk, sparse_vector in zip(chunks, sparse_vectors):
+            chunk['sparse_values'] = sparse_vector
+        return chunks
+
+    def chunk_record(self, record: dict) -> Tuple[List[dict], Optional[dict]]:
+        """
+        Normalizes and splits the text of one scraped record into chunk entries without ids.
+
+        Only depends on the record, so records can be chunked in parallel worker processes.
+
+        Args:
+            record (dict): Scraped record following schema.yaml.
+
+        Returns:
+            tuple: (chunk entries with 'text', 'host', 'page_title', 'url', the scrape time 'date_scraped_timestamp'
+                in milliseconds (-1 if missing) and, when the chunk can be located, the character offsets
+                'chunk_start' and 'chunk_end' of the chunk in the normalized record text, normalization statistics
+                or None).
+        """
+        text = record.get('text')
+        if not text:
+            return [], None
+        # Start schema extraction
+        timestamp = record.get('date_scraped_timestamp')
+        host = record.get('host')
+        url = record.get('url')
+        page_title = record.get('page_title')
+        # End schema extraction
+        # Kept as an int so the column has a single type and the upload stage can apply the retention policy
+        scraped_at = int(timestamp) if isinstance(timestamp, (int, float)) and not isinstance(timestamp, bool) else -1
+
+        stats = None
+        if self.normalizer is not None:
+            text, stats = self.normalizer.normalize_with_stats(text)
+
+        chunks = []
+        cursor = 0
+        for text_chunk in self.get_text_chunks(text) if text else []:
+            chunk = {'text': text_chunk, 'host': str(host), 'page_title': str(page_title), 'url': str(url),
+                     'date_scraped_timestamp': scraped_at}
+            offsets = self.locate_chunk(text, text_chunk, cursor)
+            # Unknown offsets are left out rather than stored as a sentinel in the lineage and index metadata
+            if offsets is not None:
+                chunk['chunk_start'], chunk['chunk_end'] = offsets
+                # Overlapping chunks start after the previous start
+                cursor = offsets[0] + 1
+            chunks.append(chunk)
+        return chunks, stats
+
+    def locate_chunk(self, text: str, text_chunk: str, cursor: int) -> Optional[Tuple[int, int]]:
+        """
+        Returns the character offsets of a chunk in the text it was split from.
+
+        Sentence chunks are substrings of the text. Character chunks are their pieces joined by the separator,
+        so runs of separators in the text are collapsed and the chunk is located piece by piece instead.
+
+        Args:
+            text (str): Normalized record text.
+            text_chunk (str): Chunk of the text, in reading order.
+            cursor (int): Offset the search starts from.
+
+        Returns:
+            tuple: (start, end) of the chunk in the text, or None if it cannot be located.
+        """
+        start = text.find(text_chunk, cursor)
+        if start >= 0:
+            return start, start + len(text_chunk)
         text_splitter_config = self.config.text_spliter_config
-        text_splitter = CharacterTextSplitter(
-            separator=text_splitter_config.SEPARATOR.encode().decode('unicode_escape'),
-            chunk_size=text_splitter_config.CHUNK_SIZE,
-            chunk_overlap=text_splitter_config.CHUNK_OVERLAP,
-            length_function=len
-        )
-        chunks = text_splitter.split_text(text)
+        if text_splitter_config.get('MODE', 'character') != 'character':
+            return None
+        separator = text_splitter_config.SEPARATOR.encode().decode('unicode_escape')
+        pieces = [piece.strip() for piece in text_chunk.split(separator)] if separator else []
+        pieces = [piece for piece in pieces if piece]
+        if not pieces:
+            return None
+        start = end = text.find(pieces[0], cursor)
+        for piece in pieces:
+            position = text.find(piece, end)
+            if position < 0:
+                return None
+            end = position + len(piece)
+        return start, end
+
+    def source_key(self, record: dict) -> str:
+        """
+        Returns the stable id prefix of a record: a hash of its url, or of its host, page title and scrape
+        time when it has no url.
+
+        Ids then do not depend on the position of the record in the corpus, so adding or removing a record
+        leaves the ids of every other record unchanged. A record repeating the key of an earlier record of
+        the same run gets its occurrence number appended.
+
+        Args:
+            record (dict): Scraped record following schema.yaml.
+
+        Returns:
+            str: Id prefix of the chunks of the record.
+        """
+        source = record.get('url') or (f"{record.get('host')}|{record.get('page_title')}|"
+                                       f"{record.get('date_scraped_timestamp')}")
+        key = blake2b(str(source).encode('utf-8'), digest_size=8).hexdigest()
+        occurrence = self.source_occurrences.get(key, 0)
+        self.source_occurrences[key] = occurrence + 1
+        return key if occurrence == 0 else f"{key}.{occurrence}"
+
+    def reset_source_keys(self):
+        """
+        Forgets the records seen so far, so a new ingestion run numbers repeated sources from scratch.
+        """
+        self.source_occurrences = {}
+
+    def record_chunks(self, record: dict, chunked: Optional[tuple] = None) -> List[dict]:
+        """
+        Splits the text of one scraped record into chunk entries without embeddings.
+
+        Chunk ids are the source_key of the record followed by the ordinal of the chunk within the record.
+
+        Args:
+            record (dict): Scraped record following schema.yaml.
+            chunked (tuple, optional): Result of chunk_record(record) computed elsewhere, e.g. in a worker process.
+
+        Returns:
+            chunks (List[dict]): Entries of chunk_record with their 'id' first.
+        """
+        chunks, stats = chunked if chunked is not None else self.chunk_record(record)
+        if stats is not None:
+            self.normalization_report.add(str(record.get('host')), stats)
+        if not chunks:
+            return []
+        key = self.source_key(record)
+        return [dict({'id': f"{key}-{ordinal}"}, **chunk) for ordinal, chunk in enumerate(chunks)]
+
+    @staticmethod
+    def embed_chunks(chunks: List[dict], embed_model) -> List[dict]:
+        """
+        Embeds chunk entries in a single request and adds the vectors under 'values'.
+
+        Args:
+            chunks (List[dict]): Chunk entries produced by record_chunks.
+            embed_model: Model exposing embed_documents.
+
+        Returns:
+            chunks (List[dict]): The same entries with 'values' set, ordered as the artifact columns.
+        """
+        embeded_text = embed_model.embed_documents([chunk['text'] for chunk in chunks])
+        embedded = []
+        for i, chunk in enumerate(chunks):
+            entry = {'id': chunk['id'], 'values': embeded_text[i]}
+            entry.update((key, value) for key, value in chunk.items() if key != 'id')
+            embedded.append(entry)
+        return embedded
+
+    def get_projector(self, vectors: Optional[List[List[float]]] = None) -> Optional[PCAProjector]:
+        """
+        Returns the PCA projection when PROJECTION.ENABLED is set.
+
+        Given corpus embeddings, a new projection is fitted on them when PROJECTION.REFIT is set or none is
+        persisted yet; it is then persisted with a report comparing nearest neighbours at both dimensions.
+        Otherwise the persisted projection is loaded.
+
+        Args:
+            vectors (List[List[float]], optional): Embeddings of the whole corpus.
+
+        Raises:
+            FileNotFoundError: If no embeddings are given and no projection is persisted.
+
+        Returns:
+            PCAProjector or None: Projection, or None when dimensionality reduction is disabled.
+        """
+        projection_config = self.config.projection_config
+        if not projection_config.ENABLED:
+            return None
+        projection_file = Path(self.config.projection_file)
+        if vectors is None or (projection_file.exists() and not projection_config.REFIT):
+            if not projection_file.exists():
+                raise FileNotFoundError(f"No PCA projection at {projection_file}, run the batch ingestion stage to fit one")
+            return PCAProjector.load(projection_file)
+
+        projector = PCAProjector.fit(vectors, projection_config.TARGET_DIM, max_samples=projection_config.FIT_SAMPLES,
+                                     seed=projection_config.SEED)
+        projector.save(projection_file)
+        report = {'input_dim': projector.input_dim, 'target_dim': projector.target_dim,
+                  'explained_variance_ratio': projector.explained_variance_ratio,
+                  'corpus': len(vectors)}
+        report.update(neighbour_recall(vectors, projector.transform(vectors), list(projection_config.RECALL_K),
+                                       n_queries=projection_config.RECALL_QUERIES, seed=projection_config.SEED))
+        with open(self.config.projection_report_file, 'w') as f:
+            json.dump(report, f, indent=4)
+        logger.info(f"Projection recall report: {report}")
+        return projector
+
+    @staticmethod
+    def project_chunks(chunks: List[dict], projector: PCAProjector) -> List[dict]:
+        """
+        Replaces the embeddings of chunk entries by their projection.
+
+        Args:
+            chunks (List[dict]): Embedded chunk entries.
+            projector (PCAProjector): Fitted projection.
+
+        Returns:
+            chunks (List[dict]): The same entries with projected 'values'.
+        """
+        if chunks:
+            projected = projector.transform([chunk['values'] for chunk in chunks]).tolist()
+            for chunk, values in zip(chunks, projected):
+                chunk['values'] = values
+        return chunks
+
+    @staticmethod
+    def normalize_vectors(chunks: List[dict]) -> List[dict]:
+        """
+        L2-normalizes the embeddings of chunk entries like the retriever normalizes queries, and stores the
+        norm they had under 'vector_norm'. Zero vectors are left as they are with a norm of 0, for validation
+        to reject.
+
+        Args:
+            chunks (List[dict]): Embedded chunk entries, after any projection.
+
+        Returns:
+            chunks (List[dict]): The same entries with unit 'values' and 'vector_norm'.
+        """
+        if not chunks:
+            return chunks
+        normalized, norms = l2_normalize([chunk['values'] for chunk in chunks])
+        for chunk, values, norm in zip(chunks, normalized.tolist(), norms.tolist()):
+            chunk['values'] = values
+            chunk['vector_norm'] = norm
         return chunks
 
-    def split_text(self, data: List[dict]) -> List[dict]:
+    def lineage_rows(self, chunks: List[dict], source: Tuple[str, int]) -> List[dict]:
+        """
+        Returns the lineage rows of the chunks of one record.
+
+        Args:
+            chunks (List[dict]): Chunk entries produced by record_chunks.
+            source (Tuple[str, int]): Data file and index of the record in it.
+
+        Returns:
+            List[dict]: One row per chunk for the LineageStore.
+        """
+        source_file, record_index = source
+        return [{'id': chunk['id'], 'source_file': str(source_file), 'record_index': int(record_index),
+                 'chunk_start': chunk.get('chunk_start'), 'chunk_end': chunk.get('chunk_end'),
+                 'splitter_hash': self.splitter_hash, 'model': self.model_name, 'text_hash': text_hash(chunk['text'])}
+                for chunk in chunks]
+
+    def reuse_enabled(self) -> bool:
+        """
+        Checks whether batch ingestion can reuse the embeddings of the previous artifact.
+
+        Nothing is reused while PROJECTION.REFIT is set, since a new projection changes every vector.
+        """
+        projection_config = self.config.projection_config
+        return (self.lineage is not None and bool(self.config.lineage_config.REUSE_EMBEDDINGS)
+                and Path(self.config.load_dir).exists() and not (projection_config.ENABLED and projection_config.REFIT))
+
+    def reusable_embeddings(self, chunks: List[dict]) -> Dict[str, tuple]:
+        """
+        Returns the embeddings of the previous ingestion artifact for chunks whose text was already embedded
+        with the current model, when reuse_enabled().
+
+        The lineage finds an earlier vector id per chunk text; its embedding is only reused if the artifact
+        still holds that text under the id, in case the artifact was rewritten without the lineage.
+
+        Args:
+            chunks (List[dict]): Chunk entries produced by record_chunks.
+
+        Returns:
+            dict: (normalized values, vector_norm) per chunk id.
+        """
+        if not self.reuse_enabled():
+            return {}
+        hashes = {chunk['id']: text_hash(chunk['text']) for chunk in chunks}
+        reusable = self.lineage.reusable(list(hashes.values()), self.model_name)
+        if not reusable:
+            return {}
+        previous = pd.read_json(self.config.load_dir, orient='records', dtype={'id': str})
+        if 'vector_norm' not in previous.columns:
+            return {}
+        wanted = {vector_id: hashed for hashed, vector_id in reusable.items()}
+        by_hash = {wanted[vector_id]: (values, float(vector_norm)) for vector_id, values, vector_norm, text
+                   in zip(previous['id'], previous['values'], previous['vector_norm'], previous['text'])
+                   if vector_id in wanted and text_hash(text) == wanted[vector_id]}
+        return {chunk_id: by_hash[hashed] for chunk_id, hashed in hashes.items() if hashed in by_hash}
+
+    def split_text(self, data: List[dict], sources: Optional[List[Tuple[str, int]]] = None) -> List[dict]:
         """
         Splits text data in each dictionary entry into chunks and embeds each chunk.
 
+        With LINEAGE enabled, chunks whose text was already embedded with the current model reuse the
+        embedding of the previous artifact, and the lineage of every chunk replaces the stored one.
+
         Args:
             data (List[dict]): List of dictionaries containing text data.
+            sources (List[Tuple[str, int]], optional): Data file and record index of every record, for the lineage.
 
         Returns:
             splited_text_data (List[dict]): List of dictionaries containing split and embedded text data.
         """
-        embed_model = OpenAIEmbeddings(model="text-embedding-ada-002")
+        embed_model = self.get_embed_model()
+        workers = self.config.normalization_config.WORKERS
+        if self.normalizer is not None and workers > 1 and len(data) > 1:
+            # Normalization is CPU bound, so records are normalized and split in worker processes
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_chunk_worker,
+                                     initargs=(self.config,)) as executor:
+                chunked = list(executor.map(_chunk_record_in_worker, data,
+                                            chunksize=max(1, len(data) // (workers * 4))))
+        else:
+            chunked = [self.chunk_record(d) for d in data]
+
+        # Repeated sources are numbered in reading order, as in the streaming pipeline
+        self.reset_source_keys()
+        record_chunks = []
+        record_sources = []
+        for position, (d, record_chunked) in enumerate(zip(data, chunked)):
+            text_chunks = self.record_chunks(d, record_chunked)
+            if text_chunks:
+                record_chunks.append(text_chunks)
+                record_sources.append(sources[position] if sources is not None else ('', position))
+
+        if self.lineage is not None:
+            affected = self.lineage.affected_sources(self.splitter_hash, self.model_name)
+            if affected:
+                logger.info(f"Chunking configuration or model changed for {sum(map(len, affected.values()))} "
+                            f"records of {len(affected)} files")
+
+        # BM25 document weights depend on corpus statistics, so fit them on every chunk before encoding
+        sparse_encoder = self.get_sparse_encoder()
+        if sparse_encoder is not None:
+            sparse_encoder.fit([chunk['text'] for text_chunks in record_chunks for chunk in text_chunks])
+            sparse_encoder.save(self.config.sparse_vocab_file)
+
+        reused = self.reusable_embeddings([chunk for text_chunks in record_chunks for chunk in text_chunks])
         splited_text_data = []
-        idx = 0
-        for d in data:
-            # Start schema extraction
-            text = d.get('text')
-            if text:
-                timestamp = d.pop('date_scraped_timestamp')
-                host = d.pop('host')
-                url = d.pop('url')
-                page_title = d.pop('page_title')
-                # End schema extraction
-                
-                text_chunks = self.get_text_chunks(text)
-                
-                embeded_text = embed_model.embed_documents(text_chunks)
-                for i, text_chunk in enumerate(text_chunks):
-                    emb_vect = {'id': str(timestamp)+'-'+str(idx), 'values': embeded_text[i], 
-                                'text': text_chunk, 'host': str(host), 'page_title': str(page_title),
-                                'url': str(url)}
-                    idx += 1
-                    splited_text_data.append(emb_vect)
+        new_entries = []
+        for text_chunks in record_chunks:
+            if sparse_encoder is not None:
+                self.add_sparse_values(text_chunks, sparse_encoder)
+            to_embed = [chunk for chunk in text_chunks if chunk['id'] not in reused]
+            embedded = iter(self.embed_chunks(to_embed, embed_model) if to_embed else [])
+            for chunk in text_chunks:
+                if chunk['id'] in reused:
+                    values, vector_norm = reused[chunk['id']]
+                    entry = {'id': chunk['id'], 'values': values}
+                    entry.update((key, value) for key, value in chunk.items() if key != 'id')
+                    entry['vector_norm'] = vector_norm
+                else:
+                    entry = next(embedded)
+                    new_entries.append(entry)
+                splited_text_data.append(entry)
+        if self.lineage is not None:
+            logger.info(f"Embeddings reused: {len(splited_text_data) - len(new_entries)}, computed: {len(new_entries)}")
+
+        # The projection is fitted on the full corpus, so it applies once every chunk is embedded.
+        # Reused embeddings are already projected and normalized
+        projector = self.get_projector([chunk['values'] for chunk in new_entries]) if new_entries else None
+        if projector is not None:
+            self.project_chunks(new_entries, projector)
+        self.normalize_vectors(new_entries)
+        if self.lineage is not None:
+            self.lineage.replace_all(row for text_chunks, source in zip(record_chunks, record_sources)
+                                     for row in self.lineage_rows(text_chunks, source))
+        self.write_normalization_report()
         logger.info(f"Text processed and chunked. Total chunks: {len(splited_text_data)}")
         return splited_text_data
     
@@ -95,6 +546,14 @@ class TextProcessor:
         """
         json_file_path = Path(self.config.load_dir)
         df = pd.DataFrame(splited_text_data)
-        df.to_json(json_file_path, orient='records')
+        # The default precision of 10 digits would round the embeddings, so sync would see every vector as changed
+        df.to_json(json_file_path, orient='records', double_precision=15)
 
         logger.info(f"Data processed and saved into JSON file in {json_file_path}")
+
+    def write_normalization_report(self):
+        """
+        Writes the bytes and tokens saved by normalization per source, when normalization is enabled.
+        """
+        if self.normalizer is not None:
+            self.normalization_report.write(self.config.normalization_report_file)
@@ -1,12 +1,65 @@
 from vector_db_pipeline.entity.config_entity import DataUploadConfig
 from vector_db_pipeline import logger
-from pinecone import Pinecone, PodSpec
+from vector_db_pipeline.utils.common import poll_with_backoff
+from vector_db_pipeline.components.local_vector_store import get_index_client
+from vector_db_pipeline.components.upload_ledger import UploadLedger
+from vector_db_pipeline.components.index_lifecycle import IndexLifecycle
+from vector_db_pipeline.components.upload_telemetry import UploadTelemetry, write_prometheus
+from vector_db_pipeline.components.chunk_store import ChunkStore
+from vector_db_pipeline.components.namespace_router import NamespaceRouter
+from pinecone import PodSpec
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import threading
 import math
 import time
+import json
 import os
-from dotenv import load_dotenv
+import numpy as np
 import pandas as pd
 
+
+def load_active_index(active_index_file, index_info):
+    """
+    Returns the index and namespace readers should use.
+
+    Blue/green rebuilds write a pointer file once a new index or namespace is filled and validated;
+    without a pointer the configured INDEX_INFO values are used.
+
+    Args:
+        active_index_file (Path): Pointer file written by DataUpload.blue_green_rebuild.
+        index_info (dict): INDEX_INFO parameters.
+
+    Returns:
+        tuple: (index name, namespace).
+    """
+    if active_index_file and Path(active_index_file).exists():
+        with open(active_index_file, 'r') as f:
+            pointer = json.load(f)
+        return pointer['index_name'], pointer['namespace']
+    return index_info.INDEX_NAME, index_info.NAMESPACE
+
+
+def load_generation(generation_file, index_name, namespace):
+    """
+    Returns the data generation of a namespace, changed by the upload stage whenever the namespace content changes.
+
+    Readers that cache query results compare it with the generation the results were computed for.
+
+    Args:
+        generation_file (Path): Generation file written by DataUpload.bump_generation.
+        index_name (str): Index name.
+        namespace (str): Namespace.
+
+    Returns:
+        str: Generation tag, '' if the namespace never changed since the file exists.
+    """
+    if generation_file and Path(generation_file).exists():
+        with open(generation_file, 'r') as f:
+            return json.load(f).get(f"{index_name}/{namespace}", '')
+    return ''
+
+
 """
 Handles data upload to Pinecone indexes.
 
@@ -15,10 +68,34 @@ Attributes:
     params (dict): Dictionary containing parameters required for data upload.
 
 Methods:
-    del_index(): Deletes the specified index if it exists.
-    recreate_index(): Recreates the index with specified dimensions, metric, and environment.
+    del_index(index_name): Deletes the specified index if it exists.
+    recreate_index(index_name): Recreates the index with specified dimensions, metric, and environment.
+    to_pinecone_vector(row): Converts one ingestion record into a Pinecone vector.
     pinecon_vector(): Converts data from CSV to a list of JSON objects.
-    batch_upload(pinecone_vector): Uploads vectors to a Pinecone index in batches.
+    batch_upload(pinecone_vector, namespace, flush): Uploads vectors to one namespace in batches.
+    route(pinecone_vector, namespace): Groups vectors by the shard namespace SHARDING.MODE assigns them.
+    namespaces_of(namespace): Returns a base namespace and its shards known to the upload ledger.
+    for_each_namespace(function, routed): Runs a function per namespace on SHARDING.WORKERS threads.
+    finish_upload(namespaces): Persists the local index and the ledger and reports vector counts per namespace.
+    write_upload_metrics(): Writes the telemetry of every namespace uploaded by the run to the Prometheus textfile.
+    upload_batch(index, batch_vectors, namespace, telemetry): Upserts one batch and records it in the telemetry.
+    payload_size(batch_vectors): Estimates the upsert payload size of a batch without serializing it.
+    upsert_with_retry(index, batch_vectors, namespace): Upserts one batch with retries and measures its latency.
+    batch_delete(index, ids, namespace): Deletes vectors by id in parallel batches.
+    purge_removed_sources(current_ids, current_urls): Deletes the vectors of source urls that disappeared from the data.
+    retention_cutoff(host, now): Returns the oldest scrape time the RETENTION policy keeps for a host.
+    drop_expired(pinecone_vector, now): Filters out vectors older than the retention policy allows.
+    expire_vectors(now): Deletes the vectors the retention policy expired, found through the upload ledger.
+    upload(pinecone_vector, reset_ledger): Uploads every vector and records it in the upload ledger.
+    sync_upload(pinecone_vector): Uploads only new or changed vectors and deletes stale ones.
+    stream_upload(vector_batches, sync): Uploads vectors arriving as batches, without materializing the corpus.
+    blue_green_rebuild(pinecone_vector): Fills a new versioned index or namespace and switches readers to it once validated.
+    switch_active_index(index_name, namespace, version): Atomically points readers to a new index and namespace.
+    namespace_vector_count(index, namespace): Returns the number of vectors stored in a namespace.
+    convergence_sample(vectors): Returns the uploaded vectors the convergence check fetches back.
+    wait_for_convergence(index, namespace, vectors): Polls the index until a sample of the uploaded vectors is readable.
+    bump_generation(index_name, namespaces): Marks namespaces as changed so cached query results are invalidated.
+    offload_metadata(batch_vectors, namespace): Moves large metadata fields to the local chunk store.
 """
 class DataUpload:
     def __init__(self, config: DataUploadConfig):
@@ -33,51 +110,89 @@ class DataUpload:
 
         self.config = config
 
-        #initialize db
-        load_dotenv()
-        pinecone_api_key = os.getenv("PINECONE_API_KEY")
-        self.pc = Pinecone(api_key=pinecone_api_key)
+        #initialize db, either the hosted Pinecone client or the local stand-in
         self.index_info = self.config.index_info
-        self.index_name = self.index_info.INDEX_NAME
+        self.pc = get_index_client(self.index_info, persist_dir=self.config.local_index_dir)
+        self.lifecycle = IndexLifecycle(self.pc, self.config.index_readiness)
+        self.index_name, self.namespace = load_active_index(self.config.active_index_file, self.index_info)
+        self.ledger = UploadLedger(self.config.ledger_file)
+        self.chunk_store = None
+        if self.config.metadata_offload.ENABLED:
+            self.chunk_store = ChunkStore(self.config.chunk_store_file)
+        self.router = NamespaceRouter(self.config.sharding)
+        self._generation_lock = threading.Lock()
+        # Telemetry of every namespace uploaded since the metrics were last written
+        self.run_telemetry = []
+        self._telemetry_lock = threading.Lock()
         
         
      
-    def del_index(self):
+    def del_index(self, index_name=None):
         """
         Deletes the specified index if it exists.
+
+        Args:
+            index_name (str, optional): Index to delete. Defaults to the active index.
         """
-        if self.index_name in [index_info["name"] for index_info in self.pc.list_indexes()]:
-            self.pc.delete_index(self.index_name)
-            logger.info(f"Index '{self.index_name}' deleted ")
+        index_name = index_name or self.index_name
+        if self.lifecycle.delete(index_name):
+            logger.info(f"Index '{index_name}' deleted ")
+            self.bump_generation(index_name)
+        if self.chunk_store is not None:
+            self.chunk_store.delete_namespaces(index_name)
 
-    def recreate_index(self):
+    def recreate_index(self, index_name=None):
         """
         Recreates the index with specified dimensions, metric, and environment.
-        """
 
-        dim = self.index_info.DIMENSIONS
+        Waits for readiness with capped exponential backoff, so uploads start as soon as the index is ready.
+        With PROJECTION.ENABLED the index gets the projected dimension TARGET_DIM.
+
+        Args:
+            index_name (str, optional): Index to create. Defaults to the active index.
+        """
+        index_name = index_name or self.index_name
+        dim = self.config.projection.TARGET_DIM if self.config.projection.ENABLED else self.index_info.DIMENSIONS
         met = self.index_info.METRIC
         env = self.index_info.ENVIROMENT
-        existing_indexes = [index_info["name"] for index_info in self.pc.list_indexes()]
         
-        # Check if index already exists
-        if self.index_name not in existing_indexes:
-            # Create index if it doesn't exist
-            self.pc.create_index(
-                name=self.index_name,
-                dimension=dim,
-                metric=met,
-                spec=PodSpec(
-                    environment=env
-                )
-            )
-            # Wait for index to be initialized
-            while not self.pc.describe_index(self.index_name).status['ready']:
-                time.sleep(1)
-        index = self.pc.Index(self.index_name)
-        logger.info("Index created")
+        # Create index if it doesn't exist and wait for it to be initialized
+        if self.lifecycle.create(index_name, dimension=dim, metric=met, spec=PodSpec(environment=env)):
+            logger.info("Index created")
+        index = self.lifecycle.index(index_name)
         logger.info(index.describe_index_stats())
 
+    @staticmethod
+    def to_pinecone_vector(row):
+        """
+        Converts one ingestion record into a Pinecone vector.
+
+        Args:
+            row (dict or Series): Record with 'id', 'values', 'text', 'host', 'page_title', 'url' and optionally
+                'date_scraped_timestamp', the chunk offsets and 'sparse_values'.
+
+        Returns:
+            dict: Vector with 'id', 'values', 'metadata' and, for hybrid search, 'sparse_values'.
+        """
+        # Create a dictionary for the metadata containing 'text', 'host', 'page_title', and 'url'
+        metadata = {'text': row['text'], 'host': row['host'], 'page_title': row['page_title'], 'url': row['url']}
+        # Create a dictionary for the JSON object containing 'id', 'values', and 'metadata'
+        for offset_key in ('chunk_start', 'chunk_end'):
+            # Chunks that could not be located have no offsets, NaN once loaded from the artifact
+            offset = row.get(offset_key)
+            if offset is not None and not pd.isna(offset):
+                metadata[offset_key] = int(offset)
+        # Numeric, so queries can filter on it with $gte/$lt; unknown scrape times (-1) are left out
+        timestamp = row.get('date_scraped_timestamp')
+        if timestamp is not None and not pd.isna(timestamp) and int(timestamp) >= 0:
+            metadata['date_scraped_timestamp'] = int(timestamp)
+        vector = {'id': row['id'], 'values': row['values'], 'metadata': metadata}
+        sparse_values = row.get('sparse_values')
+        # Pinecone rejects empty sparse vectors, e.g. for chunks without any word token
+        if isinstance(sparse_values, dict) and sparse_values.get('indices'):
+            vector['sparse_values'] = sparse_values
+        return vector
+
     def pinecon_vector(self): 
         """
         Converts data  to a list of JSON objects.
@@ -87,62 +202,736 @@ class DataUpload:
         """
         data_read_path = self.config.read_data_dir
         df = pd.read_json(data_read_path, orient='records')
-        pinecone_vect = []
-        
-        for i, row in df.iterrows():
-            id = row['id']
-            vectors = row['values']
-            text = row['text']
-            host = row['host']
-            page_title = row['page_title']
-            url = row['url']
-            # Create a dictionary for the metadata containing 'text', 'host', 'page_title', and 'url'
-            metadata = {'text': text, 'host': host, 'page_title': page_title, 'url': url}
-            # Create a dictionary for the JSON object containing 'id', 'values', and 'metadata'
-            emb_vect = {'id': id, 'values': vectors, 'metadata': metadata}
-            
-            pinecone_vect.append(emb_vect)
+        pinecone_vect = self.drop_expired([self.to_pinecone_vector(row) for _, row in df.iterrows()])
         logger.info(f"Data ready for upload")
         with open(self.config.STATUS_FILE, 'a') as f:
             f.write(f"Data size: {len(pinecone_vect)}\n")
         # Return the list of JSON objects
         return pinecone_vect
 
-    def batch_upload(self, pinecone_vector):
+    def batch_upload(self, pinecone_vector, namespace=None, flush=True):
         """
         Uploads vectors to a Pinecone index in batches.
 
         Args:
             pinecone_vector (list): List of JSON objects representing vectors to be uploaded.
+            namespace (str, optional): Namespace to upload to. Defaults to the active namespace.
+            flush (bool, optional): Whether to persist the local index afterwards. Defaults to True.
+
+        Returns:
+            list: Vectors whose batch was uploaded successfully.
         """
         # Determine the batch size and total number of data points
         batch_size = self.config.batch_size.BATCH_SIZE 
-        namespace = self.index_info.NAMESPACE
-        index = self.pc.Index(self.index_name)
+        namespace = namespace or self.namespace
+        index = self.lifecycle.index(self.index_name)
         data_size = len(pinecone_vector)
+        uploaded = []
         
         
         # Calculate the number of batches required
         batch_num = math.ceil(data_size / batch_size)
         logger.info(f"Uploading: {data_size} vectors, in {batch_num} batches")
+        telemetry = UploadTelemetry(namespace)
+        telemetry.start()
         
         # Iterate over each batch
         for i in range(batch_num):
- 
-            try:
-                # Calculate the start and end indices for the current batch
-                start_idx = i * batch_size
-                end_idx = min((i + 1) * batch_size, len(pinecone_vector))
+            # Calculate the start and end indices for the current batch
+            start_idx = i * batch_size
+            end_idx = min((i + 1) * batch_size, len(pinecone_vector))
+        
+            batch_vectors = pinecone_vector[start_idx:end_idx]
             
-                batch_vectors = pinecone_vector[start_idx:end_idx]
-                
-                # Upload the vectors to the Pinecone index
-                index.upsert(vectors=batch_vectors,namespace=namespace)
-                logger.info(f"Batch {i+1} uploaded")
-            except Exception as e:
-                logger.info(f"Error encountered: {e}")
+            # Upload the vectors to the Pinecone index
+            if self.upload_batch(index, batch_vectors, namespace, telemetry):
+                uploaded.extend(batch_vectors)
         
-        time.sleep(30)
-        logger.info(index.describe_index_stats())
+        telemetry.write_status(self.config.STATUS_FILE)
+        with self._telemetry_lock:
+            self.run_telemetry.append(telemetry)
+        if flush:
+            # Not part of a multi-namespace upload, which writes the metrics in finish_upload
+            self.write_upload_metrics()
+        self.wait_for_convergence(index, namespace, uploaded)
+        if flush and hasattr(self.pc, 'flush'):
+            self.pc.flush()
+        if uploaded:
+            self.bump_generation(self.index_name, [namespace])
         with open(self.config.STATUS_FILE, 'a') as f:
             f.write(f"Data upload completed\n")
+        return uploaded
+
+    def upload_batch(self, index, batch_vectors, namespace, telemetry):
+        """
+        Upserts one batch with retries and records it in the upload telemetry.
+
+        Args:
+            index: Index handle to upsert into.
+            batch_vectors (list): Vectors of the batch.
+            namespace (str): Namespace to upsert into.
+            telemetry (UploadTelemetry): Telemetry of the running upload.
+
+        Returns:
+            bool: Whether the batch was uploaded.
+        """
+        # The ledger keeps hashing the full vectors, so only the upserted payload loses the offloaded fields
+        batch_vectors = self.offload_metadata(batch_vectors, namespace)
+        payload_bytes = self.payload_size(batch_vectors)
+        success, latency, retries = self.upsert_with_retry(index, batch_vectors, namespace)
+        telemetry.record_batch(len(batch_vectors), payload_bytes, latency, retries, success)
+        return success
+
+    @staticmethod
+    def payload_size(batch_vectors):
+        """
+        Estimates the upsert payload size of a batch: 4 bytes per dense value, 8 per sparse entry, plus the
+        length of the id and of the metadata keys and values as text.
+
+        Args:
+            batch_vectors (list): Vectors of the batch.
+
+        Returns:
+            int: Estimated size in bytes.
+        """
+        size = 0
+        for vector in batch_vectors:
+            size += 4 * len(vector['values']) + len(vector['id'])
+            sparse_values = vector.get('sparse_values')
+            if sparse_values:
+                size += 8 * len(sparse_values['indices'])
+            for key, value in (vector.get('metadata') or {}).items():
+                size += len(key) + len(value if isinstance(value, str) else str(value))
+        return size
+
+    def upsert_with_retry(self, index, batch_vectors, namespace):
+        """
+        Upserts one batch, retrying with exponential backoff on errors.
+
+        Args:
+            index: Index handle to upsert into.
+            batch_vectors (list): Vectors of the batch.
+            namespace (str): Namespace to upsert into.
+
+        Returns:
+            tuple: (success, latency in seconds of the successful call, number of retries).
+        """
+        retry = self.config.upload_retry
+        delay = retry.INITIAL_DELAY
+        for attempt in range(retry.MAX_ATTEMPTS):
+            try:
+                start = time.perf_counter()
+                index.upsert(vectors=batch_vectors, namespace=namespace)
+                return True, time.perf_counter() - start, attempt
+            except Exception as e:
+                logger.info(f"Error encountered (attempt {attempt + 1}/{retry.MAX_ATTEMPTS}): {e}")
+                if attempt + 1 < retry.MAX_ATTEMPTS:
+                    time.sleep(delay)
+                    delay = delay * retry.BACKOFF_FACTOR
+        return False, 0.0, retry.MAX_ATTEMPTS - 1
+
+    def batch_delete(self, index, ids, namespace):
+        """
+        Deletes vectors by id in batches of DELETE_BATCH_SIZE, sent by up to DELETE_WORKERS threads.
+
+        Args:
+            index: Index handle to delete from.
+            ids (list): Vector ids to delete.
+            namespace (str): Namespace to delete from.
+
+        Returns:
+            list: Ids whose batch was deleted successfully.
+        """
+        batch_size = self.config.batch_size.DELETE_BATCH_SIZE
+        batches = [ids[start:start + batch_size] for start in range(0, len(ids), batch_size)]
+
+        def delete_batch(batch_ids):
+            try:
+                index.delete(ids=batch_ids, namespace=namespace)
+                return batch_ids
+            except Exception as e:
+                logger.info(f"Error encountered while deleting: {e}")
+                return []
+
+        deleted = []
+        if len(batches) > 1:
+            with ThreadPoolExecutor(max_workers=self.config.batch_size.DELETE_WORKERS) as executor:
+                for batch_ids in executor.map(delete_batch, batches):
+                    deleted.extend(batch_ids)
+        elif batches:
+            deleted.extend(delete_batch(batches[0]))
+        logger.info(f"Deleted {len(deleted)}/{len(ids)} vectors from namespace '{namespace}'")
+        if deleted:
+            self.bump_generation(self.index_name, [namespace])
+            if self.chunk_store is not None:
+                self.chunk_store.delete_many(deleted, self.index_name, namespace)
+        return deleted
+
+    def purge_removed_sources(self, current_ids, current_urls):
+        """
+        Deletes the vectors whose source url no longer appears in the data, in every namespace of the
+        active namespace, and reports the purge in the status file.
+
+        Args:
+            current_ids (set): Vector ids produced by the current run.
+            current_urls (set): Source urls of the current run.
+
+        Returns:
+            int: Number of purged vectors.
+        """
+        index = self.lifecycle.index(self.index_name)
+        removed_urls = set()
+        purged = 0
+        for namespace in self.namespaces_of():
+            entries = self.ledger.entries(namespace)
+            ids = self.ledger.ids_of_removed_sources(current_ids, current_urls, namespace)
+            deleted = self.batch_delete(index, ids, namespace)
+            removed_urls.update(entries[vector_id]['url'] for vector_id in deleted)
+            self.ledger.forget(deleted, namespace)
+            purged += len(deleted)
+        logger.info(f"Removed sources purged: {len(removed_urls)} urls, {purged} vectors")
+        with open(self.config.STATUS_FILE, 'a') as f:
+            f.write(f"Removed sources purged: {len(removed_urls)} urls, {purged} vectors\n")
+        return purged
+
+    def retention_cutoff(self, host, now=None):
+        """
+        Returns the oldest date_scraped_timestamp the RETENTION policy keeps for a host.
+
+        Args:
+            host (str): Source host.
+            now (float, optional): Current time in seconds since the epoch. Defaults to time.time().
+
+        Returns:
+            int or None: Cutoff in milliseconds, None when vectors of the host never expire.
+        """
+        retention = self.config.retention
+        if not retention.ENABLED:
+            return None
+        max_age_days = (retention.HOSTS or {}).get(host, retention.MAX_AGE_DAYS)
+        if not max_age_days:
+            return None
+        now = time.time() if now is None else now
+        return int((now - float(max_age_days) * 86400) * 1000)
+
+    def drop_expired(self, pinecone_vector, now=None):
+        """
+        Filters out vectors scraped before the retention cutoff of their host, so uploads do not bring expired
+        vectors back. Vectors without a scrape time are kept.
+
+        Args:
+            pinecone_vector (list): Vectors to filter.
+            now (float, optional): Current time in seconds since the epoch. Defaults to time.time().
+
+        Returns:
+            list: Vectors within the retention policy.
+        """
+        if not self.config.retention.ENABLED:
+            return pinecone_vector
+        now = time.time() if now is None else now
+        cutoffs = {}
+        kept = []
+        for vector in pinecone_vector:
+            metadata = vector['metadata']
+            host = metadata.get('host')
+            if host not in cutoffs:
+                cutoffs[host] = self.retention_cutoff(host, now)
+            timestamp = metadata.get('date_scraped_timestamp')
+            if cutoffs[host] is None or timestamp is None or timestamp >= cutoffs[host]:
+                kept.append(vector)
+        if len(kept) < len(pinecone_vector):
+            logger.info(f"Retention policy skipped {len(pinecone_vector) - len(kept)} expired vectors")
+        return kept
+
+    def expire_vectors(self, now=None):
+        """
+        Deletes the vectors whose scrape time is older than the RETENTION policy allows, in every namespace
+        of the active namespace, and reports the deletion in the status file.
+
+        Expired ids are found in the upload ledger, so the index is neither listed nor queried. Vectors
+        recorded before scrape times were tracked are only covered once they are uploaded again.
+
+        Args:
+            now (float, optional): Current time in seconds since the epoch. Defaults to time.time().
+
+        Returns:
+            int: Number of deleted vectors.
+        """
+        now = time.time() if now is None else now
+        cutoffs = {}
+
+        def cutoff(host):
+            if host not in cutoffs:
+                cutoffs[host] = self.retention_cutoff(host, now)
+            return cutoffs[host]
+
+        index = self.lifecycle.index(self.index_name)
+        expired = {}
+        for namespace in self.namespaces_of():
+            ids = self.ledger.expired_ids(cutoff, namespace)
+            deleted = self.batch_delete(index, ids, namespace)
+            self.ledger.forget(deleted, namespace)
+            if deleted:
+                expired[namespace] = len(deleted)
+        if hasattr(self.pc, 'flush'):
+            self.pc.flush()
+        self.ledger.save()
+        total = sum(expired.values())
+        logger.info(f"Expired vectors deleted: {total} {expired}")
+        with open(self.config.STATUS_FILE, 'a') as f:
+            f.write(f"Expired vectors deleted: {total} {json.dumps(expired)}\n")
+        return total
+
+    def route(self, pinecone_vector, namespace=None):
+        """
+        Groups vectors by the shard namespace SHARDING.MODE assigns them.
+
+        Args:
+            pinecone_vector (list): Vectors to route.
+            namespace (str, optional): Base namespace. Defaults to the active namespace.
+
+        Returns:
+            dict: Vectors per namespace, {namespace: all vectors} when sharding is disabled.
+        """
+        namespace = namespace or self.namespace
+        if not self.router.enabled:
+            return {namespace: pinecone_vector}
+        routed = {}
+        for vector in pinecone_vector:
+            routed.setdefault(self.router.namespace_for(namespace, vector['metadata']), []).append(vector)
+        logger.info(f"Vectors routed to {len(routed)} namespaces: "
+                    f"{ {shard: len(vectors) for shard, vectors in routed.items()} }")
+        return routed
+
+    def namespaces_of(self, namespace=None):
+        """
+        Returns a base namespace and its shards known to the upload ledger.
+
+        Args:
+            namespace (str, optional): Base namespace. Defaults to the active namespace.
+
+        Returns:
+            list: Namespaces holding vectors uploaded for the base namespace.
+        """
+        namespace = namespace or self.namespace
+        return [known for known in self.ledger.namespaces
+                if known == namespace or self.router.is_shard(namespace, known)]
+
+    def for_each_namespace(self, function, routed):
+        """
+        Runs a function per namespace, in parallel on SHARDING.WORKERS threads when there are several.
+
+        Args:
+            function (Callable): Called as function(namespace, vectors).
+            routed (dict): Vectors per namespace.
+
+        Raises:
+            Exception: The first error raised for any namespace, once every namespace is done.
+
+        Returns:
+            dict: Result of the function per namespace.
+        """
+        for namespace in routed:
+            # Created up front so worker threads never insert into the shared ledger dictionary
+            self.ledger.entries(namespace)
+        if len(routed) <= 1:
+            return {namespace: function(namespace, vectors) for namespace, vectors in routed.items()}
+        with ThreadPoolExecutor(max_workers=self.config.sharding.WORKERS) as executor:
+            futures = {namespace: executor.submit(function, namespace, vectors) for namespace, vectors in routed.items()}
+        return {namespace: future.result() for namespace, future in futures.items()}
+
+    def finish_upload(self, namespaces):
+        """
+        Persists the local index and the ledger and reports the vector count of every namespace.
+
+        Args:
+            namespaces (list): Namespaces written by the upload.
+        """
+        if hasattr(self.pc, 'flush'):
+            self.pc.flush()
+        self.ledger.save()
+        self.write_upload_metrics()
+        if self.router.enabled:
+            # Unscoped queries fan out over every shard and are cached under the base namespace
+            self.bump_generation(self.index_name, [self.namespace])
+        index = self.lifecycle.index(self.index_name)
+        counts = {namespace: self.namespace_vector_count(index, namespace) for namespace in sorted(namespaces)}
+        logger.info(f"Vectors per namespace: {counts}")
+        with open(self.config.STATUS_FILE, 'a') as f:
+            f.write(f"Vectors per namespace: {json.dumps(counts)}\n")
+
+    def write_upload_metrics(self):
+        """
+        Writes the telemetry of every namespace uploaded since the last call to the Prometheus textfile, once
+        per run, so namespaces uploaded in parallel do not overwrite each other's metrics.
+        """
+        with self._telemetry_lock:
+            telemetries, self.run_telemetry = self.run_telemetry, []
+        if self.config.telemetry.PROMETHEUS and telemetries:
+            write_prometheus(telemetries, self.config.prometheus_textfile)
+
+    def upload(self, pinecone_vector, reset_ledger=False):
+        """
+        Uploads every vector and records the uploaded ones in the upload ledger.
+
+        Args:
+            pinecone_vector (list): Vectors to upload.
+            reset_ledger (bool, optional): Whether to forget previous uploads, e.g. after recreating the index. Defaults to False.
+        """
+        routed = self.route(pinecone_vector)
+        if reset_ledger:
+            for namespace in set(self.namespaces_of()) | set(routed):
+                self.ledger.reset(namespace)
+
+        def upload_namespace(namespace, vectors):
+            uploaded = self.batch_upload(vectors, namespace=namespace, flush=False)
+            self.ledger.record(uploaded, namespace)
+
+        self.for_each_namespace(upload_namespace, routed)
+        if self.config.upload_mode.PURGE_REMOVED_SOURCES:
+            self.purge_removed_sources({vector['id'] for vector in pinecone_vector},
+                                       {vector['metadata'].get('url') for vector in pinecone_vector})
+        self.finish_upload(routed)
+
+    def sync_upload(self, pinecone_vector):
+        """
+        Uploads only new or changed vectors and deletes the ids that ingestion no longer produces.
+
+        The comparison uses the upload ledger; with UPLOAD_MODE.RECONCILE the ledger is first checked
+        against the ids stored in the index. Namespaces that no longer receive any vector, e.g. after
+        changing SHARDING.MODE, are emptied.
+
+        Args:
+            pinecone_vector (list): Every vector produced by the current run.
+        """
+        index = self.lifecycle.index(self.index_name)
+        current_urls = {vector['metadata'].get('url') for vector in pinecone_vector}
+        routed = self.route(pinecone_vector)
+        for namespace in self.namespaces_of():
+            routed.setdefault(namespace, [])
+
+        def sync_namespace(namespace, vectors):
+            if self.config.upload_mode.RECONCILE:
+                self.ledger.reconcile(index, namespace, self.config.batch_size.BATCH_SIZE)
+            changed, stale_ids = self.ledger.diff(vectors, namespace)
+            entries = self.ledger.entries(namespace)
+            deleted = self.batch_delete(index, stale_ids, namespace)
+            removed_urls = {entries[vector_id].get('url') for vector_id in deleted} - current_urls - {None}
+            self.ledger.forget(deleted, namespace)
+
+            uploaded = self.batch_upload(changed, namespace=namespace, flush=False)
+            self.ledger.record(uploaded, namespace)
+            return len(uploaded), len(deleted), len(vectors) - len(changed), removed_urls
+
+        results = self.for_each_namespace(sync_namespace, routed)
+        for namespace, vectors in routed.items():
+            if not vectors and not self.ledger.entries(namespace):
+                self.ledger.namespaces.pop(namespace, None)
+        self.finish_upload([namespace for namespace, vectors in routed.items() if vectors])
+
+        upserted, deleted, unchanged = [sum(result[i] for result in results.values()) for i in range(3)]
+        removed_urls = set().union(*(result[3] for result in results.values()))
+        with open(self.config.STATUS_FILE, 'a') as f:
+            f.write(f"Sync: {upserted} upserted, {deleted} deleted, {unchanged} unchanged\n")
+            f.write(f"Removed sources purged: {len(removed_urls)} urls\n")
+
+    def stream_upload(self, vector_batches, sync=False):
+        """
+        Uploads vectors arriving as an iterable of batches, without materializing the corpus.
+
+        Incoming batches are routed to their namespace and re-batched to BATCH_SIZE. In sync mode vectors
+        whose content matches the upload ledger are skipped and ledger ids that never arrive are deleted
+        once the stream ends.
+
+        Args:
+            vector_batches (Iterable[list]): Batches of vectors, e.g. from the streaming pipeline.
+            sync (bool, optional): Whether to skip unchanged vectors and delete stale ids. Defaults to False.
+
+        Returns:
+            int: Number of distinct vector ids received.
+        """
+        batch_size = self.config.batch_size.BATCH_SIZE
+        index = self.lifecycle.index(self.index_name)
+        telemetry = UploadTelemetry(self.namespace)
+        telemetry.start()
+        seen_ids = {}
+        seen_urls = set()
+        buffers = {}
+        # The last uploaded batch of every namespace, for the convergence check
+        last_batches = {}
+        unchanged = 0
+
+        def flush(batch, namespace):
+            if self.upload_batch(index, batch, namespace, telemetry):
+                self.ledger.record(batch, namespace)
+                last_batches[namespace] = batch
+
+        for vector_batch in vector_batches:
+            for vector in self.drop_expired(vector_batch):
+                namespace = self.router.namespace_for(self.namespace, vector['metadata'])
+                seen_ids.setdefault(namespace, set()).add(vector['id'])
+                seen_urls.add(vector['metadata'].get('url'))
+                entry = self.ledger.entries(namespace).get(vector['id'])
+                if sync and entry is not None and entry.get('hash') == self.ledger.content_hash(vector):
+                    unchanged += 1
+                    continue
+                buffer = buffers.setdefault(namespace, [])
+                buffer.append(vector)
+                if len(buffer) >= batch_size:
+                    flush(buffer, namespace)
+                    buffers[namespace] = []
+        for namespace, buffer in buffers.items():
+            if buffer:
+                flush(buffer, namespace)
+
+        deleted = []
+        if sync:
+            for namespace in set(self.namespaces_of()) | set(seen_ids):
+                namespace_ids = seen_ids.get(namespace, set())
+                stale_ids = [vector_id for vector_id in self.ledger.entries(namespace) if vector_id not in namespace_ids]
+                namespace_deleted = self.batch_delete(index, stale_ids, namespace)
+                self.ledger.forget(namespace_deleted, namespace)
+                deleted.extend(namespace_deleted)
+        elif self.config.upload_mode.PURGE_REMOVED_SOURCES:
+            # Runs once the stream ended, so a source is only purged if no vector of it arrived
+            self.purge_removed_sources(set().union(*seen_ids.values()), seen_urls)
+
+        telemetry.write_status(self.config.STATUS_FILE)
+        with self._telemetry_lock:
+            self.run_telemetry.append(telemetry)
+        for namespace, batch in last_batches.items():
+            self.wait_for_convergence(index, namespace, batch)
+        if telemetry.vectors:
+            self.bump_generation(self.index_name, list(seen_ids))
+        self.finish_upload(seen_ids)
+        with open(self.config.STATUS_FILE, 'a') as f:
+            f.write(f"Streaming upload: {telemetry.vectors} upserted, {len(deleted)} deleted, {unchanged} unchanged\n")
+        return sum(len(namespace_ids) for namespace_ids in seen_ids.values())
+
+    def blue_green_rebuild(self, pinecone_vector):
+        """
+        Rebuilds the index without downtime.
+
+        Vectors are uploaded to a new versioned namespace (BLUE_GREEN.TARGET: namespace) or index
+        (BLUE_GREEN.TARGET: index), and its shards when sharding is enabled, while readers keep using
+        the active one. Once the new target holds every vector, the active index pointer is switched
+        to it and the previous target is deleted unless BLUE_GREEN.KEEP_PREVIOUS is set.
+
+        Args:
+            pinecone_vector (list): Every vector produced by the current run.
+
+        Raises:
+            RuntimeError: If the new target does not hold every vector; the active target is left untouched.
+        """
+        blue_green = self.config.blue_green
+        version = str(int(time.time() * 1000))
+        old_index_name, old_namespace = self.index_name, self.namespace
+        old_namespaces = self.namespaces_of(old_namespace) or [old_namespace]
+        if blue_green.TARGET == 'index':
+            new_index_name, new_namespace = f"{self.index_info.INDEX_NAME}-{version}", self.index_info.NAMESPACE
+        elif blue_green.TARGET == 'namespace':
+            new_index_name, new_namespace = self.index_info.INDEX_NAME, f"{self.index_info.NAMESPACE}-{version}"
+        else:
+            raise ValueError(f"Unknown blue/green target: {blue_green.TARGET}")
+        logger.info(f"Blue/green rebuild into index '{new_index_name}', namespace '{new_namespace}' "
+                    f"while '{old_index_name}'/'{old_namespace}' stays active")
+
+        self.recreate_index(new_index_name)
+        self.index_name, self.namespace = new_index_name, new_namespace
+        routed = self.route(pinecone_vector)
+        results = self.for_each_namespace(
+            lambda namespace, vectors: self.batch_upload(vectors, namespace=namespace, flush=False), routed
+        )
+
+        expected_count = len({vector['id'] for vector in pinecone_vector})
+        new_index = self.lifecycle.index(new_index_name)
+        count = sum(self.namespace_vector_count(new_index, namespace) for namespace in routed)
+        uploaded_count = sum(len(uploaded) for uploaded in results.values())
+        if uploaded_count != len(pinecone_vector) or count != expected_count:
+            self.index_name, self.namespace = old_index_name, old_namespace
+            raise RuntimeError(f"Blue/green validation failed: {count}/{expected_count} vectors in "
+                               f"'{new_index_name}'/'{new_namespace}', active target left unchanged")
+
+        self.switch_active_index(new_index_name, new_namespace, version)
+        for namespace, uploaded in results.items():
+            self.ledger.reset(namespace)
+            self.ledger.record(uploaded, namespace)
+        if old_namespace != new_namespace:
+            for namespace in old_namespaces:
+                self.ledger.namespaces.pop(namespace, None)
+        self.ledger.save()
+
+        if not blue_green.KEEP_PREVIOUS and (old_index_name, old_namespace) != (new_index_name, new_namespace):
+            if old_index_name != new_index_name:
+                self.del_index(old_index_name)
+            else:
+                for namespace in old_namespaces:
+                    self.lifecycle.index(old_index_name).delete(delete_all=True, namespace=namespace)
+                    self.bump_generation(old_index_name, [namespace])
+                    if self.chunk_store is not None:
+                        self.chunk_store.delete_namespaces(old_index_name, [namespace])
+                    logger.info(f"Namespace '{namespace}' deleted from index '{old_index_name}'")
+        self.finish_upload(routed)
+
+        with open(self.config.STATUS_FILE, 'a') as f:
+            f.write(f"Blue/green rebuild: active target is '{new_index_name}'/'{new_namespace}' ({count} vectors)\n")
+
+    def switch_active_index(self, index_name, namespace, version):
+        """
+        Atomically points readers to a new index and namespace.
+
+        Args:
+            index_name (str): Index readers should use.
+            namespace (str): Namespace readers should use.
+            version (str): Version tag of the rebuild.
+        """
+        pointer_file = Path(self.config.active_index_file)
+        os.makedirs(pointer_file.parent, exist_ok=True)
+        tmp_file = pointer_file.with_suffix('.tmp')
+        with open(tmp_file, 'w') as f:
+            json.dump({'index_name': index_name, 'namespace': namespace, 'version': version}, f, indent=4)
+        os.replace(tmp_file, pointer_file)
+        if hasattr(self.pc, 'flush'):
+            self.pc.flush()
+        logger.info(f"Active index switched to '{index_name}'/'{namespace}'")
+
+    @staticmethod
+    def namespace_vector_count(index, namespace):
+        """
+        Returns the number of vectors stored in a namespace.
+
+        Args:
+            index: Index handle exposing describe_index_stats().
+            namespace (str): Namespace to count.
+
+        Returns:
+            int: Vector count of the namespace, 0 if the namespace does not exist yet.
+        """
+        stats = index.describe_index_stats()
+        namespaces = stats['namespaces'] or {}
+        if namespace not in namespaces:
+            return 0
+        return int(namespaces[namespace]['vector_count'])
+
+    def convergence_sample(self, vectors):
+        """
+        Returns up to CONVERGENCE.SAMPLE_SIZE of the uploaded vectors, spread evenly and always including the
+        last one written.
+
+        Args:
+            vectors (list): Uploaded vectors, in upload order.
+
+        Returns:
+            list: Latest version of the sampled vectors.
+        """
+        latest = list({vector['id']: vector for vector in vectors}.values())
+        sample_size = self.config.convergence.get('SAMPLE_SIZE', 100)
+        if len(latest) <= sample_size:
+            return latest
+        step = len(latest) / sample_size
+        return [latest[len(latest) - 1 - int(i * step)] for i in range(sample_size)]
+
+    def wait_for_convergence(self, index, namespace, vectors):
+        """
+        Fetches a sample of the uploaded vectors with backoff until all of them are readable with their new values
+        or the timeout hits.
+
+        Counting the namespace is not enough: it already holds the expected total when the upload only
+        overwrote vectors that were stored before.
+
+        Args:
+            index: Index handle the vectors were uploaded to.
+            namespace (str): Namespace the vectors were uploaded to.
+            vectors (list): Vectors that were uploaded.
+
+        Returns:
+            bool: True if the index converged before the timeout, False otherwise.
+        """
+        convergence = self.config.convergence
+        sample = self.convergence_sample(vectors)
+        if not sample:
+            return True
+
+        def is_readable(vector, fetched):
+            if vector['id'] not in fetched:
+                return False
+            stored = np.asarray(fetched[vector['id']]['values'], dtype=np.float64)
+            values = np.asarray(vector['values'], dtype=np.float64)
+            # Cosine indexes may store the vector normalized, so only its direction is compared
+            return stored.shape == values.shape and stored @ values >= (1 - 1e-4) * np.linalg.norm(stored) * np.linalg.norm(values)
+
+        def check():
+            fetched = index.fetch(ids=[vector['id'] for vector in sample], namespace=namespace)['vectors']
+            readable = sum(1 for vector in sample if is_readable(vector, fetched))
+            return readable == len(sample), readable
+
+        converged, count, elapsed = poll_with_backoff(
+            check,
+            timeout=convergence.TIMEOUT,
+            initial_delay=convergence.INITIAL_DELAY,
+            max_delay=convergence.MAX_DELAY,
+            backoff_factor=convergence.BACKOFF_FACTOR
+        )
+        if converged:
+            logger.info(f"Index converged in {elapsed:.2f} seconds: {count}/{len(sample)} sampled vectors readable in namespace '{namespace}'")
+        else:
+            logger.warning(f"Index did not converge after {elapsed:.2f} seconds: {count}/{len(sample)} sampled vectors readable in namespace '{namespace}'")
+        logger.info(index.describe_index_stats())
+        with open(self.config.STATUS_FILE, 'a') as f:
+            f.write(f"Index converged: {converged} ({count}/{len(sample)} sampled vectors readable in {elapsed:.2f} seconds)\n")
+        return converged
+
+    def bump_generation(self, index_name, namespaces=None):
+        """
+        Marks namespaces as changed by writing a new generation tag, so cached query results are invalidated.
+
+        Args:
+            index_name (str): Index whose content changed.
+            namespaces (list, optional): Changed namespaces. Defaults to every namespace of the index, e.g. after deleting it.
+        """
+        generation_file = Path(self.config.generation_file)
+        # Namespaces upload in parallel, so the read-modify-write of the file is serialized
+        with self._generation_lock:
+            generations = {}
+            if generation_file.exists():
+                with open(generation_file, 'r') as f:
+                    generations = json.load(f)
+            if namespaces is None:
+                namespaces = [key.split('/', 1)[1] for key in generations if key.split('/', 1)[0] == index_name]
+                namespaces.append(self.namespace)
+            generation = str(time.time_ns())
+            for namespace in namespaces:
+                generations[f"{index_name}/{namespace}"] = generation
+
+            os.makedirs(generation_file.parent, exist_ok=True)
+            tmp_file = generation_file.with_suffix('.tmp')
+            with open(tmp_file, 'w') as f:
+                json.dump(generations, f, indent=4)
+            os.replace(tmp_file, generation_file)
+
+    def offload_metadata(self, batch_vectors, namespace):
+        """
+        Moves the METADATA_OFFLOAD.FIELDS of every vector to the local chunk store, keyed by index, namespace
+        and vector id.
+
+        The store is written before the upsert, so every vector readers can match already has its fields stored.
+
+        Args:
+            batch_vectors (list): Vectors about to be upserted.
+            namespace (str): Namespace the vectors are upserted to.
+
+        Returns:
+            list: Copies of the vectors without the offloaded fields, or the vectors unchanged if offloading is disabled.
+        """
+        if self.chunk_store is None:
+            return batch_vectors
+        fields = set(self.config.metadata_offload.FIELDS)
+        offloaded, compact_vectors = {}, []
+        for vector in batch_vectors:
+            metadata = vector.get('metadata') or {}
+            offloaded[vector['id']] = {key: value for key, value in metadata.items() if key in fields}
+            compact_vector = dict(vector)
+            compact_vector['metadata'] = {key: value for key, value in metadata.items() if key not in fields}
+            compact_vectors.append(compact_vector)
+        self.chunk_store.put_many(offloaded, self.index_name, namespace)
+        return compact_vectors
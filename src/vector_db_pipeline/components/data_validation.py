@@ -1,6 +1,7 @@
 from vector_db_pipeline.entity.config_entity import DataValidationConfig
 from vector_db_pipeline import logger
 import pandas as pd
+from typing import List
 
 
 """
@@ -36,6 +37,10 @@ class DataValidation:
             all_schema = self.config.SCHEMA
             all_schema['id'] = 'str'
             all_schema['values'] = 'list'
+            all_schema['sparse_values'] = 'dict'
+            all_schema['chunk_start'] = 'int'
+            all_schema['chunk_end'] = 'int'
+            all_schema['vector_norm'] = 'float'
 
             validation_status = all(col in all_schema.keys() for col in all_cols)
 
@@ -113,6 +118,12 @@ class DataValidation:
             elif not unique_types:
                 raise TypeError("Several types present in data")
 
+            # Ingestion stores the norm of every vector before normalizing it, so zero vectors need no recomputation
+            if 'vector_norm' in self.data.columns:
+                zero_vectors = int((self.data['vector_norm'] <= 0).sum())
+                if zero_vectors:
+                    raise ValueError(f"Zero vectors present in data: {zero_vectors}")
+
             # Log success message
             with open(self.config.STATUS_FILE, 'a') as f:
                 f.write("Data types are correct\n")
@@ -121,3 +132,71 @@ class DataValidation:
         except Exception as e:
             raise e
 
+
+
+"""
+Validates batches of ingestion records as they stream through the pipeline.
+
+Attributes:
+    config (DataValidationConfig): Configuration object containing data validation settings.
+    seen_ids (set): Ids of every record validated so far.
+
+Methods:
+    validate_batch(records) -> List[dict]: Checks columns, id uniqueness and types of a batch.
+    write_status(): Appends the validation summary to the status file.
+"""
+class BatchValidator:
+    def __init__(self, config: DataValidationConfig):
+        """
+        Initializes BatchValidator with the provided data validation configuration.
+
+        Args:
+            config (DataValidationConfig): Configuration object containing data validation settings.
+        """
+        self.config = config
+        self.allowed_columns = set(self.config.SCHEMA.keys()) | {'id', 'values', 'sparse_values', 'chunk_start', 'chunk_end',
+                                                                   'vector_norm'}
+        self.seen_ids = set()
+        self.batches = 0
+
+    def validate_batch(self, records: List[dict]) -> List[dict]:
+        """
+        Checks that every record only has schema columns, a new string id and a non-empty list of floats
+        that is not a zero vector.
+
+        Args:
+            records (List[dict]): Embedded records of one batch.
+
+        Raises:
+            ValueError: If a record has unknown columns, a duplicated id or a zero vector.
+            TypeError: If the id or the vector has the wrong type.
+
+        Returns:
+            List[dict]: The validated records.
+        """
+        for record in records:
+            unknown_columns = set(record) - self.allowed_columns
+            if unknown_columns:
+                raise ValueError(f"Columns not in schema: {sorted(unknown_columns)}")
+            if not isinstance(record['id'], str):
+                raise TypeError("ID column is not of type string")
+            if record['id'] in self.seen_ids:
+                raise ValueError(f"Duplicated id: {record['id']}")
+            values = record['values']
+            if not isinstance(values, list) or not values:
+                raise TypeError("Values column is not of type list")
+            if not all(isinstance(value, float) for value in values):
+                raise TypeError("Vector values are not of type float")
+            if record.get('vector_norm') is not None and not record['vector_norm'] > 0:
+                raise ValueError(f"Zero vector: {record['id']}")
+            self.seen_ids.add(record['id'])
+        self.batches += 1
+        return records
+
+    def write_status(self):
+        """
+        Appends the validation summary to the status file.
+        """
+        with open(self.config.STATUS_FILE, 'a') as f:
+            f.write(f"Streamed batches validated: {self.batches}, unique ids: {len(self.seen_ids)}\n")
+        logger.info(f"Streamed batches validated: {self.batches}, unique ids: {len(self.seen_ids)}")
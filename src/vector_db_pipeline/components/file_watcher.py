@@ -0,0 +1,270 @@
+from vector_db_pipeline.components.changes_in_files import FilesState
+from vector_db_pipeline.entity.config_entity import ConfigFileChanges
+from vector_db_pipeline import logger
+from typing import Dict, List, Optional, Set, Tuple
+import ctypes.util
+import threading
+import ctypes
+import select
+import struct
+import errno
+import json
+import time
+import sys
+import os
+
+
+"""
+Watches the monitored files with Linux inotify and keeps the directory state up to date without rescans.
+
+The parent directory of every monitored file is watched, so saves through a temporary file and a
+rename are seen. Events are debounced: a burst is processed DEBOUNCE seconds after its last event,
+or MAX_DELAY seconds after its first one. Each processed file is stat-ed and, if its stat changed,
+hashed through FilesState. Added, deleted and changed files are appended to the JSONL event log and
+merged into changed_files.json, which then lists every change since the last one-shot state run.
+If the kernel queue overflows, every monitored file is checked again.
+
+Attributes:
+    config (ConfigFileChanges): Paths, debounce delays and hashing settings.
+    files_state (FilesState): Hashes files and holds the monitored file list.
+    state (dict): In-memory directory state, saved to the state file after every burst.
+
+Methods:
+    watch(): Adds an inotify watch on the parent directory of every monitored file, then scans them once.
+    process(files): Updates the state of changed files and records their changes.
+    run(stop_event): Processes debounced events until stop_event is set.
+"""
+
+_IN_ATTRIB = 0x00000004
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_Q_OVERFLOW = 0x00004000
+_IN_IGNORED = 0x00008000
+_IN_ONLYDIR = 0x01000000
+_WATCH_MASK = _IN_ATTRIB | _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE | _IN_ONLYDIR
+# struct inotify_event: int wd, uint32 mask, uint32 cookie, uint32 len, then len bytes of NUL padded name
+_EVENT_HEADER = struct.Struct('iIII')
+_READ_SIZE = 1 << 16
+# Seconds between checks of the stop event while no event arrives
+_POLL_INTERVAL = 0.2
+
+
+class Inotify:
+    """
+    Thin ctypes binding of the Linux inotify API.
+    """
+    def __init__(self):
+        if not sys.platform.startswith('linux'):
+            raise OSError("inotify is only available on Linux")
+        self._libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        self.fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            error = ctypes.get_errno()
+            raise OSError(error, f"inotify_init1 failed: {os.strerror(error)}")
+        self.directories: Dict[int, str] = {}
+        self._poller = select.poll()
+        self._poller.register(self.fd, select.POLLIN)
+
+    def add_watch(self, directory: str, mask: int = _WATCH_MASK) -> int:
+        """
+        Watches a directory.
+
+        Args:
+            directory (str): Absolute directory path.
+            mask (int, optional): inotify event mask.
+
+        Returns:
+            int: Watch descriptor.
+        """
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(directory), ctypes.c_uint32(mask))
+        if wd < 0:
+            error = ctypes.get_errno()
+            raise OSError(error, os.strerror(error), directory)
+        self.directories[wd] = directory
+        return wd
+
+    def read_events(self, timeout: float) -> List[Tuple[str, int]]:
+        """
+        Waits up to timeout seconds for events and returns every queued one.
+
+        Returns:
+            List[Tuple[str, int]]: (path, mask) per event; the path is '' for queue overflows.
+        """
+        if not self._poller.poll(timeout * 1000):
+            return []
+        events = []
+        while True:
+            try:
+                buffer = os.read(self.fd, _READ_SIZE)
+            except BlockingIOError:
+                break
+            except InterruptedError:
+                continue
+            offset = 0
+            while offset < len(buffer):
+                wd, mask, _, name_length = _EVENT_HEADER.unpack_from(buffer, offset)
+                offset += _EVENT_HEADER.size
+                name = os.fsdecode(buffer[offset:offset + name_length].rstrip(b'\0'))
+                offset += name_length
+                if mask & _IN_Q_OVERFLOW:
+                    events.append(('', mask))
+                elif mask & _IN_IGNORED:
+                    # The directory was removed or unmounted
+                    self.directories.pop(wd, None)
+                elif wd in self.directories:
+                    events.append((os.path.join(self.directories[wd], name), mask))
+        return events
+
+    def close(self):
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+class FileWatcher:
+    def __init__(self, config: ConfigFileChanges, files_state: FilesState):
+        """
+        Initializes the watcher.
+
+        Args:
+            config (ConfigFileChanges): Paths, debounce delays and hashing settings.
+            files_state (FilesState): Hashes files and holds the monitored file list.
+        """
+        self.config = config
+        self.files_state = files_state
+        self.state = {}
+        # inotify reports absolute paths, the state is keyed by the paths of the monitored file list
+        self.files = {os.path.abspath(file): file for file in files_state.app_files}
+        self.inotify = None
+
+    def watch(self) -> int:
+        """
+        Adds an inotify watch on the parent directory of every monitored file, then runs one state scan.
+
+        The scan runs once the watches exist, so no edit between the scan and the watches is missed, and
+        changed_files.json starts from the changes since the last state run.
+
+        Returns:
+            int: Number of watched directories.
+        """
+        self.inotify = Inotify()
+        for directory in sorted({os.path.dirname(path) for path in self.files}):
+            try:
+                self.inotify.add_watch(directory)
+            except OSError as e:
+                if e.errno == errno.ENOSPC:
+                    raise OSError(e.errno, "inotify watch limit reached, raise fs.inotify.max_user_watches") from e
+                logger.warning(f"Cannot watch {directory}: {e}")
+        logger.info(f"Watching {len(self.inotify.directories)} directories for {len(self.files)} files")
+        self.files_state.monitor_directory()
+        self.state = self.files_state.load_directory_state(self.config.state_file)
+        return len(self.inotify.directories)
+
+    def _merge_changes(self, changes: Dict[str, List[str]]):
+        # changed_files.json lists the net changes since the last one-shot state run
+        updated_files = self.config.updated_files
+        merged = {'added_files': [], 'deleted_files': [], 'changed_files': []}
+        if os.path.exists(updated_files):
+            with open(updated_files) as f:
+                merged.update(json.load(f))
+        added, deleted, changed = (set(merged[key]) for key in ('added_files', 'deleted_files', 'changed_files'))
+        for file in changes['added_files']:
+            if file in deleted:
+                deleted.discard(file)
+                changed.add(file)
+            else:
+                added.add(file)
+        for file in changes['deleted_files']:
+            if file in added:
+                added.discard(file)
+            else:
+                changed.discard(file)
+                deleted.add(file)
+        for file in changes['changed_files']:
+            if file not in added:
+                changed.add(file)
+        merged = {'added_files': sorted(added), 'deleted_files': sorted(deleted), 'changed_files': sorted(changed)}
+        tmp_file = f"{updated_files}.tmp"
+        with open(tmp_file, 'w') as f:
+            json.dump(merged, f, indent=4)
+        os.replace(tmp_file, updated_files)
+
+    def process(self, files: Set[str]) -> Dict[str, List[str]]:
+        """
+        Updates the state of files reported by inotify and records their changes.
+
+        Args:
+            files (Set[str]): Monitored files, as keyed in the state.
+
+        Returns:
+            dict: Lists of 'added_files', 'deleted_files' and 'changed_files' of this burst.
+        """
+        changes = {'added_files': [], 'deleted_files': [], 'changed_files': []}
+        for file in sorted(files):
+            old_entry = self.state.get(file)
+            new_entry = self.files_state.file_entry(file, old_entry)
+            if new_entry is None:
+                if old_entry is not None:
+                    del self.state[file]
+                    changes['deleted_files'].append(file)
+                continue
+            self.state[file] = new_entry
+            if old_entry is None:
+                changes['added_files'].append(file)
+            elif new_entry is not old_entry and self.files_state.file_changed(file, old_entry, new_entry):
+                changes['changed_files'].append(file)
+
+        events = [(event, file) for event, key in (('added', 'added_files'), ('deleted', 'deleted_files'),
+                                                   ('changed', 'changed_files')) for file in changes[key]]
+        if events:
+            timestamp = time.strftime('%Y-%m-%dT%H:%M:%S')
+            with open(self.config.event_log, 'a') as f:
+                for event, file in events:
+                    f.write(json.dumps({'time': timestamp, 'event': event, 'file': file}) + '\n')
+            self._merge_changes(changes)
+            logger.info(f"{len(changes['added_files'])} added, {len(changes['deleted_files'])} deleted, "
+                        f"{len(changes['changed_files'])} changed")
+        self.files_state.save_directory_state(self.state)
+        return changes
+
+    def run(self, stop_event: Optional[threading.Event] = None):
+        """
+        Processes debounced events until stop_event is set or the process is interrupted.
+
+        Args:
+            stop_event (threading.Event, optional): Stops the watcher once set.
+        """
+        stop_event = stop_event or threading.Event()
+        if self.inotify is None:
+            self.watch()
+        pending = set()
+        first_event = last_event = 0.0
+        try:
+            while not stop_event.is_set():
+                events = self.inotify.read_events(_POLL_INTERVAL)
+                now = time.monotonic()
+                for path, mask in events:
+                    if not path:
+                        logger.warning("inotify queue overflowed, checking every monitored file")
+                        pending.update(self.files.values())
+                    elif path in self.files:
+                        pending.add(self.files[path])
+                    else:
+                        continue
+                    if not first_event:
+                        first_event = now
+                    last_event = now
+                if pending and (now - last_event >= self.config.debounce or now - first_event >= self.config.max_delay):
+                    self.process(pending)
+                    pending = set()
+                    first_event = last_event = 0.0
+        except KeyboardInterrupt:
+            logger.info("File watcher interrupted")
+        finally:
+            if pending:
+                self.process(pending)
+            self.inotify.close()
+            self.inotify = None
@@ -0,0 +1,113 @@
+from vector_db_pipeline import logger
+from vector_db_pipeline.utils.common import poll_with_backoff
+from typing import Dict, Optional, Set
+
+
+"""
+Manages creation, deletion and handles of vector indexes for one client.
+
+The index listing is fetched once and kept up to date by create() and delete(), and
+Index handles are resolved once per index name and reused.
+
+Attributes:
+    pc: Pinecone or LocalPinecone client.
+    readiness (dict): INDEX_READINESS parameters (TIMEOUT, INITIAL_DELAY, MAX_DELAY, BACKOFF_FACTOR).
+
+Methods:
+    index_names(refresh): Returns the cached set of index names.
+    exists(name): Checks whether an index exists.
+    create(name, dimension, metric, spec): Creates an index and waits until it is ready.
+    wait_until_ready(name): Polls the index status with capped exponential backoff.
+    delete(name): Deletes an index if it exists.
+    index(name): Returns the cached handle of an index.
+"""
+
+
+class IndexLifecycle:
+    def __init__(self, pc, readiness: dict):
+        """
+        Initializes the lifecycle helper for a client.
+
+        Args:
+            pc: Pinecone or LocalPinecone client.
+            readiness (dict): INDEX_READINESS parameters.
+        """
+        self.pc = pc
+        self.readiness = readiness
+        self._names: Optional[Set[str]] = None
+        self._handles: Dict[str, object] = {}
+
+    def index_names(self, refresh: bool = False) -> Set[str]:
+        """
+        Returns the names of existing indexes, listing them only on first use or when refresh is set.
+        """
+        if self._names is None or refresh:
+            self._names = {index_info["name"] for index_info in self.pc.list_indexes()}
+        return self._names
+
+    def exists(self, name: str) -> bool:
+        return name in self.index_names()
+
+    def wait_until_ready(self, name: str):
+        """
+        Polls the index status with capped exponential backoff until it is ready.
+
+        Args:
+            name (str): Index name.
+
+        Raises:
+            TimeoutError: If the index is not ready within INDEX_READINESS.TIMEOUT seconds.
+        """
+        readiness = self.readiness
+        ready, _, elapsed = poll_with_backoff(
+            lambda: (bool(self.pc.describe_index(name).status['ready']), None),
+            timeout=readiness.TIMEOUT,
+            initial_delay=readiness.INITIAL_DELAY,
+            max_delay=readiness.MAX_DELAY,
+            backoff_factor=readiness.BACKOFF_FACTOR
+        )
+        if not ready:
+            raise TimeoutError(f"Index '{name}' not ready after {elapsed:.1f} seconds")
+        logger.info(f"Index '{name}' ready after {elapsed:.2f} seconds")
+
+    def create(self, name: str, dimension: int, metric: str, spec=None) -> bool:
+        """
+        Creates an index if it does not exist and waits until it is ready.
+
+        Args:
+            name (str): Index name.
+            dimension (int): Vector dimension.
+            metric (str): Similarity metric.
+            spec (optional): Pinecone deployment spec.
+
+        Returns:
+            bool: True if the index was created, False if it already existed.
+        """
+        if self.exists(name):
+            return False
+        self.pc.create_index(name=name, dimension=dimension, metric=metric, spec=spec)
+        self.index_names().add(name)
+        self.wait_until_ready(name)
+        return True
+
+    def delete(self, name: str) -> bool:
+        """
+        Deletes an index if it exists and drops its cached handle.
+
+        Returns:
+            bool: True if the index was deleted.
+        """
+        self._handles.pop(name, None)
+        if not self.exists(name):
+            return False
+        self.pc.delete_index(name)
+        self.index_names().discard(name)
+        return True
+
+    def index(self, name: str):
+        """
+        Returns the handle of an index, resolving it only once.
+        """
+        if name not in self._handles:
+            self._handles[name] = self.pc.Index(name)
+        return self._handles[name]
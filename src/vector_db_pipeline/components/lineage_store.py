@@ -0,0 +1,156 @@
+from vector_db_pipeline import logger
+from hashlib import blake2b
+from pathlib import Path
+from typing import Dict, Iterable, List
+import threading
+import sqlite3
+import json
+import os
+
+
+"""
+Local table of the provenance of every vector produced by ingestion.
+
+Each vector id maps to the data file and record index it was chunked from, its character offsets
+in the normalized record text, a hash of the chunking configuration, the embedding model and a
+hash of the chunk text. Ingestion uses it to reuse the embeddings of chunks whose text and model
+did not change, and to list the records a configuration change affects. Vector ids are derived from
+the source url and the chunk ordinal, so rows of unchanged records keep their ids when other records
+are added or removed.
+
+Attributes:
+    store_file (Path): SQLite file of the table.
+
+Methods:
+    put_many(rows): Inserts or replaces lineage rows.
+    replace_all(rows): Replaces the whole table, e.g. after a full ingestion run.
+    get_many(ids): Returns the lineage rows of vector ids.
+    reusable(text_hashes, model): Returns a vector id per text hash already embedded with the model.
+    affected_sources(splitter_hash, model): Returns the records whose vectors were produced with another configuration.
+"""
+
+_COLUMNS = ('id', 'source_file', 'record_index', 'chunk_start', 'chunk_end', 'splitter_hash', 'model', 'text_hash')
+# Bound on the number of SQL variables per statement
+_BATCH = 500
+
+
+def text_hash(text: str) -> str:
+    return blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def config_hash(*configs: dict) -> str:
+    """
+    Hashes configuration sections, e.g. TEXT_SPLITER and NORMALIZATION, independently of key order.
+    """
+    encoded = json.dumps([dict(config) for config in configs], sort_keys=True, default=str).encode('utf-8')
+    return blake2b(encoded, digest_size=8).hexdigest()
+
+
+class LineageStore:
+    def __init__(self, store_file: Path):
+        """
+        Opens the table, creating it if needed.
+
+        Args:
+            store_file (Path): SQLite file of the table.
+        """
+        self.store_file = store_file
+        self._lock = threading.Lock()
+        os.makedirs(Path(store_file).parent, exist_ok=True)
+        self._db = sqlite3.connect(str(store_file), check_same_thread=False)
+        self._db.execute("CREATE TABLE IF NOT EXISTS lineage (id TEXT PRIMARY KEY, source_file TEXT, record_index INTEGER, "
+                         "chunk_start INTEGER, chunk_end INTEGER, splitter_hash TEXT, model TEXT, text_hash TEXT)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS lineage_text_hash ON lineage (text_hash)")
+        self._db.commit()
+
+    def put_many(self, rows: Iterable[dict]):
+        """
+        Inserts or replaces lineage rows.
+
+        Args:
+            rows (Iterable[dict]): Rows with every lineage column.
+        """
+        values = [tuple(row[column] for column in _COLUMNS) for row in rows]
+        with self._lock:
+            self._db.executemany(f"INSERT OR REPLACE INTO lineage ({', '.join(_COLUMNS)}) "
+                                 f"VALUES ({', '.join('?' * len(_COLUMNS))})", values)
+            self._db.commit()
+
+    def replace_all(self, rows: Iterable[dict]):
+        """
+        Replaces the whole table, so it describes exactly the vectors of the latest ingestion artifact.
+
+        Args:
+            rows (Iterable[dict]): Rows with every lineage column.
+        """
+        values = [tuple(row[column] for column in _COLUMNS) for row in rows]
+        with self._lock:
+            self._db.execute("DELETE FROM lineage")
+            self._db.executemany(f"INSERT OR REPLACE INTO lineage ({', '.join(_COLUMNS)}) "
+                                 f"VALUES ({', '.join('?' * len(_COLUMNS))})", values)
+            self._db.commit()
+        logger.info(f"Lineage of {len(values)} vectors saved at: {self.store_file}")
+
+    def get_many(self, ids: List[str]) -> Dict[str, dict]:
+        """
+        Returns the lineage rows of vector ids.
+
+        Args:
+            ids (List[str]): Vector ids.
+
+        Returns:
+            dict: Lineage row per vector id. Unknown ids are skipped.
+        """
+        ids = list(dict.fromkeys(ids))
+        rows = {}
+        with self._lock:
+            for start in range(0, len(ids), _BATCH):
+                batch = ids[start:start + _BATCH]
+                for row in self._db.execute(f"SELECT {', '.join(_COLUMNS)} FROM lineage "
+                                            f"WHERE id IN ({','.join('?' * len(batch))})", batch):
+                    rows[row[0]] = dict(zip(_COLUMNS, row))
+        return rows
+
+    def reusable(self, text_hashes: List[str], model: str) -> Dict[str, str]:
+        """
+        Returns, per text hash, a vector id embedded from the same text with the same model.
+
+        The chunking configuration is not compared: a chunk that comes out identical after a chunking
+        change keeps its embedding.
+
+        Args:
+            text_hashes (List[str]): Hashes of the chunk texts to embed.
+            model (str): Current embedding model.
+
+        Returns:
+            dict: Vector id per reusable text hash.
+        """
+        text_hashes = list(dict.fromkeys(text_hashes))
+        reusable = {}
+        with self._lock:
+            for start in range(0, len(text_hashes), _BATCH):
+                batch = text_hashes[start:start + _BATCH]
+                for vector_id, hashed in self._db.execute(
+                        f"SELECT id, text_hash FROM lineage WHERE model = ? "
+                        f"AND text_hash IN ({','.join('?' * len(batch))})", [model] + batch):
+                    reusable.setdefault(hashed, vector_id)
+        return reusable
+
+    def affected_sources(self, splitter_hash: str, model: str) -> Dict[str, List[int]]:
+        """
+        Returns the records whose vectors were produced with another chunking configuration or model.
+
+        Args:
+            splitter_hash (str): Hash of the current chunking configuration.
+            model (str): Current embedding model.
+
+        Returns:
+            dict: Sorted record indices per source file.
+        """
+        affected = {}
+        with self._lock:
+            for source_file, record_index in self._db.execute(
+                    "SELECT DISTINCT source_file, record_index FROM lineage WHERE splitter_hash != ? OR model != ?",
+                    (splitter_hash, model)):
+                affected.setdefault(source_file, []).append(record_index)
+        return {source_file: sorted(indices) for source_file, indices in sorted(affected.items())}
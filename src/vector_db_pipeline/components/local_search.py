@@ -0,0 +1,267 @@
+from vector_db_pipeline.entity.config_entity import LocalSearchConfig
+from vector_db_pipeline.components.local_vector_store import matches_filter
+from vector_db_pipeline import logger
+from pathlib import Path
+from typing import List, Tuple
+import pandas as pd
+import numpy as np
+import json
+import os
+
+
+"""
+Local search engines built from the ingestion artifact, for offline evaluation and as a
+fallback when the hosted index is unavailable.
+
+Both engines expose the query() signature and response shape of a Pinecone index handle,
+so they can be passed to Retriever in place of the hosted index.
+
+Classes:
+    ExactSearchIndex: Brute-force search through a matrix product on normalized float32 vectors.
+    IVFIndex: Approximate inverted-file search over spherical k-means clusters.
+
+Functions:
+    normalize_rows(matrix): L2-normalizes the rows of a matrix.
+    load_artifact(read_data_dir): Loads ids, normalized vectors and metadata from the ingestion artifact.
+    build_ivf_index(config): Builds the approximate index from the ingestion artifact and persists it.
+"""
+
+
+def normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return (matrix / norms).astype(np.float32)
+
+
+def load_artifact(read_data_dir: Path) -> Tuple[List[str], np.ndarray, List[dict]]:
+    """
+    Loads ids, normalized vectors and metadata from the ingestion artifact.
+
+    Artifacts with a 'vector_norm' column were normalized at ingestion and are used as they are.
+
+    Args:
+        read_data_dir (Path): Path of vector_data.json.
+
+    Returns:
+        tuple: (ids, float32 matrix with L2-normalized rows, metadata per row).
+    """
+    df = pd.read_json(read_data_dir, orient='records')
+    ids = [str(vector_id) for vector_id in df['id']]
+    matrix = np.asarray(df['values'].tolist(), dtype=np.float32)
+    if 'vector_norm' not in df.columns:
+        matrix = normalize_rows(matrix)
+    metadata_columns = [column for column in df.columns
+                        if column not in ('id', 'values', 'sparse_values', 'vector_norm')]
+    metadata = df[metadata_columns].to_dict(orient='records')
+    logger.info(f"Loaded {len(ids)} vectors from {read_data_dir}")
+    return ids, matrix, metadata
+
+
+class ExactSearchIndex:
+    def __init__(self, ids: List[str], matrix: np.ndarray, metadata: List[dict]):
+        """
+        Initializes the exact search engine.
+
+        Args:
+            ids (List[str]): Vector ids.
+            matrix (np.ndarray): float32 matrix with L2-normalized rows.
+            metadata (List[dict]): Metadata per row.
+        """
+        self.ids = ids
+        self.matrix = np.ascontiguousarray(matrix, dtype=np.float32)
+        self.metadata = metadata
+
+    @classmethod
+    def from_artifact(cls, read_data_dir: Path):
+        return cls(*load_artifact(read_data_dir))
+
+    def _candidate_rows(self, filter: dict = None) -> np.ndarray:
+        if not filter:
+            return None
+        return np.array([row for row, metadata in enumerate(self.metadata) if matches_filter(metadata, filter)],
+                        dtype=np.int64)
+
+    def _response(self, rows: np.ndarray, scores: np.ndarray, top_k: int, include_values: bool,
+                  include_metadata: bool, namespace: str) -> dict:
+        if rows.size == 0:
+            return {'matches': [], 'namespace': namespace}
+        k = min(top_k, rows.size)
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind='stable')]
+        matches = []
+        for position in top:
+            row = int(rows[position])
+            match = {'id': self.ids[row], 'score': float(scores[position])}
+            if include_values:
+                match['values'] = self.matrix[row].tolist()
+            if include_metadata:
+                match['metadata'] = dict(self.metadata[row])
+            matches.append(match)
+        return {'matches': matches, 'namespace': namespace}
+
+    def query(self, vector, top_k: int = 10, namespace: str = '', filter: dict = None,
+              include_values: bool = False, include_metadata: bool = False, sparse_vector: dict = None) -> dict:
+        """
+        Scores every vector with one matrix-vector product and returns the top-k matches.
+
+        Args:
+            vector (list): Query vector.
+            top_k (int, optional): Number of matches. Defaults to 10.
+            namespace (str, optional): Accepted for compatibility with the hosted index; the artifact has one namespace.
+            filter (dict, optional): Metadata filter.
+            include_values (bool, optional): Whether to return vector values. Defaults to False.
+            include_metadata (bool, optional): Whether to return metadata. Defaults to False.
+            sparse_vector (dict, optional): Accepted for compatibility with hybrid queries; only dense scores are used.
+
+        Returns:
+            dict: {'matches': [{'id', 'score', 'values', 'metadata'}], 'namespace': namespace}.
+        """
+        query_vector = normalize_rows(np.asarray(vector, dtype=np.float32)[None, :])[0]
+        rows = self._candidate_rows(filter)
+        if rows is None:
+            scores = self.matrix @ query_vector
+            rows = np.arange(len(self.ids), dtype=np.int64)
+        else:
+            scores = self.matrix[rows] @ query_vector
+        return self._response(rows, scores, top_k, include_values, include_metadata, namespace)
+
+
+class IVFIndex(ExactSearchIndex):
+    def __init__(self, ids: List[str], matrix: np.ndarray, metadata: List[dict], n_lists: int = 64,
+                 n_probe: int = 8, iterations: int = 20, seed: int = 0, centroids: np.ndarray = None,
+                 offsets: np.ndarray = None):
+        """
+        Initializes the approximate index, clustering the vectors unless centroids are given.
+
+        Rows are stored grouped by cluster so every inverted list is a contiguous slice of the matrix.
+
+        Args:
+            ids (List[str]): Vector ids.
+            matrix (np.ndarray): float32 matrix with L2-normalized rows.
+            metadata (List[dict]): Metadata per row.
+            n_lists (int, optional): Number of clusters. Defaults to 64.
+            n_probe (int, optional): Number of clusters scanned per query; higher means better recall, slower queries. Defaults to 8.
+            iterations (int, optional): Number of k-means iterations. Defaults to 20.
+            seed (int, optional): Random seed of the clustering. Defaults to 0.
+            centroids (np.ndarray, optional): Precomputed centroids, used when loading.
+            offsets (np.ndarray, optional): Start row of each inverted list plus the total, used when loading.
+        """
+        self.n_probe = n_probe
+        if centroids is not None:
+            super().__init__(ids, matrix, metadata)
+            self.centroids, self.offsets = centroids, offsets
+            return
+
+        matrix = np.asarray(matrix, dtype=np.float32)
+        n_lists = max(1, min(n_lists, len(ids)))
+        centroids = self._kmeans(matrix, n_lists, iterations, seed)
+        assignments = np.argmax(matrix @ centroids.T, axis=1)
+        order = np.argsort(assignments, kind='stable')
+        counts = np.bincount(assignments, minlength=n_lists)
+        super().__init__([ids[row] for row in order], matrix[order], [metadata[row] for row in order])
+        self.centroids = centroids
+        self.offsets = np.concatenate([[0], np.cumsum(counts)]).astype(np.int64)
+        logger.info(f"IVF index built: {len(ids)} vectors in {n_lists} lists")
+
+    @staticmethod
+    def _kmeans(matrix: np.ndarray, n_lists: int, iterations: int, seed: int) -> np.ndarray:
+        rng = np.random.default_rng(seed)
+        # Train on a sample, as is usual for IVF, to keep build time independent of corpus size
+        sample_size = min(len(matrix), n_lists * 256)
+        sample = matrix[rng.choice(len(matrix), size=sample_size, replace=False)]
+        centroids = sample[rng.choice(sample_size, size=n_lists, replace=False)].copy()
+        for _ in range(iterations):
+            assignments = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignments, sample)
+            counts = np.bincount(assignments, minlength=n_lists)
+            empty = counts == 0
+            if empty.any():
+                sums[empty] = sample[rng.choice(sample_size, size=int(empty.sum()), replace=False)]
+            centroids = normalize_rows(sums)
+        return centroids
+
+    @classmethod
+    def from_artifact(cls, read_data_dir: Path, n_lists: int = 64, n_probe: int = 8, iterations: int = 20,
+                      seed: int = 0):
+        ids, matrix, metadata = load_artifact(read_data_dir)
+        return cls(ids, matrix, metadata, n_lists, n_probe, iterations, seed)
+
+    def query(self, vector, top_k: int = 10, namespace: str = '', filter: dict = None,
+              include_values: bool = False, include_metadata: bool = False, sparse_vector: dict = None,
+              n_probe: int = None) -> dict:
+        """
+        Scores only the vectors of the n_probe clusters closest to the query.
+
+        Args:
+            vector (list): Query vector.
+            top_k (int, optional): Number of matches. Defaults to 10.
+            namespace (str, optional): Accepted for compatibility with the hosted index.
+            filter (dict, optional): Metadata filter.
+            include_values (bool, optional): Whether to return vector values. Defaults to False.
+            include_metadata (bool, optional): Whether to return metadata. Defaults to False.
+            sparse_vector (dict, optional): Accepted for compatibility with hybrid queries; only dense scores are used.
+            n_probe (int, optional): Overrides the number of scanned clusters for this query.
+
+        Returns:
+            dict: {'matches': [{'id', 'score', 'values', 'metadata'}], 'namespace': namespace}.
+        """
+        query_vector = normalize_rows(np.asarray(vector, dtype=np.float32)[None, :])[0]
+        n_probe = min(n_probe or self.n_probe, len(self.centroids))
+        centroid_scores = self.centroids @ query_vector
+        probes = np.argpartition(-centroid_scores, n_probe - 1)[:n_probe]
+        rows = np.concatenate([np.arange(self.offsets[probe], self.offsets[probe + 1]) for probe in probes])
+        if filter:
+            rows = np.array([row for row in rows if matches_filter(self.metadata[row], filter)], dtype=np.int64)
+        scores = self.matrix[rows] @ query_vector if rows.size else np.zeros(0, dtype=np.float32)
+        return self._response(rows, scores, top_k, include_values, include_metadata, namespace)
+
+    def save(self, index_file: Path):
+        """
+        Persists the index as an .npz file (centroids, offsets, vectors) plus a .json file (ids, metadata, n_probe).
+
+        Args:
+            index_file (Path): Destination .npz file.
+        """
+        index_file = Path(index_file)
+        os.makedirs(index_file.parent, exist_ok=True)
+        np.savez(index_file, centroids=self.centroids, offsets=self.offsets, matrix=self.matrix)
+        with open(index_file.with_suffix('.json'), 'w') as f:
+            json.dump({'ids': self.ids, 'metadata': self.metadata, 'n_probe': self.n_probe}, f, default=str)
+        logger.info(f"IVF index saved at: {index_file}")
+
+    @classmethod
+    def load(cls, index_file: Path, n_probe: int = None):
+        """
+        Loads an index written by save().
+
+        Args:
+            index_file (Path): .npz file written by save().
+            n_probe (int, optional): Overrides the persisted number of scanned clusters.
+
+        Returns:
+            IVFIndex: The restored index.
+        """
+        index_file = Path(index_file)
+        arrays = np.load(index_file)
+        with open(index_file.with_suffix('.json'), 'r') as f:
+            payload = json.load(f)
+        logger.info(f"IVF index loaded from: {index_file}")
+        return cls(payload['ids'], arrays['matrix'], payload['metadata'], n_probe=n_probe or payload['n_probe'],
+                   centroids=arrays['centroids'], offsets=arrays['offsets'])
+
+
+def build_ivf_index(config: LocalSearchConfig) -> IVFIndex:
+    """
+    Builds the approximate index from the ingestion artifact and persists it.
+
+    Args:
+        config (LocalSearchConfig): Local search configuration.
+
+    Returns:
+        IVFIndex: The built index.
+    """
+    index = IVFIndex.from_artifact(config.read_data_dir, n_lists=config.n_lists, n_probe=config.n_probe,
+                                   iterations=config.kmeans_iterations, seed=config.seed)
+    index.save(config.ivf_index_file)
+    return index
@@ -0,0 +1,558 @@
+from vector_db_pipeline import logger
+from pathlib import Path
+from typing import Dict, List, Optional
+import numpy as np
+import threading
+import random
+import shutil
+import json
+import os
+
+
+"""
+In-process stand-in for the Pinecone client, used for offline tests and benchmarks.
+
+Vectors are kept per namespace in NumPy matrices and searched by brute force. Sparse values,
+when given, are kept per row and added to the dense score of hybrid queries, as Pinecone does
+for sparse-dense vectors.
+The client and index objects expose the subset of the Pinecone interface used by
+the pipeline and return the same dictionary shapes, so components can switch
+backends through the INDEX_INFO.BACKEND parameter.
+
+Classes:
+    LocalIndexError: Raised for invalid operations and injected failures.
+    LocalIndex: Index handle supporting upsert, query, fetch, delete, list and describe_index_stats.
+    LocalPinecone: Client supporting list_indexes, create_index, describe_index, delete_index and Index.
+
+Functions:
+    matches_filter(metadata, metadata_filter): Evaluates a Pinecone style metadata filter.
+    get_index_client(index_info, persist_dir): Returns the client for the configured backend.
+"""
+
+
+class LocalIndexError(Exception):
+    pass
+
+
+_COMPARATORS = {
+    '$eq': lambda value, target: value == target,
+    '$ne': lambda value, target: value != target,
+    '$gt': lambda value, target: value is not None and value > target,
+    '$gte': lambda value, target: value is not None and value >= target,
+    '$lt': lambda value, target: value is not None and value < target,
+    '$lte': lambda value, target: value is not None and value <= target,
+    '$in': lambda value, target: value in target,
+    '$nin': lambda value, target: value not in target,
+}
+
+
+def matches_filter(metadata: dict, metadata_filter: Optional[dict]) -> bool:
+    """
+    Evaluates a Pinecone style metadata filter against a metadata dictionary.
+
+    Args:
+        metadata (dict): Metadata of a vector.
+        metadata_filter (dict, optional): Filter such as {"host": {"$eq": "www.svpg.com"}}.
+
+    Returns:
+        bool: True if the metadata satisfies the filter or no filter is given.
+    """
+    if not metadata_filter:
+        return True
+    metadata = metadata or {}
+    for key, condition in metadata_filter.items():
+        if key == '$and':
+            if not all(matches_filter(metadata, sub_filter) for sub_filter in condition):
+                return False
+        elif key == '$or':
+            if not any(matches_filter(metadata, sub_filter) for sub_filter in condition):
+                return False
+        elif isinstance(condition, dict):
+            value = metadata.get(key)
+            for operator, target in condition.items():
+                if operator not in _COMPARATORS:
+                    raise LocalIndexError(f"Unsupported filter operator: {operator}")
+                if not _COMPARATORS[operator](value, target):
+                    return False
+        elif metadata.get(key) != condition:
+            return False
+    return True
+
+
+class _Namespace:
+    def __init__(self, dimension: int):
+        """
+        Initializes an empty namespace with a growable vector matrix.
+
+        Args:
+            dimension (int): Dimension of the stored vectors.
+        """
+        self.matrix = np.zeros((0, dimension), dtype=np.float32)
+        self.ids = []
+        self.metadata = []
+        self.sparse = []
+        self.rows = {}
+
+    def __len__(self):
+        return len(self.ids)
+
+    def _reserve(self, size: int):
+        if size > self.matrix.shape[0]:
+            capacity = max(size, 2 * self.matrix.shape[0], 64)
+            matrix = np.zeros((capacity, self.matrix.shape[1]), dtype=np.float32)
+            matrix[:len(self.ids)] = self.matrix[:len(self.ids)]
+            self.matrix = matrix
+
+    def put(self, vector_id: str, values: np.ndarray, metadata: dict, sparse: Optional[dict] = None):
+        row = self.rows.get(vector_id)
+        if row is None:
+            row = len(self.ids)
+            self._reserve(row + 1)
+            self.ids.append(vector_id)
+            self.metadata.append(metadata)
+            self.sparse.append(sparse)
+            self.rows[vector_id] = row
+        else:
+            self.metadata[row] = metadata
+            self.sparse[row] = sparse
+        self.matrix[row] = values
+
+    def remove(self, vector_id: str):
+        row = self.rows.pop(vector_id, None)
+        if row is None:
+            return
+        last = len(self.ids) - 1
+        if row != last:
+            # Move the last row into the freed slot to keep the matrix dense
+            self.matrix[row] = self.matrix[last]
+            self.ids[row] = self.ids[last]
+            self.metadata[row] = self.metadata[last]
+            self.sparse[row] = self.sparse[last]
+            self.rows[self.ids[row]] = row
+        self.ids.pop()
+        self.metadata.pop()
+        self.sparse.pop()
+
+    def active_matrix(self) -> np.ndarray:
+        return self.matrix[:len(self.ids)]
+
+
+class LocalIndex:
+    def __init__(self, name: str, dimension: int, metric: str = 'cosine', failure_rate: float = 0.0, seed: int = 0):
+        """
+        Initializes an empty local index.
+
+        Args:
+            name (str): Name of the index.
+            dimension (int): Dimension of the stored vectors.
+            metric (str, optional): One of 'cosine', 'dotproduct' or 'euclidean'. Defaults to 'cosine'.
+            failure_rate (float, optional): Probability that an upsert raises, to exercise retry logic. Defaults to 0.0.
+            seed (int, optional): Seed of the failure injection generator. Defaults to 0.
+        """
+        if metric not in ('cosine', 'dotproduct', 'euclidean'):
+            raise LocalIndexError(f"Unsupported metric: {metric}")
+        self.name = name
+        self.dimension = int(dimension)
+        self.metric = metric
+        self.failure_rate = failure_rate
+        self._random = random.Random(seed)
+        self._namespaces: Dict[str, _Namespace] = {}
+        self._lock = threading.RLock()
+
+    def _prepare(self, values) -> np.ndarray:
+        vector = np.asarray(values, dtype=np.float32)
+        if vector.shape != (self.dimension,):
+            raise LocalIndexError(f"Vector dimension {vector.shape} does not match index dimension {self.dimension}")
+        if self.metric == 'cosine':
+            norm = np.linalg.norm(vector)
+            if norm > 0:
+                vector = vector / norm
+        return vector
+
+    @staticmethod
+    def _unpack(vector):
+        if isinstance(vector, dict):
+            return vector['id'], vector['values'], vector.get('metadata') or {}, vector.get('sparse_values')
+        vector_id, values = vector[0], vector[1]
+        metadata = vector[2] if len(vector) > 2 else {}
+        sparse_values = vector[3] if len(vector) > 3 else None
+        return vector_id, values, metadata or {}, sparse_values
+
+    @staticmethod
+    def _prepare_sparse(sparse_values: Optional[dict]) -> Optional[dict]:
+        if not sparse_values:
+            return None
+        indices, values = list(sparse_values['indices']), list(sparse_values['values'])
+        if len(indices) != len(values):
+            raise LocalIndexError("Sparse indices and values have different lengths")
+        return {int(index): float(value) for index, value in zip(indices, values)}
+
+    def upsert(self, vectors: List, namespace: str = '') -> dict:
+        """
+        Inserts or overwrites vectors in a namespace.
+
+        Args:
+            vectors (list): Dictionaries with 'id', 'values', 'metadata' and optionally 'sparse_values',
+                or (id, values, metadata, sparse_values) tuples.
+            namespace (str, optional): Target namespace. Defaults to ''.
+
+        Returns:
+            dict: {'upserted_count': number of vectors written}.
+        """
+        if self.failure_rate and self._random.random() < self.failure_rate:
+            raise LocalIndexError("Injected upsert failure")
+        prepared = []
+        for vector in vectors:
+            vector_id, values, metadata, sparse_values = self._unpack(vector)
+            if sparse_values and self.metric != 'dotproduct':
+                raise LocalIndexError(f"Sparse values require a dotproduct index, {self.name} uses {self.metric}")
+            prepared.append((str(vector_id), self._prepare(values), dict(metadata), self._prepare_sparse(sparse_values)))
+        with self._lock:
+            store = self._namespaces.setdefault(namespace, _Namespace(self.dimension))
+            for vector_id, values, metadata, sparse in prepared:
+                store.put(vector_id, values, metadata, sparse)
+        return {'upserted_count': len(prepared)}
+
+    def _scores(self, matrix: np.ndarray, vector: np.ndarray) -> np.ndarray:
+        if self.metric == 'euclidean':
+            return -np.linalg.norm(matrix - vector, axis=1)
+        return matrix @ vector
+
+    @staticmethod
+    def _sparse_scores(store: _Namespace, candidates: np.ndarray, sparse_vector: dict) -> np.ndarray:
+        query_terms = {int(index): float(value) for index, value in zip(sparse_vector['indices'], sparse_vector['values'])}
+        scores = np.zeros(candidates.size, dtype=np.float32)
+        for position, row in enumerate(candidates):
+            sparse = store.sparse[row]
+            if sparse:
+                scores[position] = sum(value * sparse.get(index, 0.0) for index, value in query_terms.items())
+        return scores
+
+    def query(self, vector=None, id: str = None, top_k: int = 10, namespace: str = '', filter: dict = None,
+              include_values: bool = False, include_metadata: bool = False, sparse_vector: dict = None) -> dict:
+        """
+        Runs a brute-force similarity search in a namespace.
+
+        Hybrid queries add the dot product of the sparse query and stored sparse values to the dense score.
+        As with Pinecone, callers weight the two parts by scaling the query vectors, and only dotproduct
+        indexes accept them: cosine would normalize the scaled dense query and undo the weighting.
+
+        Args:
+            vector (list, optional): Query vector.
+            id (str, optional): Id of a stored vector to use as the query instead of vector.
+            top_k (int, optional): Number of matches to return. Defaults to 10.
+            namespace (str, optional): Namespace to search. Defaults to ''.
+            filter (dict, optional): Metadata filter.
+            include_values (bool, optional): Whether to return vector values. Defaults to False.
+            include_metadata (bool, optional): Whether to return metadata. Defaults to False.
+            sparse_vector (dict, optional): Sparse query {'indices': [...], 'values': [...]}.
+
+        Returns:
+            dict: {'matches': [{'id', 'score', 'values', 'metadata'}], 'namespace': namespace}.
+        """
+        if sparse_vector and self.metric != 'dotproduct':
+            raise LocalIndexError(f"Sparse queries require a dotproduct index, {self.name} uses {self.metric}")
+        with self._lock:
+            store = self._namespaces.get(namespace)
+            if store is None or len(store) == 0:
+                return {'matches': [], 'namespace': namespace}
+            if id is not None:
+                if id not in store.rows:
+                    return {'matches': [], 'namespace': namespace}
+                query_vector = store.matrix[store.rows[id]]
+            else:
+                query_vector = self._prepare(vector)
+
+            matrix = store.active_matrix()
+            if filter:
+                candidates = np.array([row for row, metadata in enumerate(store.metadata)
+                                       if matches_filter(metadata, filter)], dtype=np.int64)
+            else:
+                candidates = np.arange(len(store), dtype=np.int64)
+            if candidates.size == 0:
+                return {'matches': [], 'namespace': namespace}
+
+            scores = self._scores(matrix[candidates], query_vector)
+            if sparse_vector:
+                scores = scores + self._sparse_scores(store, candidates, sparse_vector)
+            k = min(top_k, candidates.size)
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top], kind='stable')]
+
+            matches = []
+            for position in top:
+                row = int(candidates[position])
+                match = {'id': store.ids[row], 'score': float(scores[position])}
+                if include_values:
+                    match['values'] = store.matrix[row].tolist()
+                if include_metadata:
+                    match['metadata'] = dict(store.metadata[row])
+                matches.append(match)
+        return {'matches': matches, 'namespace': namespace}
+
+    def fetch(self, ids: List[str], namespace: str = '') -> dict:
+        """
+        Fetches stored vectors by id.
+
+        Args:
+            ids (list): Ids to fetch. Missing ids are skipped.
+            namespace (str, optional): Namespace to read from. Defaults to ''.
+
+        Returns:
+            dict: {'vectors': {id: {'id', 'values', 'metadata'}}, 'namespace': namespace}.
+        """
+        vectors = {}
+        with self._lock:
+            store = self._namespaces.get(namespace)
+            if store is not None:
+                for vector_id in ids:
+                    row = store.rows.get(vector_id)
+                    if row is not None:
+                        vectors[vector_id] = {'id': vector_id, 'values': store.matrix[row].tolist(),
+                                              'metadata': dict(store.metadata[row])}
+                        if store.sparse[row]:
+                            sparse = store.sparse[row]
+                            vectors[vector_id]['sparse_values'] = {'indices': list(sparse),
+                                                                   'values': list(sparse.values())}
+        return {'vectors': vectors, 'namespace': namespace}
+
+    def delete(self, ids: List[str] = None, delete_all: bool = False, namespace: str = '', filter: dict = None) -> dict:
+        """
+        Deletes vectors by id, by metadata filter, or the whole namespace.
+
+        Args:
+            ids (list, optional): Ids to delete.
+            delete_all (bool, optional): Whether to delete the whole namespace. Defaults to False.
+            namespace (str, optional): Namespace to delete from. Defaults to ''.
+            filter (dict, optional): Metadata filter selecting vectors to delete.
+
+        Returns:
+            dict: Empty dictionary, as returned by Pinecone.
+        """
+        with self._lock:
+            if delete_all:
+                self._namespaces.pop(namespace, None)
+                return {}
+            store = self._namespaces.get(namespace)
+            if store is None:
+                return {}
+            targets = list(ids or [])
+            if filter:
+                targets.extend(vector_id for vector_id, metadata in zip(store.ids, store.metadata)
+                               if matches_filter(metadata, filter))
+            for vector_id in targets:
+                store.remove(vector_id)
+            if len(store) == 0:
+                self._namespaces.pop(namespace, None)
+        return {}
+
+    def list(self, prefix: str = None, limit: int = 100, namespace: str = ''):
+        """
+        Yields pages of vector ids in a namespace.
+
+        Args:
+            prefix (str, optional): Only ids starting with this prefix are listed.
+            limit (int, optional): Page size. Defaults to 100.
+            namespace (str, optional): Namespace to list. Defaults to ''.
+
+        Yields:
+            list: Page of vector ids.
+        """
+        with self._lock:
+            store = self._namespaces.get(namespace)
+            ids = sorted(store.ids) if store is not None else []
+        if prefix:
+            ids = [vector_id for vector_id in ids if vector_id.startswith(prefix)]
+        for start in range(0, len(ids), limit):
+            yield ids[start:start + limit]
+
+    def describe_index_stats(self, filter: dict = None) -> dict:
+        """
+        Returns vector counts per namespace.
+
+        Args:
+            filter (dict, optional): Only vectors matching this metadata filter are counted.
+
+        Returns:
+            dict: {'dimension', 'index_fullness', 'total_vector_count', 'namespaces': {namespace: {'vector_count'}}}.
+        """
+        with self._lock:
+            namespaces = {}
+            for namespace, store in self._namespaces.items():
+                if filter:
+                    count = sum(1 for metadata in store.metadata if matches_filter(metadata, filter))
+                else:
+                    count = len(store)
+                namespaces[namespace] = {'vector_count': count}
+        return {'dimension': self.dimension, 'index_fullness': 0.0,
+                'total_vector_count': sum(ns['vector_count'] for ns in namespaces.values()),
+                'namespaces': namespaces}
+
+    def save(self, index_dir: Path):
+        """
+        Persists the index to a directory: one .npy matrix per namespace plus a JSON manifest.
+
+        Args:
+            index_dir (Path): Directory to write into.
+        """
+        index_dir = Path(index_dir)
+        os.makedirs(index_dir, exist_ok=True)
+        with self._lock:
+            manifest = {'name': self.name, 'dimension': self.dimension, 'metric': self.metric, 'namespaces': []}
+            for position, (namespace, store) in enumerate(self._namespaces.items()):
+                matrix_file = f"namespace_{position}.npy"
+                np.save(index_dir / matrix_file, store.active_matrix())
+                sparse = [None if values is None else {'indices': list(values), 'values': list(values.values())}
+                          for values in store.sparse]
+                manifest['namespaces'].append({'namespace': namespace, 'matrix_file': matrix_file,
+                                               'ids': store.ids, 'metadata': store.metadata, 'sparse': sparse})
+        with open(index_dir / 'manifest.json', 'w') as f:
+            json.dump(manifest, f)
+
+    @classmethod
+    def load(cls, index_dir: Path, failure_rate: float = 0.0, seed: int = 0):
+        """
+        Loads an index written by save().
+
+        Args:
+            index_dir (Path): Directory containing manifest.json.
+            failure_rate (float, optional): Upsert failure injection rate. Defaults to 0.0.
+            seed (int, optional): Seed of the failure injection generator. Defaults to 0.
+
+        Returns:
+            LocalIndex: The restored index.
+        """
+        index_dir = Path(index_dir)
+        with open(index_dir / 'manifest.json') as f:
+            manifest = json.load(f)
+        index = cls(manifest['name'], manifest['dimension'], manifest['metric'], failure_rate, seed)
+        for entry in manifest['namespaces']:
+            store = _Namespace(index.dimension)
+            store.matrix = np.load(index_dir / entry['matrix_file']).astype(np.float32)
+            store.ids = entry['ids']
+            store.metadata = entry['metadata']
+            # Manifests written before sparse support have no 'sparse' entry
+            store.sparse = [cls._prepare_sparse(values) for values in entry.get('sparse', [None] * len(store.ids))]
+            store.rows = {vector_id: row for row, vector_id in enumerate(store.ids)}
+            index._namespaces[entry['namespace']] = store
+        return index
+
+
+class _IndexDescription(dict):
+    def __getattr__(self, key):
+        try:
+            return self[key]
+        except KeyError:
+            raise AttributeError(key)
+
+
+# Indexes shared by every LocalPinecone client of the same persist_dir within the process,
+# so separate pipeline stages see the same data, as they would with the hosted service.
+_REGISTRY: Dict[str, Dict[str, LocalIndex]] = {}
+_REGISTRY_LOCK = threading.Lock()
+
+
+class LocalPinecone:
+    def __init__(self, persist_dir: Optional[str] = None, failure_rate: float = 0.0, seed: int = 0):
+        """
+        Initializes the local client, loading any indexes persisted in persist_dir.
+
+        Args:
+            persist_dir (str, optional): Directory used by flush() and to restore indexes. Defaults to None (memory only).
+            failure_rate (float, optional): Upsert failure injection rate applied to created indexes. Defaults to 0.0.
+            seed (int, optional): Seed of the failure injection generator. Defaults to 0.
+        """
+        self.persist_dir = Path(persist_dir) if persist_dir else None
+        self.failure_rate = failure_rate
+        self.seed = seed
+        key = str(self.persist_dir.resolve()) if self.persist_dir else ''
+        with _REGISTRY_LOCK:
+            if key not in _REGISTRY:
+                _REGISTRY[key] = self._load_persisted()
+            self._indexes = _REGISTRY[key]
+
+    def _load_persisted(self) -> Dict[str, LocalIndex]:
+        indexes = {}
+        if self.persist_dir and self.persist_dir.exists():
+            for index_dir in self.persist_dir.iterdir():
+                if (index_dir / 'manifest.json').exists():
+                    index = LocalIndex.load(index_dir, self.failure_rate, self.seed)
+                    indexes[index.name] = index
+                    logger.info(f"Local index '{index.name}' loaded from {index_dir}")
+        return indexes
+
+    def list_indexes(self) -> List[dict]:
+        """
+        Returns the description of every index.
+        """
+        return [self.describe_index(name) for name in list(self._indexes)]
+
+    def create_index(self, name: str, dimension: int, metric: str = 'cosine', spec=None, **kwargs):
+        """
+        Creates an empty index. The spec argument is accepted for compatibility and ignored.
+        """
+        if name in self._indexes:
+            raise LocalIndexError(f"Index '{name}' already exists")
+        self._indexes[name] = LocalIndex(name, dimension, metric, self.failure_rate, self.seed)
+
+    def describe_index(self, name: str) -> _IndexDescription:
+        """
+        Returns the name, dimension, metric and status of an index. Local indexes are always ready.
+        """
+        if name not in self._indexes:
+            raise LocalIndexError(f"Index '{name}' not found")
+        index = self._indexes[name]
+        return _IndexDescription(name=index.name, dimension=index.dimension, metric=index.metric,
+                                 status={'ready': True, 'state': 'Ready'})
+
+    def delete_index(self, name: str):
+        """
+        Deletes an index and its persisted files.
+        """
+        if name not in self._indexes:
+            raise LocalIndexError(f"Index '{name}' not found")
+        del self._indexes[name]
+        if self.persist_dir and (self.persist_dir / name).exists():
+            shutil.rmtree(self.persist_dir / name)
+
+    def Index(self, name: str) -> LocalIndex:
+        """
+        Returns the handle of an existing index.
+        """
+        if name not in self._indexes:
+            raise LocalIndexError(f"Index '{name}' not found")
+        return self._indexes[name]
+
+    def flush(self):
+        """
+        Persists every index to persist_dir. Does nothing for memory-only clients.
+        """
+        if not self.persist_dir:
+            return
+        for name, index in self._indexes.items():
+            index.save(self.persist_dir / name)
+        logger.info(f"Local indexes persisted in {self.persist_dir}")
+
+
+def get_index_client(index_info: dict, persist_dir: Optional[str] = None):
+    """
+    Returns the vector database client selected by INDEX_INFO.BACKEND.
+
+    Args:
+        index_info (dict): INDEX_INFO parameters.
+        persist_dir (str, optional): Directory of the local backend.
+
+    Returns:
+        Pinecone or LocalPinecone: Client exposing the Pinecone interface.
+    """
+    backend = index_info.get('BACKEND', 'pinecone')
+    if backend == 'local':
+        logger.info("Using local in-process vector store")
+        return LocalPinecone(persist_dir=persist_dir, failure_rate=index_info.get('LOCAL_FAILURE_RATE', 0.0))
+    if backend != 'pinecone':
+        raise ValueError(f"Unknown vector database backend: {backend}")
+
+    from pinecone import Pinecone
+    from dotenv import load_dotenv
+    load_dotenv()
+    return Pinecone(api_key=os.getenv("PINECONE_API_KEY"))
@@ -0,0 +1,87 @@
+from hashlib import blake2b
+from typing import Optional
+import re
+
+
+"""
+Maps vectors to shard namespaces of a base namespace.
+
+With SHARDING.MODE host every source host gets its own namespace, e.g. 'blog--www.svpg.com'; with
+MODE hash vectors are spread over HASH_BUCKETS namespaces by the hash of their page url, e.g.
+'blog--03', so the chunks of a page always share a namespace. MODE none keeps the base namespace.
+
+Attributes:
+    mode (str): 'none', 'host' or 'hash'.
+    hash_buckets (int): Number of namespaces of the hash mode.
+
+Methods:
+    namespace_for(base_namespace, metadata): Returns the namespace of a vector.
+    is_shard(base_namespace, namespace): Checks whether a namespace is a shard of a base namespace.
+    namespace_for_filter(base_namespace, metadata_filter): Returns the only namespace a filtered query can match, if any.
+"""
+
+SHARD_SEPARATOR = '--'
+_UNSAFE_CHARACTERS = re.compile(r'[^A-Za-z0-9._-]')
+
+
+class NamespaceRouter:
+    def __init__(self, sharding: dict):
+        """
+        Initializes the router from the SHARDING parameters.
+
+        Args:
+            sharding (dict): SHARDING parameters (MODE, HASH_BUCKETS).
+        """
+        self.mode = sharding.MODE
+        self.hash_buckets = int(sharding.HASH_BUCKETS)
+        if self.mode not in ('none', 'host', 'hash'):
+            raise ValueError(f"Unknown sharding mode: {self.mode}")
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode != 'none'
+
+    def _shard(self, value: str) -> str:
+        if self.mode == 'host':
+            return _UNSAFE_CHARACTERS.sub('_', value)
+        bucket = int.from_bytes(blake2b(value.encode('utf-8'), digest_size=8).digest(), 'big') % self.hash_buckets
+        return f"{bucket:02d}"
+
+    def namespace_for(self, base_namespace: str, metadata: dict) -> str:
+        """
+        Returns the namespace of a vector.
+
+        Args:
+            base_namespace (str): Namespace without sharding, e.g. INDEX_INFO.NAMESPACE.
+            metadata (dict): Vector metadata with 'host' and 'url'.
+
+        Returns:
+            str: Shard namespace, or the base namespace when sharding is disabled.
+        """
+        if not self.enabled:
+            return base_namespace
+        key = metadata.get('host') if self.mode == 'host' else metadata.get('url')
+        return f"{base_namespace}{SHARD_SEPARATOR}{self._shard(str(key))}"
+
+    def is_shard(self, base_namespace: str, namespace: str) -> bool:
+        return namespace.startswith(f"{base_namespace}{SHARD_SEPARATOR}")
+
+    def namespace_for_filter(self, base_namespace: str, metadata_filter: Optional[dict]) -> Optional[str]:
+        """
+        Returns the only namespace a query can match when its filter pins the routing field to one value.
+
+        Args:
+            base_namespace (str): Namespace without sharding.
+            metadata_filter (dict, optional): Pinecone metadata filter, e.g. {"host": {"$eq": "www.svpg.com"}}.
+
+        Returns:
+            str or None: Shard namespace, or None when the query has to run against every shard.
+        """
+        if not self.enabled or not metadata_filter:
+            return None
+        condition = metadata_filter.get('host' if self.mode == 'host' else 'url')
+        if isinstance(condition, dict):
+            condition = condition.get('$eq') if list(condition) == ['$eq'] else None
+        if condition is None:
+            return None
+        return f"{base_namespace}{SHARD_SEPARATOR}{self._shard(str(condition))}"
@@ -0,0 +1,187 @@
+from vector_db_pipeline import logger
+from pathlib import Path
+from typing import List, Tuple
+import numpy as np
+import os
+
+
+"""
+Reduces embedding dimensionality with a PCA projection fitted on the corpus.
+
+Documents and queries go through the same persisted projection, so the index can be created
+with TARGET_DIM dimensions instead of the embedding model dimension. Both are L2-normalized after
+any projection with l2_normalize, so they have the same scale.
+
+Attributes:
+    mean (np.ndarray): Mean embedding of the fitted corpus.
+    components (np.ndarray): Principal axes, one row per output dimension.
+    explained_variance_ratio (float): Share of the corpus variance kept by the projection.
+
+Methods:
+    fit(matrix, target_dim, max_samples, seed): Fits the projection on corpus embeddings.
+    transform(vectors): Projects embeddings.
+    save(projection_file): Persists the projection.
+    load(projection_file): Restores a projection written by save().
+
+Functions:
+    l2_normalize(vectors): Scales embeddings to unit length and returns their previous norms.
+    neighbour_recall(full, projected, k_values, n_queries, seed): Compares nearest neighbours before and after projection.
+"""
+
+
+class PCAProjector:
+    def __init__(self, mean: np.ndarray, components: np.ndarray, explained_variance_ratio: float):
+        """
+        Initializes a fitted projection.
+
+        Args:
+            mean (np.ndarray): Mean embedding of the fitted corpus.
+            components (np.ndarray): Principal axes, shape (target_dim, input_dim).
+            explained_variance_ratio (float): Share of the corpus variance kept by the projection.
+        """
+        self.mean = np.asarray(mean, dtype=np.float32)
+        self.components = np.asarray(components, dtype=np.float32)
+        self.explained_variance_ratio = float(explained_variance_ratio)
+
+    @property
+    def input_dim(self) -> int:
+        return self.components.shape[1]
+
+    @property
+    def target_dim(self) -> int:
+        return self.components.shape[0]
+
+    @classmethod
+    def fit(cls, matrix, target_dim: int, max_samples: int = 20000, seed: int = 0):
+        """
+        Fits the projection on corpus embeddings.
+
+        Args:
+            matrix (array-like): Corpus embeddings, one row per chunk.
+            target_dim (int): Output dimension.
+            max_samples (int, optional): Rows sampled for the fit. Defaults to 20000.
+            seed (int, optional): Sampling seed. Defaults to 0.
+
+        Raises:
+            ValueError: If target_dim exceeds the embedding dimension or the number of sampled rows.
+
+        Returns:
+            PCAProjector: The fitted projection.
+        """
+        matrix = np.asarray(matrix, dtype=np.float32)
+        if len(matrix) > max_samples:
+            matrix = matrix[np.random.default_rng(seed).choice(len(matrix), max_samples, replace=False)]
+        if target_dim > min(matrix.shape):
+            raise ValueError(f"Cannot project {matrix.shape[0]} embeddings of dimension {matrix.shape[1]} "
+                             f"to {target_dim} dimensions")
+        mean = matrix.mean(axis=0)
+        # Right singular vectors of the centered matrix are the principal axes, by decreasing variance
+        _, singular_values, axes = np.linalg.svd(matrix - mean, full_matrices=False)
+        variance = singular_values ** 2
+        explained = float(variance[:target_dim].sum() / variance.sum()) if variance.sum() > 0 else 1.0
+        logger.info(f"PCA fitted on {len(matrix)} embeddings: {matrix.shape[1]} -> {target_dim} dimensions, "
+                    f"{explained:.2%} of the variance kept")
+        return cls(mean, axes[:target_dim], explained)
+
+    def transform(self, vectors) -> np.ndarray:
+        """
+        Projects embeddings.
+
+        Args:
+            vectors (array-like): Embeddings of the input dimension, one per row.
+
+        Returns:
+            np.ndarray: Projected embeddings, shape (len(vectors), target_dim).
+        """
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if vectors.ndim != 2 or vectors.shape[1] != self.input_dim:
+            raise ValueError(f"Expected embeddings of dimension {self.input_dim}, got shape {vectors.shape}")
+        return (vectors - self.mean) @ self.components.T
+
+    def save(self, projection_file: Path):
+        """
+        Persists the projection as a .npz file.
+
+        Args:
+            projection_file (Path): Destination file.
+        """
+        os.makedirs(Path(projection_file).parent, exist_ok=True)
+        tmp_file = f"{projection_file}.tmp.npz"
+        np.savez(tmp_file, mean=self.mean, components=self.components,
+                 explained_variance_ratio=np.array(self.explained_variance_ratio))
+        os.replace(tmp_file, projection_file)
+        logger.info(f"PCA projection saved at: {projection_file}")
+
+    @classmethod
+    def load(cls, projection_file: Path):
+        """
+        Restores a projection written by save().
+
+        Args:
+            projection_file (Path): File written by save().
+
+        Returns:
+            PCAProjector: The restored projection.
+        """
+        with np.load(projection_file) as payload:
+            return cls(payload['mean'], payload['components'], float(payload['explained_variance_ratio']))
+
+
+def l2_normalize(vectors) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Scales embeddings to unit length, so cosine similarity becomes a plain dot product. Zero vectors are left
+    as they are.
+
+    Args:
+        vectors (array-like): Embeddings, one per row, after any projection.
+
+    Returns:
+        tuple: (normalized embeddings, norm each embedding had).
+    """
+    matrix = np.asarray(vectors, dtype=np.float64)
+    norms = np.linalg.norm(matrix, axis=1)
+    return matrix / np.where(norms > 0, norms, 1.0)[:, None], norms
+
+
+def _top_k(matrix: np.ndarray, query_rows: np.ndarray, k: int) -> np.ndarray:
+    normalized = matrix / np.maximum(np.linalg.norm(matrix, axis=1, keepdims=True), 1e-12)
+    similarities = normalized[query_rows] @ normalized.T
+    # A query never counts as its own neighbour
+    similarities[np.arange(len(query_rows)), query_rows] = -np.inf
+    top = np.argpartition(-similarities, k - 1, axis=1)[:, :k]
+    order = np.argsort(-np.take_along_axis(similarities, top, axis=1), axis=1)
+    return np.take_along_axis(top, order, axis=1)
+
+
+def neighbour_recall(full, projected, k_values: List[int], n_queries: int = 200, seed: int = 0) -> dict:
+    """
+    Measures how many cosine nearest neighbours of the full embeddings are still found after projection.
+
+    A sample of corpus embeddings serves as queries; recall@k is the share of the k nearest neighbours
+    at the full dimension that are also among the k nearest neighbours at the reduced dimension.
+
+    Args:
+        full (array-like): Corpus embeddings at the full dimension.
+        projected (array-like): The same embeddings after projection.
+        k_values (List[int]): Cutoffs to report.
+        n_queries (int, optional): Number of sampled queries. Defaults to 200.
+        seed (int, optional): Sampling seed. Defaults to 0.
+
+    Returns:
+        dict: recall@k per k and the number of queries.
+    """
+    full = np.asarray(full, dtype=np.float32)
+    projected = np.asarray(projected, dtype=np.float32)
+    k_values = [k for k in k_values if k < len(full)]
+    if not k_values:
+        return {'queries': 0}
+    query_rows = np.random.default_rng(seed).choice(len(full), min(n_queries, len(full)), replace=False)
+    top_k = max(k_values)
+    full_neighbours = _top_k(full, query_rows, top_k)
+    projected_neighbours = _top_k(projected, query_rows, top_k)
+    recall = {'queries': int(len(query_rows))}
+    for k in k_values:
+        overlap = [len(set(expected[:k]) & set(found[:k])) for expected, found in
+                   zip(full_neighbours, projected_neighbours)]
+        recall[f"recall@{k}"] = float(np.mean(overlap) / k)
+    return recall
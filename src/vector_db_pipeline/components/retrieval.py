@@ -0,0 +1,446 @@
+from vector_db_pipeline.entity.config_entity import RetrievalConfig
+from vector_db_pipeline.components.local_vector_store import get_index_client
+from vector_db_pipeline.components.data_load import load_active_index
+from vector_db_pipeline.components.sparse_encoder import BM25Encoder
+from vector_db_pipeline.components.semantic_cache import SemanticResultCache
+from vector_db_pipeline.components.chunk_store import ChunkStore
+from vector_db_pipeline.components.namespace_router import NamespaceRouter
+from vector_db_pipeline.components.projection import PCAProjector, l2_normalize
+from vector_db_pipeline import logger
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from hashlib import sha256
+from pathlib import Path
+from typing import List, Optional
+import numpy as np
+import threading
+import sqlite3
+import os
+
+
+"""
+Query API over the configured vector index.
+
+Attributes:
+    config (RetrievalConfig): Configuration object containing retrieval settings.
+
+Classes:
+    QueryResult: One match of a query, with the chunk text and source fields of its metadata.
+    QueryEmbeddingCache: In-memory LRU in front of an on-disk SQLite cache of query embeddings.
+    Retriever: Embeds query text, runs dense or hybrid top-k searches with metadata filters and returns QueryResult
+        objects, optionally through a SemanticResultCache. Every query first checks whether a blue/green rebuild
+        switched the active index pointer, so long-lived retrievers follow the switch.
+"""
+
+
+@dataclass(frozen=True)
+class QueryResult:
+    id: str
+    score: float
+    text: str
+    host: str
+    page_title: str
+    url: str
+    metadata: dict
+
+
+class QueryEmbeddingCache:
+    def __init__(self, cache_file: Path, model: str, lru_size: int = 1024):
+        """
+        Opens the on-disk cache and initializes an empty LRU.
+
+        Args:
+            cache_file (Path): SQLite file storing embeddings across runs.
+            model (str): Embedding model name, part of every cache key.
+            lru_size (int, optional): Number of embeddings kept in memory. Defaults to 1024.
+        """
+        self.model = model
+        self.lru_size = lru_size
+        self._lru = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(Path(cache_file).parent, exist_ok=True)
+        self._db = sqlite3.connect(str(cache_file), check_same_thread=False)
+        self._db.execute("CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB)")
+        self._db.commit()
+
+    def key(self, text: str) -> str:
+        return sha256(f"{self.model}\0{text}".encode('utf-8')).hexdigest()
+
+    def _remember(self, key: str, vector: List[float]):
+        self._lru[key] = vector
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.lru_size:
+            self._lru.popitem(last=False)
+
+    def get_many(self, texts: List[str]) -> List[Optional[List[float]]]:
+        """
+        Looks up embeddings, first in memory, then on disk.
+
+        Args:
+            texts (List[str]): Query texts.
+
+        Returns:
+            list: Embedding per text, None for misses.
+        """
+        keys = [self.key(text) for text in texts]
+        found = {}
+        with self._lock:
+            for key in keys:
+                if key in self._lru:
+                    self._lru.move_to_end(key)
+                    found[key] = self._lru[key]
+            disk_keys = [key for key in set(keys) if key not in found]
+            for start in range(0, len(disk_keys), 500):
+                batch = disk_keys[start:start + 500]
+                rows = self._db.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({','.join('?' * len(batch))})", batch
+                ).fetchall()
+                for key, blob in rows:
+                    vector = np.frombuffer(blob, dtype=np.float32).tolist()
+                    found[key] = vector
+                    self._remember(key, vector)
+            results = [found.get(key) for key in keys]
+            hits = sum(result is not None for result in results)
+            self.hits += hits
+            self.misses += len(results) - hits
+        return results
+
+    def put_many(self, texts: List[str], vectors: List[List[float]]):
+        """
+        Stores embeddings in memory and on disk.
+        """
+        rows = []
+        with self._lock:
+            for text, vector in zip(texts, vectors):
+                key = self.key(text)
+                self._remember(key, list(vector))
+                rows.append((key, np.asarray(vector, dtype=np.float32).tobytes()))
+            self._db.executemany("INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)", rows)
+            self._db.commit()
+
+
+class Retriever:
+    def __init__(self, config: RetrievalConfig, embed_model=None, index=None, fallback_index=None):
+        """
+        Initializes the retriever on the active index and namespace.
+
+        Args:
+            config (RetrievalConfig): Configuration object containing retrieval settings.
+            embed_model (optional): Model exposing embed_documents. Defaults to the configured OpenAI model.
+            index (optional): Index handle exposing query(), e.g. a local search engine. Defaults to the configured backend.
+            fallback_index (optional): Index handle queried when the main index raises, e.g. an ExactSearchIndex.
+        """
+        self.config = config
+        self.fallback_index = fallback_index
+        self.index_name, self.namespace = load_active_index(config.active_index_file, config.index_info)
+        self._pointer_stamp = self.pointer_stamp()
+        # Indexes passed by the caller are kept across switches, only the namespace follows the pointer
+        self._index_client = None
+        if index is None:
+            self._index_client = get_index_client(config.index_info, persist_dir=config.local_index_dir)
+            index = self._index_client.Index(self.index_name)
+        self.index = index
+        if embed_model is None:
+            from langchain.embeddings.openai import OpenAIEmbeddings
+            embed_model = OpenAIEmbeddings(model=config.embedding_model)
+        self.embed_model = embed_model
+        self.cache = QueryEmbeddingCache(config.embedding_cache_file, config.embedding_model, config.lru_size)
+        self.sparse_encoder = None
+        if config.sparse_enabled:
+            if Path(config.sparse_vocab_file).exists():
+                self.sparse_encoder = BM25Encoder.load(config.sparse_vocab_file)
+            else:
+                logger.warning(f"No BM25 vocabulary at {config.sparse_vocab_file}, running dense-only queries")
+        self.projector = None
+        if config.projection_enabled:
+            if Path(config.projection_file).exists():
+                self.projector = PCAProjector.load(config.projection_file)
+            else:
+                logger.warning(f"No PCA projection at {config.projection_file}, queries keep the embedding dimension")
+        self.router = NamespaceRouter(config.sharding)
+        self._shard_namespaces = None
+        self.chunk_store = None
+        if config.metadata_offload.ENABLED:
+            self.chunk_store = ChunkStore(config.chunk_store_file)
+        self.result_cache = None
+        if config.result_cache.ENABLED:
+            self.result_cache = SemanticResultCache(config.generation_file,
+                                                    max_distance=config.result_cache.MAX_DISTANCE,
+                                                    ttl=config.result_cache.TTL,
+                                                    max_entries=config.result_cache.MAX_ENTRIES)
+
+    def pointer_stamp(self) -> tuple:
+        """
+        Returns the modification times of the active index pointer and of the generation file, None when missing.
+        """
+        stamp = []
+        for path in (self.config.active_index_file, self.config.generation_file):
+            try:
+                stamp.append(os.stat(path).st_mtime_ns)
+            except (OSError, TypeError):
+                stamp.append(None)
+        return tuple(stamp)
+
+    def refresh_active_index(self) -> bool:
+        """
+        Re-resolves the active index and namespace when the pointer or generation file changed since the last check.
+
+        Returns:
+            bool: Whether the retriever now queries another index or namespace.
+        """
+        stamp = self.pointer_stamp()
+        if stamp == self._pointer_stamp:
+            return False
+        self._pointer_stamp = stamp
+        # Uploads may have added or removed shards
+        self._shard_namespaces = None
+        index_name, namespace = load_active_index(self.config.active_index_file, self.config.index_info)
+        if (index_name, namespace) == (self.index_name, self.namespace):
+            return False
+        if self._index_client is not None and index_name != self.index_name:
+            self.index = self._index_client.Index(index_name)
+        logger.info(f"Active index switched from '{self.index_name}'/'{self.namespace}' to '{index_name}'/'{namespace}'")
+        self.index_name, self.namespace = index_name, namespace
+        return True
+
+    def encode_sparse_queries(self, texts: List[str]) -> List[Optional[dict]]:
+        """
+        Encodes query texts as BM25 sparse vectors, or returns None per text when hybrid search is off.
+        """
+        if self.sparse_encoder is None:
+            return [None] * len(texts)
+        return self.sparse_encoder.encode_queries(texts)
+
+    def hybrid_scale(self, vector: List[float], sparse_vector: dict):
+        """
+        Weights the dense part by HYBRID_ALPHA and the sparse part by 1 - HYBRID_ALPHA.
+
+        Args:
+            vector (List[float]): Query embedding.
+            sparse_vector (dict): BM25 query vector.
+
+        Returns:
+            tuple: (scaled dense vector, scaled sparse vector).
+        """
+        alpha = self.config.hybrid_alpha
+        return ([value * alpha for value in vector],
+                {'indices': sparse_vector['indices'], 'values': [value * (1 - alpha) for value in sparse_vector['values']]})
+
+    def embed_queries(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embeds query texts, sending every cache miss in a single embedding request.
+
+        The cache holds model embeddings; the PCA projection of the documents is applied afterwards, followed by
+        the same L2 normalization as the documents.
+
+        Args:
+            texts (List[str]): Query texts.
+
+        Returns:
+            List[List[float]]: One embedding per text.
+        """
+        vectors = self.cache.get_many(texts)
+        missing = list(dict.fromkeys(text for text, vector in zip(texts, vectors) if vector is None))
+        if missing:
+            embedded = self.embed_model.embed_documents(missing)
+            self.cache.put_many(missing, embedded)
+            by_text = dict(zip(missing, embedded))
+            vectors = [vector if vector is not None else by_text[text] for text, vector in zip(texts, vectors)]
+            logger.info(f"Embedded {len(missing)} queries, {len(texts) - len(missing)} served from cache")
+        if not vectors:
+            return vectors
+        if self.projector is not None:
+            vectors = self.projector.transform(vectors)
+        return l2_normalize(vectors)[0].tolist()
+
+    @staticmethod
+    def to_results(response) -> List[QueryResult]:
+        """
+        Converts a query response into QueryResult objects.
+        """
+        results = []
+        for match in response['matches']:
+            metadata = dict(match.get('metadata') or {})
+            results.append(QueryResult(
+                id=match['id'],
+                score=float(match['score']),
+                text=metadata.get('text', ''),
+                host=metadata.get('host', ''),
+                page_title=metadata.get('page_title', ''),
+                url=metadata.get('url', ''),
+                metadata=metadata
+            ))
+        return results
+
+    def hydrate(self, results_per_query: List[List[QueryResult]], namespace: str = None) -> List[List[QueryResult]]:
+        """
+        Restores the metadata fields offloaded to the chunk store, with one store lookup for every result.
+
+        Fields are read from the entries of the queried namespace, then of the active namespace and its shards,
+        whose matches carry no namespace after a fan-out.
+
+        Args:
+            results_per_query (List[List[QueryResult]]): Results of one or more queries.
+            namespace (str, optional): Namespace the results come from. Defaults to the active namespace.
+
+        Returns:
+            List[List[QueryResult]]: The same results with their offloaded fields, e.g. the chunk text.
+        """
+        if self.chunk_store is None:
+            return results_per_query
+        namespaces = [namespace or self.namespace, self.namespace]
+        if self.router.enabled:
+            namespaces.extend(self.shard_namespaces())
+        stored = self.chunk_store.get_many([result.id for results in results_per_query for result in results],
+                                           self.index_name, namespaces)
+        hydrated = []
+        for results in results_per_query:
+            hydrated_results = []
+            for result in results:
+                fields = stored.get(result.id)
+                if fields:
+                    metadata = {**result.metadata, **fields}
+                    result = replace(result, metadata=metadata, text=metadata.get('text', ''))
+                hydrated_results.append(result)
+            hydrated.append(hydrated_results)
+        return hydrated
+
+    def shard_namespaces(self, refresh: bool = False) -> List[str]:
+        """
+        Returns the shard namespaces of the active namespace, listing them once unless refresh is set.
+        """
+        if self._shard_namespaces is None or refresh:
+            stats = self.index.describe_index_stats()
+            self._shard_namespaces = sorted(namespace for namespace in (stats['namespaces'] or {})
+                                            if self.router.is_shard(self.namespace, namespace))
+        return self._shard_namespaces
+
+    def search(self, query_args: dict) -> dict:
+        """
+        Queries the index. With sharding, an unscoped query on the active namespace fans out over its
+        shards and the matches are merged by score.
+
+        Args:
+            query_args (dict): Arguments of index.query().
+
+        Returns:
+            dict: Query response with the top_k matches.
+        """
+        shards = self.shard_namespaces() if self.router.enabled and query_args['namespace'] == self.namespace else []
+        if not shards:
+            return self.index.query(**query_args)
+        matches = []
+        for shard in shards:
+            matches.extend(self.index.query(**{**query_args, 'namespace': shard})['matches'])
+        matches.sort(key=lambda match: -match['score'])
+        return {'matches': matches[:query_args['top_k']], 'namespace': query_args['namespace']}
+
+    def query_vector(self, vector: List[float], top_k: int = None, filter: dict = None,
+                     namespace: str = None, sparse_vector: dict = None, hydrate: bool = True) -> List[QueryResult]:
+        """
+        Runs a top-k search for an already embedded query, hybrid when a sparse vector is given.
+
+        With RESULT_CACHE.ENABLED, results of a previous query with a close enough embedding are reused. Hybrid
+        queries bypass the cache, whose entries only match on the dense embedding.
+        With SHARDING.MODE set, a filter pinning the host (host mode) or url (hash mode) to one value
+        only scans that shard; other queries scan every shard.
+
+        Args:
+            vector (List[float]): Query embedding.
+            top_k (int, optional): Number of results. Defaults to RETRIEVAL.TOP_K.
+            filter (dict, optional): Pinecone metadata filter, e.g. {"host": {"$eq": "www.svpg.com"}}.
+            namespace (str, optional): Namespace to search. Defaults to the active namespace.
+            sparse_vector (dict, optional): BM25 query vector from encode_sparse_queries.
+            hydrate (bool, optional): Whether to restore offloaded metadata fields. Defaults to True.
+
+        Returns:
+            List[QueryResult]: Results ordered by decreasing score.
+        """
+        top_k = top_k or self.config.top_k
+        self.refresh_active_index()
+        if namespace is None:
+            namespace = self.router.namespace_for_filter(self.namespace, filter) or self.namespace
+        hybrid = bool(sparse_vector and sparse_vector['indices'])
+        # A close dense embedding says nothing about the sparse terms, so hybrid results are never cached
+        use_cache = self.result_cache is not None and not hybrid
+        if use_cache:
+            cached = self.result_cache.get(self.index_name, namespace, vector, top_k, filter)
+            if cached is not None:
+                return self.hydrate([cached], namespace)[0] if hydrate else cached
+
+        query_args = dict(
+            vector=list(vector),
+            top_k=top_k,
+            namespace=namespace,
+            filter=filter,
+            include_metadata=True
+        )
+        if hybrid:
+            query_args['vector'], query_args['sparse_vector'] = self.hybrid_scale(query_args['vector'], sparse_vector)
+        try:
+            response = self.search(query_args)
+        except Exception as e:
+            if self.fallback_index is None:
+                raise e
+            logger.warning(f"Index query failed, using fallback index: {e}")
+            # Fallback results are not cached, so the hosted index answers again once it is back
+            results = self.to_results(self.fallback_index.query(**query_args))
+            return self.hydrate([results], namespace)[0] if hydrate else results
+        results = self.to_results(response)
+        if use_cache:
+            # Cached without offloaded fields, which are always read from the store
+            self.result_cache.put(self.index_name, namespace, vector, top_k, filter, results)
+        return self.hydrate([results], namespace)[0] if hydrate else results
+
+    def query(self, text: str, top_k: int = None, filter: dict = None, namespace: str = None) -> List[QueryResult]:
+        """
+        Embeds a query text and runs a top-k search.
+
+        Args:
+            text (str): Query text.
+            top_k (int, optional): Number of results. Defaults to RETRIEVAL.TOP_K.
+            filter (dict, optional): Pinecone metadata filter.
+            namespace (str, optional): Namespace to search. Defaults to the active namespace.
+
+        Returns:
+            List[QueryResult]: Results ordered by decreasing score.
+        """
+        vector = self.embed_queries([text])[0]
+        sparse_vector = self.encode_sparse_queries([text])[0]
+        return self.query_vector(vector, top_k=top_k, filter=filter, namespace=namespace, sparse_vector=sparse_vector)
+
+    def batch_query(self, texts: List[str], top_k: int = None, filter: dict = None,
+                    namespace: str = None) -> List[List[QueryResult]]:
+        """
+        Embeds many queries in one request, runs their searches concurrently and hydrates every result in one store lookup.
+
+        Args:
+            texts (List[str]): Query texts.
+            top_k (int, optional): Number of results per query. Defaults to RETRIEVAL.TOP_K.
+            filter (dict, optional): Pinecone metadata filter applied to every query.
+            namespace (str, optional): Namespace to search. Defaults to the active namespace.
+
+        Returns:
+            List[List[QueryResult]]: Results per query, in input order.
+        """
+        vectors = self.embed_queries(texts)
+        sparse_vectors = self.encode_sparse_queries(texts)
+        with ThreadPoolExecutor(max_workers=self.config.query_workers) as executor:
+            results_per_query = list(executor.map(
+                lambda vector, sparse_vector: self.query_vector(vector, top_k=top_k, filter=filter, namespace=namespace,
+                                                                sparse_vector=sparse_vector, hydrate=False),
+                vectors, sparse_vectors
+            ))
+        return self.hydrate(results_per_query, namespace)
+
+    def write_cache_metrics(self):
+        """
+        Logs the result cache counters and writes them to the Prometheus textfile.
+        """
+        if self.result_cache is None:
+            return
+        logger.info(f"Result cache: {self.result_cache.stats()}")
+        self.result_cache.write_prometheus(self.config.result_cache_textfile)
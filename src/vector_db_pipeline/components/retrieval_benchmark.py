@@ -0,0 +1,187 @@
+from vector_db_pipeline.entity.config_entity import BenchmarkConfig, LocalSearchConfig
+from vector_db_pipeline.components.local_search import ExactSearchIndex, IVFIndex
+from vector_db_pipeline.components.retrieval import Retriever
+from vector_db_pipeline.utils.common import list_files_in_directory, iter_json_records
+from vector_db_pipeline import logger
+from pathlib import Path
+from typing import Callable, Dict, List
+import numpy as np
+import subprocess
+import random
+import time
+import json
+import os
+
+
+"""
+Measures retrieval quality and latency of the local and configured search backends.
+
+The query set is built from the scraped corpus: every page title is a query whose only relevant
+item is the url of its page. A query counts as a hit at k when one of its first k matched chunks
+comes from that url, so recall@k is the share of queries with a hit at k and MRR averages the
+reciprocal rank of the first chunk from that url.
+
+Attributes:
+    config (BenchmarkConfig): Benchmark settings.
+    local_search_config (LocalSearchConfig): Settings of the local exact and IVF engines.
+    retriever (Retriever): Embeds the queries and queries the configured backend.
+
+Methods:
+    build_query_set(): Builds the page title queries and their relevant urls.
+    engines(): Returns the search functions to benchmark, by configuration name.
+    evaluate(search, vectors, sparse_vectors, relevant_urls): Measures one configuration.
+    run(): Benchmarks every configuration and writes the results JSON.
+"""
+
+
+def current_commit() -> str:
+    """
+    Returns the git commit of the working tree, or 'unknown' outside a repository.
+    """
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+class RetrievalBenchmark:
+    def __init__(self, config: BenchmarkConfig, local_search_config: LocalSearchConfig, retriever: Retriever):
+        """
+        Initializes the benchmark.
+
+        Args:
+            config (BenchmarkConfig): Benchmark settings.
+            local_search_config (LocalSearchConfig): Settings of the local exact and IVF engines.
+            retriever (Retriever): Embeds the queries and queries the configured backend.
+        """
+        self.config = config
+        self.local_search_config = local_search_config
+        self.retriever = retriever
+
+    def build_query_set(self) -> List[dict]:
+        """
+        Builds one query per distinct page title, sampled down to BENCHMARK.MAX_QUERIES.
+
+        Returns:
+            List[dict]: Queries {'query': page title, 'relevant_urls': [url, ...]}.
+        """
+        relevant_urls: Dict[str, set] = {}
+        json_files = list_files_in_directory(Path(self.config.local_data_file))
+        for record in iter_json_records(sorted(json_files)):
+            title, url = record.get('page_title'), record.get('url')
+            if title and url and record.get('text'):
+                relevant_urls.setdefault(title.strip(), set()).add(url)
+        queries = [{'query': title, 'relevant_urls': sorted(urls)} for title, urls in sorted(relevant_urls.items())]
+        if len(queries) > self.config.max_queries:
+            queries = random.Random(self.config.seed).sample(queries, self.config.max_queries)
+        logger.info(f"Benchmark query set: {len(queries)} queries")
+        return queries
+
+    def engines(self) -> Dict[str, Callable]:
+        """
+        Returns the search functions to benchmark, by configuration name.
+
+        Every function takes (vector, sparse_vector, top_k) and returns the urls of the matched chunks in rank order.
+
+        Returns:
+            dict: Search function per configuration name.
+        """
+        def urls(response):
+            return [(match.get('metadata') or {}).get('url') for match in response['matches']]
+
+        exact = ExactSearchIndex.from_artifact(self.local_search_config.read_data_dir)
+        engines = {'exact': lambda vector, sparse_vector, top_k: urls(exact.query(vector, top_k=top_k,
+                                                                                  include_metadata=True))}
+
+        ivf_index_file = Path(self.local_search_config.ivf_index_file)
+        if ivf_index_file.exists():
+            ivf = IVFIndex.load(ivf_index_file)
+        else:
+            config = self.local_search_config
+            ivf = IVFIndex(exact.ids, exact.matrix, exact.metadata, n_lists=config.n_lists, n_probe=config.n_probe,
+                           iterations=config.kmeans_iterations, seed=config.seed)
+        for n_probe in self.config.n_probes:
+            engines[f"ivf_nprobe_{n_probe}"] = (
+                lambda vector, sparse_vector, top_k, n_probe=n_probe:
+                urls(ivf.query(vector, top_k=top_k, include_metadata=True, n_probe=n_probe))
+            )
+
+        if self.config.include_backend:
+            backend = self.config.run_parameters['INDEX_INFO']['BACKEND']
+            engines[f"backend_{backend}"] = (
+                lambda vector, sparse_vector, top_k:
+                [result.url for result in self.retriever.query_vector(vector, top_k=top_k, sparse_vector=sparse_vector)]
+            )
+        return engines
+
+    def evaluate(self, search: Callable, vectors: List[List[float]], sparse_vectors: List[dict],
+                 relevant_urls: List[List[str]]) -> dict:
+        """
+        Runs every query against one configuration and computes its metrics.
+
+        Args:
+            search (Callable): Search function returned by engines().
+            vectors (List[List[float]]): Query embeddings.
+            sparse_vectors (List[dict]): BM25 query vectors, None when hybrid search is off.
+            relevant_urls (List[List[str]]): Relevant urls per query.
+
+        Returns:
+            dict: recall@k per k, MRR and latency percentiles in milliseconds.
+        """
+        k_values = list(self.config.k_values)
+        top_k = max(k_values)
+        hits = {k: 0 for k in k_values}
+        reciprocal_ranks = []
+        latencies = []
+        for vector, sparse_vector, relevant in zip(vectors, sparse_vectors, relevant_urls):
+            start = time.perf_counter()
+            ranked_urls = search(vector, sparse_vector, top_k)
+            latencies.append(time.perf_counter() - start)
+            rank = next((position + 1 for position, url in enumerate(ranked_urls) if url in relevant), None)
+            reciprocal_ranks.append(1.0 / rank if rank else 0.0)
+            for k in k_values:
+                hits[k] += int(rank is not None and rank <= k)
+
+        latencies_ms = np.array(latencies) * 1000
+        metrics = {f"recall@{k}": hits[k] / len(vectors) for k in k_values}
+        metrics['mrr'] = float(np.mean(reciprocal_ranks))
+        metrics['latency_ms'] = {'p50': float(np.percentile(latencies_ms, 50)),
+                                 'p99': float(np.percentile(latencies_ms, 99))}
+        return metrics
+
+    def run(self) -> dict:
+        """
+        Benchmarks every configuration and writes the results to BENCHMARK root_dir as retrieval_<commit>.json.
+
+        Returns:
+            dict: Benchmark report.
+        """
+        queries = self.build_query_set()
+        texts = [query['query'] for query in queries]
+        relevant_urls = [set(query['relevant_urls']) for query in queries]
+        vectors = self.retriever.embed_queries(texts)
+        sparse_vectors = self.retriever.encode_sparse_queries(texts)
+        # Benchmarks measure the index, not the cache
+        self.retriever.result_cache = None
+
+        results = {}
+        for name, search in self.engines().items():
+            results[name] = self.evaluate(search, vectors, sparse_vectors, relevant_urls)
+            logger.info(f"Benchmark '{name}': {results[name]}")
+
+        commit = current_commit()
+        report = {
+            'commit': commit,
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'queries': len(queries),
+            'k_values': list(self.config.k_values),
+            'parameters': self.config.run_parameters,
+            'results': results
+        }
+        os.makedirs(self.config.root_dir, exist_ok=True)
+        report_file = Path(self.config.root_dir) / f"retrieval_{commit[:12]}.json"
+        with open(report_file, 'w') as f:
+            json.dump(report, f, indent=4, default=str)
+        logger.info(f"Benchmark report written to: {report_file}")
+        return report
@@ -0,0 +1,206 @@
+from vector_db_pipeline.components.data_load import load_generation
+from vector_db_pipeline import logger
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional
+import numpy as np
+import threading
+import json
+import time
+import os
+
+
+"""
+Caches query results by query embedding, so paraphrased queries reuse earlier results.
+
+A lookup is a hit when a cached query of the same index, namespace, top_k and filter has an
+embedding within max_distance (cosine distance) of the new one, its entry is younger than the
+TTL and the namespace generation written by the upload stage did not change since.
+
+Attributes:
+    generation_file (Path): Generation file written by DataUpload.bump_generation.
+    max_distance (float): Largest cosine distance served from the cache.
+    ttl (float): Entry lifetime in seconds.
+    max_entries (int): Number of entries kept per scope before the oldest are evicted.
+
+Methods:
+    get(index_name, namespace, vector, top_k, filter): Returns cached results of a similar query, or None.
+    put(index_name, namespace, vector, top_k, filter, results): Caches the results of a query.
+    stats(): Returns hit, miss, expiry and invalidation counters and the hit rate.
+    write_prometheus(textfile): Writes the counters as Prometheus gauges to a textfile.
+"""
+
+
+class _Scope:
+    def __init__(self, generation: str):
+        """
+        Initializes the entries of one index, namespace, top_k and filter combination.
+
+        Args:
+            generation (str): Namespace generation the entries are valid for.
+        """
+        self.generation = generation
+        self.entries = OrderedDict()
+        self.next_key = 0
+        self._matrix = None
+        self._keys = None
+
+    def matrix(self):
+        # Rebuilt lazily after writes, so consecutive lookups share one stacked matrix
+        if self._matrix is None:
+            self._keys = list(self.entries)
+            self._matrix = np.stack([self.entries[key][0] for key in self._keys]) if self._keys else None
+        return self._keys, self._matrix
+
+    def changed(self):
+        self._matrix = None
+        self._keys = None
+
+
+class SemanticResultCache:
+    def __init__(self, generation_file: Path, max_distance: float = 0.05, ttl: float = 3600,
+                 max_entries: int = 10000):
+        """
+        Initializes an empty cache.
+
+        Args:
+            generation_file (Path): Generation file written by DataUpload.bump_generation.
+            max_distance (float, optional): Largest cosine distance served from the cache. Defaults to 0.05.
+            ttl (float, optional): Entry lifetime in seconds. Defaults to 3600.
+            max_entries (int, optional): Number of entries kept per scope. Defaults to 10000.
+        """
+        self.generation_file = generation_file
+        self.max_distance = max_distance
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._scopes: Dict[str, _Scope] = {}
+        self._lock = threading.Lock()
+        self._generation_mtime = None
+        self._generations = {}
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.invalidated = 0
+
+    def _generation(self, index_name: str, namespace: str) -> str:
+        # The generation file is only re-read when it was rewritten by an upload
+        mtime = os.stat(self.generation_file).st_mtime_ns if Path(self.generation_file).exists() else None
+        if mtime != self._generation_mtime:
+            self._generation_mtime = mtime
+            self._generations = {}
+        key = f"{index_name}/{namespace}"
+        if key not in self._generations:
+            self._generations[key] = load_generation(self.generation_file, index_name, namespace)
+        return self._generations[key]
+
+    @staticmethod
+    def _scope_key(index_name: str, namespace: str, top_k: int, filter: Optional[dict]) -> str:
+        return json.dumps([index_name, namespace, top_k, filter], sort_keys=True, default=str)
+
+    def _scope(self, index_name: str, namespace: str, top_k: int, filter: Optional[dict]) -> _Scope:
+        key = self._scope_key(index_name, namespace, top_k, filter)
+        generation = self._generation(index_name, namespace)
+        scope = self._scopes.get(key)
+        if scope is None or scope.generation != generation:
+            if scope is not None and scope.entries:
+                self.invalidated += len(scope.entries)
+                logger.info(f"Result cache invalidated for '{index_name}'/'{namespace}': namespace changed")
+            scope = self._scopes[key] = _Scope(generation)
+        return scope
+
+    @staticmethod
+    def _normalize(vector) -> np.ndarray:
+        vector = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else vector
+
+    def get(self, index_name: str, namespace: str, vector: List[float], top_k: int,
+            filter: dict = None) -> Optional[list]:
+        """
+        Returns the cached results of the closest cached query if it is within max_distance.
+
+        Args:
+            index_name (str): Queried index.
+            namespace (str): Queried namespace.
+            vector (List[float]): Query embedding.
+            top_k (int): Number of requested results.
+            filter (dict, optional): Metadata filter of the query.
+
+        Returns:
+            list or None: Cached results, None on a miss.
+        """
+        query_vector = self._normalize(vector)
+        now = time.monotonic()
+        with self._lock:
+            scope = self._scope(index_name, namespace, top_k, filter)
+            expired = [key for key, (_, _, created) in scope.entries.items() if now - created > self.ttl]
+            for key in expired:
+                del scope.entries[key]
+            if expired:
+                self.expired += len(expired)
+                scope.changed()
+            keys, matrix = scope.matrix()
+            if matrix is not None:
+                similarities = matrix @ query_vector
+                best = int(np.argmax(similarities))
+                if 1.0 - float(similarities[best]) <= self.max_distance:
+                    self.hits += 1
+                    return scope.entries[keys[best]][1]
+            self.misses += 1
+        return None
+
+    def put(self, index_name: str, namespace: str, vector: List[float], top_k: int, filter: dict,
+            results: list):
+        """
+        Caches the results of a query, evicting the oldest entries beyond max_entries.
+
+        Args:
+            index_name (str): Queried index.
+            namespace (str): Queried namespace.
+            vector (List[float]): Query embedding.
+            top_k (int): Number of requested results.
+            filter (dict): Metadata filter of the query.
+            results (list): Results to serve for similar queries.
+        """
+        with self._lock:
+            scope = self._scope(index_name, namespace, top_k, filter)
+            scope.entries[scope.next_key] = (self._normalize(vector), results, time.monotonic())
+            scope.next_key += 1
+            while len(scope.entries) > self.max_entries:
+                scope.entries.popitem(last=False)
+            scope.changed()
+
+    def stats(self) -> dict:
+        """
+        Returns hit, miss, expiry and invalidation counters and the hit rate.
+        """
+        lookups = self.hits + self.misses
+        return {'hits': self.hits, 'misses': self.misses, 'expired': self.expired, 'invalidated': self.invalidated,
+                'entries': sum(len(scope.entries) for scope in self._scopes.values()),
+                'hit_rate': self.hits / lookups if lookups else 0.0}
+
+    def write_prometheus(self, textfile: Path):
+        """
+        Writes the cache counters as Prometheus gauges to a textfile for the node exporter textfile collector.
+
+        Args:
+            textfile (Path): Destination .prom file.
+        """
+        from prometheus_client import CollectorRegistry, Gauge, write_to_textfile
+
+        stats = self.stats()
+        registry = CollectorRegistry()
+        gauges = {
+            'hits': ('query_result_cache_hits', 'Queries served from the semantic result cache'),
+            'misses': ('query_result_cache_misses', 'Queries sent to the index'),
+            'expired': ('query_result_cache_expired', 'Entries dropped after their TTL'),
+            'invalidated': ('query_result_cache_invalidated', 'Entries dropped after an upload changed their namespace'),
+            'entries': ('query_result_cache_entries', 'Entries currently cached'),
+            'hit_rate': ('query_result_cache_hit_rate', 'Share of queries served from the cache'),
+        }
+        for key, (name, description) in gauges.items():
+            Gauge(name, description, registry=registry).set(stats[key])
+
+        os.makedirs(Path(textfile).parent, exist_ok=True)
+        write_to_textfile(str(textfile), registry)
+        logger.info(f"Result cache metrics written to: {textfile}")
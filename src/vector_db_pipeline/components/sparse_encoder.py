@@ -0,0 +1,196 @@
+from vector_db_pipeline import logger
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional
+import math
+import json
+import os
+import re
+
+
+"""
+BM25 sparse vectors for hybrid (sparse + dense) search.
+
+Documents are encoded with the BM25 term-frequency part and queries with the IDF part, so
+the dot product of a query and a document vector is their BM25 score. Term indices come from
+an append-only vocabulary persisted with the IDF statistics, so indices stay stable across runs
+and the retriever encodes queries with the statistics of the uploaded corpus.
+
+Document vectors only depend on the vocabulary and the average document length. The average length
+of the first fit is frozen and persisted, so unchanged chunks keep identical sparse values (and
+upload ledger hashes) when the corpus grows; refit() recomputes it on request.
+
+Attributes:
+    k1 (float): Term frequency saturation.
+    b (float): Document length normalization.
+    document_avg_length (float): Frozen average length used to encode documents, None until fitted.
+
+Methods:
+    tokenize(text): Lowercases text and splits it into word tokens.
+    reset_statistics(): Clears document statistics, keeping term indices.
+    partial_fit(texts): Adds documents to the statistics.
+    fit(texts): Recomputes the statistics from a whole corpus.
+    refit(): Unfreezes the document average length so the next fit recomputes it.
+    encode_documents(texts): Returns BM25 document sparse vectors.
+    encode_queries(texts): Returns IDF weighted query sparse vectors.
+    save(vocab_file): Persists vocabulary and statistics.
+    load(vocab_file): Restores an encoder written by save().
+"""
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9'\-]*")
+
+
+class BM25Encoder:
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        """
+        Initializes an encoder with an empty vocabulary.
+
+        Args:
+            k1 (float, optional): Term frequency saturation. Defaults to 1.2.
+            b (float, optional): Document length normalization. Defaults to 0.75.
+        """
+        self.k1 = k1
+        self.b = b
+        self.vocabulary: Dict[str, int] = {}
+        self.doc_freq: Dict[str, int] = {}
+        self.n_docs = 0
+        self.total_length = 0
+        self.document_avg_length: Optional[float] = None
+
+    @staticmethod
+    def tokenize(text: str) -> List[str]:
+        return _TOKEN_PATTERN.findall(text.lower())
+
+    @property
+    def avg_length(self) -> float:
+        return self.total_length / self.n_docs if self.n_docs else 1.0
+
+    def reset_statistics(self):
+        """
+        Clears document statistics. Term indices and the frozen document average length are kept so
+        vectors stay comparable with earlier uploads.
+        """
+        self.doc_freq = {}
+        self.n_docs = 0
+        self.total_length = 0
+
+    def partial_fit(self, texts: List[str]):
+        """
+        Adds documents to the vocabulary and statistics.
+
+        Args:
+            texts (List[str]): Document texts.
+        """
+        for text in texts:
+            tokens = self.tokenize(text)
+            self.n_docs += 1
+            self.total_length += len(tokens)
+            for term in set(tokens):
+                if term not in self.vocabulary:
+                    self.vocabulary[term] = len(self.vocabulary)
+                self.doc_freq[term] = self.doc_freq.get(term, 0) + 1
+
+    def fit(self, texts: List[str]):
+        """
+        Recomputes the statistics from a whole corpus. The document average length is only set when it
+        is not frozen yet.
+
+        Args:
+            texts (List[str]): Document texts.
+        """
+        self.reset_statistics()
+        self.partial_fit(texts)
+        if self.document_avg_length is None and self.n_docs:
+            self.document_avg_length = self.avg_length
+        logger.info(f"BM25 statistics fitted: {self.n_docs} documents, {len(self.doc_freq)} terms")
+
+    def refit(self):
+        """
+        Unfreezes the document average length. Every document vector changes after the next fit.
+        """
+        self.document_avg_length = None
+
+    def idf(self, term: str) -> float:
+        doc_freq = self.doc_freq.get(term, 0)
+        return math.log((self.n_docs - doc_freq + 0.5) / (doc_freq + 0.5) + 1.0)
+
+    def encode_documents(self, texts: List[str]) -> List[dict]:
+        """
+        Encodes documents with the BM25 term-frequency weight of each term.
+
+        Args:
+            texts (List[str]): Document texts.
+
+        Returns:
+            List[dict]: Sparse vectors {'indices': [...], 'values': [...]}. Terms outside the vocabulary are skipped.
+        """
+        avg_length = self.document_avg_length or self.avg_length
+        vectors = []
+        for text in texts:
+            tokens = self.tokenize(text)
+            norm = self.k1 * (1.0 - self.b + self.b * len(tokens) / avg_length)
+            indices, values = [], []
+            for term, tf in sorted(Counter(tokens).items()):
+                if term in self.vocabulary:
+                    indices.append(self.vocabulary[term])
+                    values.append(tf * (self.k1 + 1.0) / (tf + norm))
+            vectors.append({'indices': indices, 'values': values})
+        return vectors
+
+    def encode_queries(self, texts: List[str]) -> List[dict]:
+        """
+        Encodes queries with the normalized IDF of each known term.
+
+        Args:
+            texts (List[str]): Query texts.
+
+        Returns:
+            List[dict]: Sparse vectors {'indices': [...], 'values': [...]}.
+        """
+        vectors = []
+        for text in texts:
+            terms = sorted(term for term in set(self.tokenize(text)) if term in self.doc_freq)
+            weights = [self.idf(term) for term in terms]
+            total = sum(weights) or 1.0
+            vectors.append({'indices': [self.vocabulary[term] for term in terms],
+                            'values': [weight / total for weight in weights]})
+        return vectors
+
+    def save(self, vocab_file: Path):
+        """
+        Persists vocabulary and statistics as JSON.
+
+        Args:
+            vocab_file (Path): Destination file.
+        """
+        os.makedirs(Path(vocab_file).parent, exist_ok=True)
+        payload = {'k1': self.k1, 'b': self.b, 'n_docs': self.n_docs, 'total_length': self.total_length,
+                   'document_avg_length': self.document_avg_length or self.avg_length,
+                   'vocabulary': self.vocabulary, 'doc_freq': self.doc_freq}
+        tmp_file = f"{vocab_file}.tmp"
+        with open(tmp_file, 'w') as f:
+            json.dump(payload, f)
+        os.replace(tmp_file, vocab_file)
+        logger.info(f"BM25 vocabulary saved at: {vocab_file}")
+
+    @classmethod
+    def load(cls, vocab_file: Path):
+        """
+        Restores an encoder written by save().
+
+        Args:
+            vocab_file (Path): File written by save().
+
+        Returns:
+            BM25Encoder: The restored encoder.
+        """
+        with open(vocab_file, 'r') as f:
+            payload = json.load(f)
+        encoder = cls(k1=payload['k1'], b=payload['b'])
+        encoder.n_docs = payload['n_docs']
+        encoder.total_length = payload['total_length']
+        encoder.vocabulary = payload['vocabulary']
+        encoder.doc_freq = payload['doc_freq']
+        # Files written before the average length was frozen encoded documents with the fitted one
+        encoder.document_avg_length = payload.get('document_avg_length', encoder.avg_length)
+        return encoder
@@ -0,0 +1,236 @@
+from vector_db_pipeline.entity.config_entity import StreamingConfig
+from vector_db_pipeline.components.data_ingestion import TextProcessor
+from vector_db_pipeline.components.data_validation import BatchValidator
+from vector_db_pipeline.components.data_load import DataUpload
+from vector_db_pipeline.utils.common import list_files_in_directory, iter_sourced_records
+from vector_db_pipeline import logger
+from pathlib import Path
+import threading
+import queue
+import time
+
+
+"""
+Runs ingestion, validation and upload as concurrent stages connected by bounded queues.
+
+Records flow reader -> chunker -> embedder -> validator -> uploader. Every queue holds at most
+queue_size items, so a slow stage blocks the ones before it (backpressure) and memory stays
+bounded instead of holding the full corpus between stages.
+
+Attributes:
+    config (StreamingConfig): Streaming settings.
+    text_processor (TextProcessor): Chunks and embeds records.
+    validator (BatchValidator): Validates embedded batches.
+    data_upload (DataUpload): Uploads vector batches.
+
+Methods:
+    run(sync): Runs every stage until the input is exhausted or a stage fails.
+"""
+
+_SENTINEL = object()
+
+
+class StreamingPipeline:
+    def __init__(self, config: StreamingConfig, text_processor: TextProcessor, validator: BatchValidator,
+                 data_upload: DataUpload):
+        """
+        Initializes the streaming pipeline with the components of each stage.
+
+        Args:
+            config (StreamingConfig): Streaming settings.
+            text_processor (TextProcessor): Chunks and embeds records.
+            validator (BatchValidator): Validates embedded batches.
+            data_upload (DataUpload): Uploads vector batches.
+        """
+        self.config = config
+        self.text_processor = text_processor
+        self.validator = validator
+        self.data_upload = data_upload
+        self._stop = threading.Event()
+        self._errors = []
+        self._stage_seconds = {}
+        self._stage_items = {}
+        self._stats_lock = threading.Lock()
+
+    def _put(self, out_queue: queue.Queue, item) -> bool:
+        # Blocks while the queue is full, but gives up as soon as another stage failed
+        while not self._stop.is_set():
+            try:
+                out_queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _get(self, in_queue: queue.Queue):
+        while not self._stop.is_set():
+            try:
+                return in_queue.get(timeout=0.1)
+            except queue.Empty:
+                continue
+        return _SENTINEL
+
+    def _fail(self, stage: str, error: Exception):
+        logger.error(f"Streaming stage '{stage}' failed: {error}")
+        self._errors.append(error)
+        self._stop.set()
+
+    def _account(self, stage: str, seconds: float):
+        with self._stats_lock:
+            self._stage_seconds[stage] = self._stage_seconds.get(stage, 0.0) + seconds
+            self._stage_items[stage] = self._stage_items.get(stage, 0) + 1
+
+    def _start_stage(self, name, process, in_queue, out_queue, workers, downstream_workers, flush=None):
+        """
+        Starts worker threads that apply process() to every input item and forward its outputs.
+
+        Args:
+            name (str): Stage name used in logs and statistics.
+            process (Callable): Function mapping one input item to a list of output items.
+            in_queue (queue.Queue): Input queue.
+            out_queue (queue.Queue): Output queue.
+            workers (int): Number of worker threads.
+            downstream_workers (int): Number of end-of-stream markers to send once every worker is done.
+            flush (Callable, optional): Function returning the outputs still buffered at end of stream.
+
+        Returns:
+            list: Started threads.
+        """
+        remaining = [workers]
+        lock = threading.Lock()
+
+        def worker():
+            try:
+                while True:
+                    item = self._get(in_queue)
+                    if item is _SENTINEL:
+                        break
+                    start = time.perf_counter()
+                    outputs = process(item)
+                    self._account(name, time.perf_counter() - start)
+                    for output in outputs:
+                        if not self._put(out_queue, output):
+                            return
+                if flush is not None and not self._stop.is_set():
+                    for output in flush():
+                        self._put(out_queue, output)
+            except Exception as e:
+                self._fail(name, e)
+            finally:
+                with lock:
+                    remaining[0] -= 1
+                    last = remaining[0] == 0
+                if last:
+                    for _ in range(downstream_workers):
+                        self._put(out_queue, _SENTINEL)
+
+        threads = [threading.Thread(target=worker, name=f"{name}-{i}", daemon=True) for i in range(workers)]
+        for thread in threads:
+            thread.start()
+        return threads
+
+    def _reader(self, out_queue: queue.Queue, downstream_workers: int):
+        try:
+            json_files = list_files_in_directory(Path(self.text_processor.config.local_data_file))
+            for source_file, record_index, record in iter_sourced_records(json_files):
+                if not self._put(out_queue, (record, (source_file, record_index))):
+                    return
+        except Exception as e:
+            self._fail('reader', e)
+        finally:
+            for _ in range(downstream_workers):
+                self._put(out_queue, _SENTINEL)
+
+    def _uploader_input(self, in_queue: queue.Queue, upstream_workers: int):
+        finished = 0
+        while finished < upstream_workers:
+            item = self._get(in_queue)
+            if item is _SENTINEL:
+                if self._stop.is_set():
+                    # Abort instead of ending the stream, so a partial stream never triggers stale deletions
+                    raise RuntimeError("Streaming pipeline aborted by a failed stage")
+                finished += 1
+                continue
+            yield item
+
+    def run(self, sync: bool = False) -> int:
+        """
+        Runs every stage until the input is exhausted or a stage fails.
+
+        Args:
+            sync (bool, optional): Whether the uploader skips unchanged vectors and deletes stale ids. Defaults to False.
+
+        Raises:
+            Exception: The first error raised by any stage.
+
+        Returns:
+            int: Number of vectors streamed to the uploader.
+        """
+        queue_size = self.config.queue_size
+        embed_batch_size = self.config.embed_batch_size
+        embed_workers = self.config.embed_workers
+        records, chunks, embedded, vectors = (queue.Queue(maxsize=queue_size) for _ in range(4))
+        embed_model = self.text_processor.get_embed_model()
+        sparse_encoder = self.text_processor.get_sparse_encoder()
+        # Streams cannot fit a projection on the whole corpus first, so they reuse the one of the batch ingestion
+        projector = self.text_processor.get_projector()
+
+        # The chunker runs in a single thread so repeated sources are numbered in reading order, as in batch mode
+        self.text_processor.reset_source_keys()
+        state = {'buffer': []}
+
+        def chunk(item):
+            record, source = item
+            record_chunks = self.text_processor.record_chunks(record)
+            if self.text_processor.lineage is not None and record_chunks:
+                self.text_processor.lineage.put_many(self.text_processor.lineage_rows(record_chunks, source))
+            if sparse_encoder is not None and record_chunks:
+                # BM25 statistics grow with the stream, so early chunks use the statistics seen so far
+                sparse_encoder.partial_fit([chunk['text'] for chunk in record_chunks])
+                self.text_processor.add_sparse_values(record_chunks, sparse_encoder)
+            state['buffer'].extend(record_chunks)
+            batches = []
+            while len(state['buffer']) >= embed_batch_size:
+                batches.append(state['buffer'][:embed_batch_size])
+                state['buffer'] = state['buffer'][embed_batch_size:]
+            return batches
+
+        def flush_chunks():
+            return [state['buffer']] if state['buffer'] else []
+
+        def embed(batch):
+            embedded = self.text_processor.embed_chunks(batch, embed_model)
+            if projector is not None:
+                self.text_processor.project_chunks(embedded, projector)
+            return [self.text_processor.normalize_vectors(embedded)]
+
+        def validate(batch):
+            self.validator.validate_batch(batch)
+            return [[DataUpload.to_pinecone_vector(record) for record in batch]]
+
+        start = time.perf_counter()
+        threads = [threading.Thread(target=self._reader, args=(records, 1), name='reader', daemon=True)]
+        threads[0].start()
+        threads += self._start_stage('chunker', chunk, records, chunks, 1, embed_workers, flush=flush_chunks)
+        threads += self._start_stage('embedder', embed, chunks, embedded, embed_workers, 1)
+        threads += self._start_stage('validator', validate, embedded, vectors, 1, 1)
+
+        try:
+            streamed = self.data_upload.stream_upload(self._uploader_input(vectors, 1), sync=sync)
+        except Exception as e:
+            if not self._errors:
+                self._fail('uploader', e)
+            streamed = 0
+        for thread in threads:
+            thread.join()
+        if self._errors:
+            raise self._errors[0]
+
+        self.validator.write_status()
+        self.text_processor.write_normalization_report()
+        if sparse_encoder is not None:
+            sparse_encoder.save(self.text_processor.config.sparse_vocab_file)
+        logger.info(f"Streaming pipeline completed in {time.perf_counter() - start:.2f} seconds, {streamed} vectors")
+        for stage, seconds in self._stage_seconds.items():
+            logger.info(f"Stage '{stage}': {self._stage_items.get(stage, 0)} items, {seconds:.2f} busy seconds")
+        return streamed
@@ -0,0 +1,265 @@
+from vector_db_pipeline.utils.common import count_tokens_batch, get_token_encoder
+from vector_db_pipeline import logger
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+import unicodedata
+import threading
+import json
+import os
+import re
+
+
+# The OpenAI embedding models share the cl100k_base encoding
+_TOKEN_MODEL = 'text-embedding-ada-002'
+
+
+def count_tokens(text: str) -> int:
+    """
+    Counts the embedding model tokens of a text.
+
+    Uses tiktoken when it is installed and otherwise approximates with word and punctuation counts.
+
+    Args:
+        text (str): Text to count.
+
+    Returns:
+        int: Number of tokens.
+    """
+    return count_tokens_batch([text], _TOKEN_MODEL)[0]
+
+
+"""
+Cleans scraped text before chunking, so whitespace and boilerplate do not count against CHUNK_SIZE
+and embedding tokens.
+
+Text is Unicode normalized (e.g. NFKC turns non-breaking spaces into spaces), zero-width and control
+characters are dropped, lines matching a BOILERPLATE pattern are removed, runs of spaces and tabs
+become one space and runs of blank lines one newline, so the chunk SEPARATOR still splits paragraphs.
+Every pattern is compiled once.
+
+Attributes:
+    unicode_form (str): unicodedata normalization form, '' to skip.
+    boilerplate (List[str]): Regular expressions matched against whole lines.
+
+Methods:
+    normalize(text): Returns the cleaned text.
+    normalize_with_stats(text): Returns the cleaned text and the bytes and tokens before and after.
+"""
+class TextNormalizer:
+    _INVISIBLE = re.compile(r'[\u200b-\u200d\u2060\ufeff\x00-\x08\x0b\x0c\x0e-\x1f\x7f]')
+    _HORIZONTAL_SPACE = re.compile(r'[^\S\n]+')
+    _LINE_BREAKS = re.compile(r' ?\n[\n ]*')
+
+    def __init__(self, unicode_form: str = 'NFKC', boilerplate: Optional[List[str]] = None):
+        """
+        Compiles the normalization patterns.
+
+        Args:
+            unicode_form (str, optional): unicodedata normalization form, '' to skip. Defaults to 'NFKC'.
+            boilerplate (List[str], optional): Regular expressions of whole lines to remove.
+        """
+        self.unicode_form = unicode_form
+        self.boilerplate = list(boilerplate or [])
+        self._boilerplate = (re.compile('|'.join(f'(?:{pattern})' for pattern in self.boilerplate), re.MULTILINE)
+                             if self.boilerplate else None)
+
+    @classmethod
+    def from_config(cls, normalization_config: dict):
+        """
+        Builds a normalizer from the NORMALIZATION parameters.
+        """
+        boilerplate = [rf'^[^\S\n]*{pattern}[^\S\n]*$' for pattern in normalization_config.BOILERPLATE or []]
+        return cls(unicode_form=normalization_config.UNICODE_FORM or '', boilerplate=boilerplate)
+
+    def normalize(self, text: str) -> str:
+        """
+        Returns the cleaned text.
+
+        Args:
+            text (str): Scraped text.
+
+        Returns:
+            str: Normalized text.
+        """
+        if self.unicode_form:
+            text = unicodedata.normalize(self.unicode_form, text)
+        text = self._INVISIBLE.sub('', text)
+        # Collapsing spaces first keeps the line break pattern linear on long whitespace runs
+        text = self._HORIZONTAL_SPACE.sub(' ', text)
+        if self._boilerplate is not None:
+            text = self._boilerplate.sub('', text)
+        text = self._LINE_BREAKS.sub('\n', text)
+        return text.strip()
+
+    def normalize_with_stats(self, text: str) -> Tuple[str, dict]:
+        """
+        Returns the cleaned text with its size before and after normalization.
+
+        Args:
+            text (str): Scraped text.
+
+        Returns:
+            tuple: (normalized text, {'bytes_before', 'bytes_after', 'tokens_before', 'tokens_after'}).
+        """
+        normalized = self.normalize(text)
+        stats = {'bytes_before': len(text.encode('utf-8')), 'bytes_after': len(normalized.encode('utf-8')),
+                 'tokens_before': count_tokens(text), 'tokens_after': count_tokens(normalized)}
+        return normalized, stats
+
+
+"""
+Aggregates the bytes and tokens removed by normalization per source host.
+
+Without tiktoken, tokens are approximated with word and punctuation counts; Unicode normalization can
+then add tokens (e.g. NFKC turns an ellipsis into three periods), so the summary flags such counts
+with 'tokens_approximate' and token savings can be negative.
+
+Methods:
+    add(source, stats): Adds the statistics of one record.
+    summary(): Returns the totals and savings per source.
+    write(report_file): Writes the summary as JSON.
+"""
+class NormalizationReport:
+    _FIELDS = ('bytes_before', 'bytes_after', 'tokens_before', 'tokens_after')
+
+    def __init__(self):
+        self.sources: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    def add(self, source: str, stats: dict):
+        with self._lock:
+            totals = self.sources.setdefault(source, dict.fromkeys(('records',) + self._FIELDS, 0))
+            totals['records'] += 1
+            for field in self._FIELDS:
+                totals[field] += stats[field]
+
+    def summary(self) -> Dict[str, dict]:
+        """
+        Returns the totals of every source with 'bytes_saved', 'tokens_saved' and 'tokens_approximate'.
+        """
+        approximate = get_token_encoder(_TOKEN_MODEL) is None
+        with self._lock:
+            return {source: dict(totals, bytes_saved=totals['bytes_before'] - totals['bytes_after'],
+                                 tokens_saved=totals['tokens_before'] - totals['tokens_after'],
+                                 tokens_approximate=approximate)
+                    for source, totals in sorted(self.sources.items())}
+
+    def write(self, report_file: Path):
+        """
+        Writes the summary as JSON and logs the savings of every source.
+
+        Args:
+            report_file (Path): Destination file.
+        """
+        summary = self.summary()
+        for source, totals in summary.items():
+            tokens = "approximate tokens" if totals['tokens_approximate'] else "tokens"
+            logger.info(f"Normalization of '{source}': {totals['bytes_saved']} bytes and "
+                        f"{totals['tokens_saved']} {tokens} saved over {totals['records']} records")
+        os.makedirs(Path(report_file).parent, exist_ok=True)
+        with open(report_file, 'w') as f:
+            json.dump(summary, f, indent=4)
+        logger.info(f"Normalization report written to: {report_file}")
+
+
+"""
+Splits text into chunks of whole sentences in linear time.
+
+Sentences end at '.', '!', '?' or '…' (optionally followed by closing quotes or brackets) followed by
+whitespace and an uppercase letter, digit or opening quote, and at every line break. They are packed
+greedily into chunks of at most chunk_size characters; consecutive chunks share up to overlap_sentences
+trailing sentences, as long as those fit in overlap_size characters. Sentences longer than chunk_size
+are cut at the last whitespace before the limit, so no chunk ever exceeds chunk_size.
+
+Attributes:
+    chunk_size (int): Maximum number of characters of a chunk.
+    overlap_size (int): Maximum number of characters repeated from the previous chunk.
+    overlap_sentences (int): Maximum number of sentences repeated from the previous chunk.
+
+Methods:
+    sentence_spans(text): Returns the (start, end) offsets of the sentences of a text.
+    split_text(text): Returns the chunks of a text.
+"""
+class SentenceSplitter:
+    # Every alternative consumes at most one run per match attempt, so scanning a document is linear
+    _BOUNDARY = re.compile(r'([.!?\u2026]["\'\u201d\u2019)\]]*)[ \t]+(?=["\'\u201c\u2018(\[]?[A-Z0-9])|\n\s*')
+
+    def __init__(self, chunk_size: int, overlap_size: int = 0, overlap_sentences: int = 1):
+        """
+        Initializes the splitter.
+
+        Args:
+            chunk_size (int): Maximum number of characters of a chunk.
+            overlap_size (int, optional): Maximum number of characters repeated from the previous chunk. Defaults to 0.
+            overlap_sentences (int, optional): Maximum number of sentences repeated from the previous chunk. Defaults to 1.
+        """
+        if chunk_size <= 0:
+            raise ValueError(f"Chunk size must be positive, got {chunk_size}")
+        self.chunk_size = chunk_size
+        self.overlap_size = overlap_size
+        self.overlap_sentences = overlap_sentences
+
+    def _pieces(self, text: str, start: int, end: int):
+        # Cuts an oversized sentence at the last whitespace before the limit, or at the limit without any
+        while end - start > self.chunk_size:
+            limit = start + self.chunk_size
+            cut = max(text.rfind(' ', start + 1, limit + 1), text.rfind('\t', start + 1, limit + 1))
+            cut = cut if cut > start else limit
+            yield start, cut
+            start = cut
+            while start < end and text[start].isspace():
+                start += 1
+        if start < end:
+            yield start, end
+
+    def sentence_spans(self, text: str) -> List[Tuple[int, int]]:
+        """
+        Returns the offsets of the sentences of a text, without surrounding whitespace, none longer than chunk_size.
+
+        Args:
+            text (str): Text to segment.
+
+        Returns:
+            List[Tuple[int, int]]: (start, end) offsets in reading order.
+        """
+        spans = []
+        start = 0
+        boundaries = [(match.end(1) if match.group(1) else match.start(), match.end())
+                      for match in self._BOUNDARY.finditer(text)]
+        for sentence_end, next_start in boundaries + [(len(text), len(text))]:
+            end = sentence_end
+            while start < end and text[start].isspace():
+                start += 1
+            while end > start and text[end - 1].isspace():
+                end -= 1
+            if start < end:
+                spans.extend(self._pieces(text, start, end))
+            start = next_start
+        return spans
+
+    def split_text(self, text: str) -> List[str]:
+        """
+        Packs the sentences of a text greedily into chunks of at most chunk_size characters.
+
+        Args:
+            text (str): Text to split.
+
+        Returns:
+            List[str]: Chunks, substrings of the text in reading order.
+        """
+        chunks = []
+        current = []
+        for span in self.sentence_spans(text):
+            if current and span[1] - current[0][0] > self.chunk_size:
+                chunks.append(text[current[0][0]:current[-1][1]])
+                # Overlap with whole trailing sentences that fit both the overlap budget and the new chunk
+                overlap = []
+                for previous in reversed(current[max(0, len(current) - self.overlap_sentences):]):
+                    if current[-1][1] - previous[0] > self.overlap_size or span[1] - previous[0] > self.chunk_size:
+                        break
+                    overlap.insert(0, previous)
+                current = overlap
+            current.append(span)
+        if current:
+            chunks.append(text[current[0][0]:current[-1][1]])
+        return chunks
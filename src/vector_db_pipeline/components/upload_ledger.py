@@ -0,0 +1,216 @@
+from vector_db_pipeline import logger
+from pathlib import Path
+from hashlib import blake2b
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+import numpy as np
+import json
+import os
+
+
+"""
+Keeps a local record of what was last uploaded to each namespace of the vector index.
+
+The ledger maps every uploaded vector id to a hash of its values and metadata and to
+the url, host and scrape time of its source, so later runs can upload only new or changed
+vectors and delete the ids that are no longer produced by ingestion, whose source
+disappeared or that outlived the retention policy.
+
+Attributes:
+    ledger_file (Path): JSON file holding the ledger.
+    namespaces (dict): Mapping namespace -> {vector id -> entry}.
+
+Methods:
+    content_hash(vector): Hashes the values and metadata of a vector.
+    entries(namespace): Returns the ledger entries of a namespace.
+    diff(vectors, namespace): Splits local vectors into changed vectors and stale ids.
+    record(vectors, namespace): Records uploaded vectors.
+    forget(ids, namespace): Removes ids from the ledger.
+    ids_of_removed_sources(current_ids, current_urls, namespace): Returns ids whose source url is gone.
+    expired_ids(cutoff, namespace): Returns ids scraped before the retention cutoff of their host.
+    reset(namespace): Drops every entry of a namespace.
+    reconcile(index, namespace, batch_size): Aligns the ledger with the ids actually stored in the index.
+    save(): Writes the ledger to disk.
+"""
+
+
+class UploadLedger:
+    def __init__(self, ledger_file: Path):
+        """
+        Loads the ledger from disk, or starts an empty one.
+
+        Args:
+            ledger_file (Path): JSON file holding the ledger.
+        """
+        self.ledger_file = Path(ledger_file)
+        self.namespaces: Dict[str, Dict[str, dict]] = {}
+        if self.ledger_file.exists():
+            with open(self.ledger_file, 'r') as f:
+                self.namespaces = json.load(f).get('namespaces', {})
+            logger.info(f"Upload ledger loaded from: {self.ledger_file}")
+
+    @staticmethod
+    def content_hash(vector: dict) -> str:
+        """
+        Hashes the values, sparse values and metadata of a vector.
+
+        Values are hashed at float32 precision, so embeddings read back from the JSON artifact and the
+        full precision embeddings of the streaming pipeline hash the same.
+
+        Args:
+            vector (dict): Vector with 'values', 'metadata' and optionally 'sparse_values'.
+
+        Returns:
+            str: Hex digest identifying the vector content.
+        """
+        payload = {'values': np.asarray(vector['values'], dtype=np.float32).tolist(),
+                   'metadata': vector.get('metadata', {})}
+        sparse_values = vector.get('sparse_values')
+        if sparse_values:
+            # Only hashed when present, so dense-only uploads hash the same with hybrid search off
+            payload['sparse_values'] = {'indices': [int(index) for index in sparse_values['indices']],
+                                        'values': np.asarray(sparse_values['values'], dtype=np.float32).tolist()}
+        encoded = json.dumps(payload, sort_keys=True, default=str).encode('utf-8')
+        return blake2b(encoded, digest_size=16).hexdigest()
+
+    def entries(self, namespace: str) -> Dict[str, dict]:
+        """
+        Returns the ledger entries of a namespace, creating it if needed.
+        """
+        return self.namespaces.setdefault(namespace, {})
+
+    def diff(self, vectors: List[dict], namespace: str) -> Tuple[List[dict], List[str]]:
+        """
+        Compares local vectors with the ledger of a namespace.
+
+        Args:
+            vectors (list): Vectors produced by the current run.
+            namespace (str): Namespace the vectors belong to.
+
+        Returns:
+            tuple: (vectors that are new or changed, ids in the ledger that are no longer produced).
+        """
+        entries = self.entries(namespace)
+        changed = []
+        local_ids = set()
+        for vector in vectors:
+            local_ids.add(vector['id'])
+            entry = entries.get(vector['id'])
+            if entry is None or entry.get('hash') != self.content_hash(vector):
+                changed.append(vector)
+        stale_ids = [vector_id for vector_id in entries if vector_id not in local_ids]
+        logger.info(f"Ledger diff for namespace '{namespace}': {len(changed)} new or changed, {len(stale_ids)} stale, "
+                    f"{len(local_ids) - len(changed)} unchanged")
+        return changed, stale_ids
+
+    def record(self, vectors: Iterable[dict], namespace: str):
+        """
+        Records uploaded vectors in the ledger, with the url, host and scrape time of their source.
+
+        Args:
+            vectors (Iterable[dict]): Vectors that were uploaded successfully.
+            namespace (str): Namespace they were uploaded to.
+        """
+        entries = self.entries(namespace)
+        for vector in vectors:
+            metadata = vector.get('metadata') or {}
+            entries[vector['id']] = {'hash': self.content_hash(vector), 'url': metadata.get('url'),
+                                     'host': metadata.get('host'), 'scraped_at': metadata.get('date_scraped_timestamp')}
+
+    def forget(self, ids: Iterable[str], namespace: str):
+        """
+        Removes ids from the ledger of a namespace.
+        """
+        entries = self.entries(namespace)
+        for vector_id in ids:
+            entries.pop(vector_id, None)
+
+    def ids_of_removed_sources(self, current_ids: set, current_urls: set, namespace: str) -> List[str]:
+        """
+        Returns the ids whose source url is no longer produced by ingestion.
+
+        Entries recorded before urls were tracked have no url and are never returned.
+
+        Args:
+            current_ids (set): Vector ids produced by the current run.
+            current_urls (set): Source urls of the current run.
+            namespace (str): Namespace to check.
+
+        Returns:
+            List[str]: Ids to purge from the index.
+        """
+        return [vector_id for vector_id, entry in self.entries(namespace).items()
+                if entry.get('url') and entry['url'] not in current_urls and vector_id not in current_ids]
+
+    def expired_ids(self, cutoff: Callable[[str], Optional[int]], namespace: str) -> List[str]:
+        """
+        Returns the ids scraped before the retention cutoff of their host.
+
+        Entries without a scrape time, e.g. recorded before scrape times were tracked, are never returned.
+
+        Args:
+            cutoff (Callable): Returns the oldest kept scrape time in milliseconds for a host, or None to keep every vector.
+            namespace (str): Namespace to check.
+
+        Returns:
+            List[str]: Ids to delete from the index.
+        """
+        expired = []
+        for vector_id, entry in self.entries(namespace).items():
+            scraped_at = entry.get('scraped_at')
+            if scraped_at is None:
+                continue
+            host_cutoff = cutoff(entry.get('host'))
+            if host_cutoff is not None and scraped_at < host_cutoff:
+                expired.append(vector_id)
+        return expired
+
+    def reset(self, namespace: str):
+        """
+        Drops every entry of a namespace, e.g. after the index was recreated.
+        """
+        self.namespaces[namespace] = {}
+
+    def reconcile(self, index, namespace: str, batch_size: int = 100):
+        """
+        Aligns the ledger with the index: ids missing from the index are forgotten so they are
+        uploaded again, and ids only present in the index are added without a hash so they are
+        deleted unless ingestion still produces them.
+
+        Listing ids is only supported by some index types; when it fails only the fetch check runs.
+
+        Args:
+            index: Index handle exposing fetch() and optionally list().
+            namespace (str): Namespace to reconcile.
+            batch_size (int, optional): Number of ids per fetch request. Defaults to 100.
+        """
+        entries = self.entries(namespace)
+        ledger_ids = list(entries)
+        missing = []
+        for start in range(0, len(ledger_ids), batch_size):
+            batch_ids = ledger_ids[start:start + batch_size]
+            fetched = index.fetch(ids=batch_ids, namespace=namespace)['vectors']
+            missing.extend(vector_id for vector_id in batch_ids if vector_id not in fetched)
+        self.forget(missing, namespace)
+
+        unknown = 0
+        try:
+            for page in index.list(namespace=namespace):
+                for vector_id in page:
+                    if vector_id not in entries:
+                        entries[vector_id] = {'hash': None}
+                        unknown += 1
+        except Exception as e:
+            logger.warning(f"Index ids could not be listed, skipping unknown id detection: {e}")
+        logger.info(f"Ledger reconciled for namespace '{namespace}': {len(missing)} ids missing from index, "
+                    f"{unknown} ids unknown to ledger")
+
+    def save(self):
+        """
+        Writes the ledger to disk atomically.
+        """
+        os.makedirs(self.ledger_file.parent, exist_ok=True)
+        tmp_file = self.ledger_file.with_suffix('.tmp')
+        with open(tmp_file, 'w') as f:
+            json.dump({'namespaces': self.namespaces}, f)
+        os.replace(tmp_file, self.ledger_file)
+        logger.info(f"Upload ledger saved at: {self.ledger_file}")
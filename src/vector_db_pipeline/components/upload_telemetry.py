@@ -0,0 +1,158 @@
+from vector_db_pipeline import logger
+from pathlib import Path
+from typing import List
+import numpy as np
+import json
+import time
+import os
+
+
+"""
+Collects per-batch upload measurements and summarizes throughput and latency.
+
+Attributes:
+    latencies (list): Upsert latency in seconds of every successful batch.
+    vectors (int): Number of vectors uploaded successfully.
+    bytes (int): Estimated payload size of the vectors uploaded successfully.
+    retries (int): Number of retried upsert attempts.
+    failed_batches (int): Number of batches that failed after every attempt.
+
+Methods:
+    start(): Marks the beginning of the upload.
+    record_batch(vector_count, payload_bytes, latency, retries, success): Records one batch.
+    summary(): Returns the structured summary of the upload.
+    write_status(status_file): Appends the summary as JSON to the status file.
+    write_prometheus(textfile): Writes the summary as Prometheus gauges to a textfile.
+
+Functions:
+    write_prometheus(telemetries, textfile): Writes the telemetry of every namespace of a run to one textfile.
+"""
+
+
+class UploadTelemetry:
+    def __init__(self, namespace: str):
+        """
+        Initializes empty telemetry for an upload to a namespace.
+
+        Args:
+            namespace (str): Namespace the vectors are uploaded to.
+        """
+        self.namespace = namespace
+        self.latencies: List[float] = []
+        self.vectors = 0
+        self.bytes = 0
+        self.retries = 0
+        self.batches = 0
+        self.failed_batches = 0
+        self._start = None
+        self._end = None
+
+    def start(self):
+        self._start = time.perf_counter()
+
+    def record_batch(self, vector_count: int, payload_bytes: int, latency: float, retries: int, success: bool):
+        """
+        Records the outcome of one batch.
+
+        Args:
+            vector_count (int): Number of vectors in the batch.
+            payload_bytes (int): Estimated payload size of the batch.
+            latency (float): Duration of the successful upsert call in seconds.
+            retries (int): Number of attempts that failed before the last one.
+            success (bool): Whether the batch was uploaded.
+        """
+        self.batches += 1
+        self.retries += retries
+        self._end = time.perf_counter()
+        if not success:
+            self.failed_batches += 1
+            return
+        self.latencies.append(latency)
+        self.vectors += vector_count
+        self.bytes += payload_bytes
+        logger.info(f"Batch {self.batches} uploaded: {vector_count} vectors, {payload_bytes / 1024:.1f} KB "
+                    f"in {latency * 1000:.1f} ms, {retries} retries")
+
+    def summary(self) -> dict:
+        """
+        Returns the structured summary of the upload.
+
+        Returns:
+            dict: Counts, throughput (vectors/s, bytes/s) and p50/p95/p99 upsert latency in milliseconds.
+        """
+        elapsed = (self._end - self._start) if self._start is not None and self._end is not None else 0.0
+        if self.latencies:
+            p50, p95, p99 = (float(value) * 1000 for value in np.percentile(self.latencies, [50, 95, 99]))
+        else:
+            p50 = p95 = p99 = 0.0
+        return {
+            'namespace': self.namespace,
+            'batches': self.batches,
+            'failed_batches': self.failed_batches,
+            'retries': self.retries,
+            'vectors': self.vectors,
+            'bytes': self.bytes,
+            'seconds': round(elapsed, 4),
+            'vectors_per_second': round(self.vectors / elapsed, 2) if elapsed else 0.0,
+            'bytes_per_second': round(self.bytes / elapsed, 2) if elapsed else 0.0,
+            'latency_ms': {'p50': round(p50, 2), 'p95': round(p95, 2), 'p99': round(p99, 2)},
+        }
+
+    def write_status(self, status_file: Path):
+        """
+        Appends the summary as a single JSON line to the status file.
+
+        Args:
+            status_file (Path): Upload status file.
+        """
+        summary = self.summary()
+        with open(status_file, 'a') as f:
+            f.write(f"Upload telemetry: {json.dumps(summary)}\n")
+        logger.info(f"Upload telemetry: {summary}")
+
+    def write_prometheus(self, textfile: Path):
+        """
+        Writes the summary as Prometheus gauges to a textfile for the node exporter textfile collector.
+
+        Args:
+            textfile (Path): Destination .prom file.
+        """
+        write_prometheus([self], textfile)
+
+
+def write_prometheus(telemetries: List[UploadTelemetry], textfile: Path):
+    """
+    Writes the summaries of every namespace uploaded by a run as Prometheus gauges, labelled by namespace,
+    to one textfile for the node exporter textfile collector.
+
+    Args:
+        telemetries (List[UploadTelemetry]): Telemetry of every namespace of the run.
+        textfile (Path): Destination .prom file.
+    """
+    from prometheus_client import CollectorRegistry, Gauge, write_to_textfile
+
+    registry = CollectorRegistry()
+    labels = ['namespace']
+    gauges = {
+        'vectors': ('vector_upload_vectors', 'Vectors uploaded in the last run'),
+        'bytes': ('vector_upload_bytes', 'Estimated bytes uploaded in the last run'),
+        'batches': ('vector_upload_batches', 'Batches attempted in the last run'),
+        'failed_batches': ('vector_upload_failed_batches', 'Batches that failed after every retry'),
+        'retries': ('vector_upload_retries', 'Retried upsert attempts in the last run'),
+        'seconds': ('vector_upload_duration_seconds', 'Duration of the last upload'),
+        'vectors_per_second': ('vector_upload_vectors_per_second', 'Upload throughput in vectors per second'),
+        'bytes_per_second': ('vector_upload_bytes_per_second', 'Upload throughput in bytes per second'),
+    }
+    gauges = {key: Gauge(name, description, labels, registry=registry) for key, (name, description) in gauges.items()}
+    latency = Gauge('vector_upload_latency_milliseconds', 'Upsert latency quantiles of the last run',
+                    labels + ['quantile'], registry=registry)
+    for telemetry in telemetries:
+        summary = telemetry.summary()
+        for key, gauge in gauges.items():
+            gauge.labels(telemetry.namespace).set(summary[key])
+        for quantile, key in (('0.5', 'p50'), ('0.95', 'p95'), ('0.99', 'p99')):
+            latency.labels(telemetry.namespace, quantile).set(summary['latency_ms'][key])
+
+    os.makedirs(Path(textfile).parent, exist_ok=True)
+    write_to_textfile(str(textfile), registry)
+    logger.info(f"Upload metrics of {len(telemetries)} namespaces written to: {textfile}")
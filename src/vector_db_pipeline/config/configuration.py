@@ -3,6 +3,11 @@ from vector_db_pipeline.utils.common import read_yaml, create_directories
 from vector_db_pipeline.entity.config_entity import (DataIngestionConfig,
                                                      DataValidationConfig,
                                                      DataUploadConfig,
+                                                     StreamingConfig,
+                                                     RetrievalConfig,
+                                                     LocalSearchConfig,
+                                                     BenchmarkConfig,
+                                                     CostEstimateConfig,
                                                      CodeStructureConfig,
                                                      JsonSummaryConfig,
                                                      EditSummaryConfig,
@@ -24,6 +29,11 @@ Methods:
     get_data_ingestion_config(): Retrieves data ingestion configuration settings.
     get_data_validation_config(): Retrieves data validation configuration settings.
     get_data_upload_config(): Retrieves data upload configuration settings.
+    get_streaming_config(): Retrieves streaming pipeline configuration settings.
+    get_retrieval_config(): Retrieves query and retrieval configuration settings.
+    get_local_search_config(): Retrieves local exact and approximate search configuration settings.
+    get_benchmark_config(): Retrieves retrieval benchmark configuration settings.
+    get_cost_estimate_config(): Retrieves token and cost estimate configuration settings.
     get_code_structure_config(): Retrieves code structure configuration settings.
     get_json_summary_config(): Retrieves JSON summary processing configuration settings.
     get_edit_summary_config(): Retrieves edited JSON summary configuration settings.
@@ -55,6 +65,12 @@ class ConfigurationManager:
         self.prompt_template = read_yaml(prompt_template)
         self.files_to_ignore = read_yaml(files_to_ignore)
 
+    def _check_sparse_metric(self):
+        # Sparse values can only be stored in and queried against dotproduct indexes
+        if self.params.SPARSE.ENABLED and self.params.INDEX_INFO.METRIC != 'dotproduct':
+            raise ValueError(f"SPARSE.ENABLED requires INDEX_INFO.METRIC: dotproduct, "
+                             f"got {self.params.INDEX_INFO.METRIC}")
+
     def get_data_ingestion_config(self) -> DataIngestionConfig:
         """
         Retrieves data ingestion configuration settings.
@@ -62,6 +78,7 @@ class ConfigurationManager:
         Returns:
             data_ingestion_config (DataIngestionConfig): Data ingestion configuration object.
         """
+        self._check_sparse_metric()
         config = self.config.data_ingestion
         text_spliter = self.params.TEXT_SPLITER
         namespace = self.params.INDEX_INFO.NAMESPACE
@@ -73,7 +90,17 @@ class ConfigurationManager:
             local_data_file=config.local_data_file,
             load_dir=config.load_dir,
             text_spliter_config=text_spliter,
-            namespace_idx = namespace
+            namespace_idx = namespace,
+            embedding_model = self.models.Embedding,
+            sparse_config = self.params.SPARSE,
+            sparse_vocab_file = config.sparse_vocab_file,
+            normalization_config = self.params.NORMALIZATION,
+            normalization_report_file = config.normalization_report_file,
+            projection_config = self.params.PROJECTION,
+            projection_file = config.projection_file,
+            projection_report_file = config.projection_report_file,
+            lineage_config = self.params.LINEAGE,
+            lineage_file = config.lineage_file
         )
 
         return data_ingestion_config
@@ -106,9 +133,11 @@ class ConfigurationManager:
         Returns:
             data_upload_config (DataUploadConfig): Data upload configuration object.
         """
+        self._check_sparse_metric()
         config = self.config.data_load
         index_info = self.params.INDEX_INFO
         batch_size = self.params.BATCH_SIZE
+        convergence = self.params.CONVERGENCE
 
         create_directories([config.root_dir])
 
@@ -117,11 +146,164 @@ class ConfigurationManager:
             read_data_dir=config.read_data_dir,
             STATUS_FILE=config.STATUS_FILE,
             index_info=index_info,
-            batch_size=batch_size
+            batch_size=batch_size,
+            convergence=convergence,
+            index_readiness=self.params.INDEX_READINESS,
+            local_index_dir=config.local_index_dir,
+            ledger_file=config.ledger_file,
+            upload_mode=self.params.UPLOAD_MODE,
+            active_index_file=config.active_index_file,
+            blue_green=self.params.BLUE_GREEN,
+            upload_retry=self.params.UPLOAD_RETRY,
+            telemetry=self.params.TELEMETRY,
+            prometheus_textfile=config.prometheus_textfile,
+            generation_file=config.generation_file,
+            metadata_offload=self.params.METADATA_OFFLOAD,
+            chunk_store_file=config.chunk_store_file,
+            sharding=self.params.SHARDING,
+            retention=self.params.RETENTION,
+            projection=self.params.PROJECTION
         )
 
         return data_upload_config
+
+    def get_streaming_config(self) -> StreamingConfig:
+        """
+        Retrieves streaming pipeline configuration settings.
+
+        Returns:
+            streaming_config (StreamingConfig): Streaming pipeline configuration object.
+        """
+        params = self.params.STREAMING
+
+        streaming_config = StreamingConfig(
+            enabled=params.ENABLED,
+            queue_size=params.QUEUE_SIZE,
+            embed_batch_size=params.EMBED_BATCH_SIZE,
+            embed_workers=params.EMBED_WORKERS
+        )
+
+        return streaming_config
+
+    def get_retrieval_config(self) -> RetrievalConfig:
+        """
+        Retrieves query and retrieval configuration settings.
+
+        Returns:
+            retrieval_config (RetrievalConfig): Retrieval configuration object.
+        """
+        self._check_sparse_metric()
+        config = self.config.retrieval
+        upload_config = self.config.data_load
+        params = self.params.RETRIEVAL
+
+        create_directories([config.root_dir])
+
+        retrieval_config = RetrievalConfig(
+            root_dir=config.root_dir,
+            embedding_cache_file=config.embedding_cache_file,
+            index_info=self.params.INDEX_INFO,
+            active_index_file=upload_config.active_index_file,
+            local_index_dir=upload_config.local_index_dir,
+            embedding_model=self.models.Embedding,
+            top_k=params.TOP_K,
+            lru_size=params.LRU_SIZE,
+            query_workers=params.QUERY_WORKERS,
+            sparse_enabled=self.params.SPARSE.ENABLED,
+            sparse_vocab_file=self.config.data_ingestion.sparse_vocab_file,
+            hybrid_alpha=params.HYBRID_ALPHA,
+            result_cache=self.params.RESULT_CACHE,
+            generation_file=upload_config.generation_file,
+            result_cache_textfile=config.result_cache_textfile,
+            metadata_offload=self.params.METADATA_OFFLOAD,
+            chunk_store_file=upload_config.chunk_store_file,
+            sharding=self.params.SHARDING,
+            projection_enabled=self.params.PROJECTION.ENABLED,
+            projection_file=self.config.data_ingestion.projection_file
+        )
+
+        return retrieval_config
+
+    def get_local_search_config(self) -> LocalSearchConfig:
+        """
+        Retrieves local exact and approximate search configuration settings.
+
+        Returns:
+            local_search_config (LocalSearchConfig): Local search configuration object.
+        """
+        config = self.config.local_search
+        params = self.params.LOCAL_SEARCH
+
+        create_directories([config.root_dir])
+
+        local_search_config = LocalSearchConfig(
+            root_dir=config.root_dir,
+            read_data_dir=config.read_data_dir,
+            ivf_index_file=config.ivf_index_file,
+            n_lists=params.N_LISTS,
+            n_probe=params.N_PROBE,
+            kmeans_iterations=params.KMEANS_ITERATIONS,
+            seed=params.SEED
+        )
+
+        return local_search_config
+
+    def get_benchmark_config(self) -> BenchmarkConfig:
+        """
+        Retrieves retrieval benchmark configuration settings.
+
+        Returns:
+            benchmark_config (BenchmarkConfig): Benchmark configuration object.
+        """
+        config = self.config.benchmark
+        params = self.params.BENCHMARK
+
+        create_directories([config.root_dir])
+
+        benchmark_config = BenchmarkConfig(
+            root_dir=config.root_dir,
+            local_data_file=self.config.data_ingestion.local_data_file,
+            max_queries=params.MAX_QUERIES,
+            k_values=params.K_VALUES,
+            n_probes=params.N_PROBES,
+            seed=params.SEED,
+            include_backend=params.INCLUDE_BACKEND,
+            # Recorded in the report so results of different commits can be told apart
+            run_parameters={
+                'TEXT_SPLITER': self.params.TEXT_SPLITER,
+                'INDEX_INFO': self.params.INDEX_INFO,
+                'SPARSE': self.params.SPARSE,
+                'LOCAL_SEARCH': self.params.LOCAL_SEARCH,
+                'RETRIEVAL': self.params.RETRIEVAL,
+                'EMBEDDING_MODEL': self.models.Embedding
+            }
+        )
+
+        return benchmark_config
     
+    def get_cost_estimate_config(self) -> CostEstimateConfig:
+        """
+        Retrieves token and cost estimate configuration settings.
+
+        Returns:
+            cost_estimate_config (CostEstimateConfig): Cost estimate configuration object.
+        """
+        config = self.config.cost_estimate
+        params = self.params.COST_ESTIMATE
+
+        create_directories([config.root_dir])
+
+        cost_estimate_config = CostEstimateConfig(
+            root_dir=config.root_dir,
+            report_file=config.report_file,
+            workers=params.WORKERS,
+            count_batch_size=params.COUNT_BATCH_SIZE,
+            embedding=params.EMBEDDING,
+            summary=params.SUMMARY
+        )
+
+        return cost_estimate_config
+
     def get_code_structure_config(self) -> CodeStructureConfig:
         """
         Generates a CodeStructureConfig object based on the provided configuration.
@@ -208,6 +390,7 @@ class ConfigurationManager:
             file_changes_config (ConfigFileChanges): Configuration object for monitoring file changes.
         """
         config = self.config.file_changes
+        params = self.params.FILES_STATE
        
         create_directories([config.state_root])
 
@@ -215,7 +398,12 @@ class ConfigurationManager:
             dir_to_monitor = config.dir_to_monitor,
             state_file = config.state_file,
             updated_files = config.updated_files,
-            monitor_files = config.monitor_files
+            monitor_files = config.monitor_files,
+            workers = params.WORKERS,
+            block_size = params.BLOCK_SIZE,
+            event_log = config.event_log,
+            debounce = params.DEBOUNCE,
+            max_delay = params.MAX_DELAY
         )
 
         return file_changes_config
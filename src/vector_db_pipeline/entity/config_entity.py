@@ -10,6 +10,16 @@ class DataIngestionConfig:
     load_dir: Path
     text_spliter_config : dict
     namespace_idx:str
+    embedding_model: str
+    sparse_config: dict
+    sparse_vocab_file: Path
+    normalization_config: dict
+    normalization_report_file: Path
+    projection_config: dict
+    projection_file: Path
+    projection_report_file: Path
+    lineage_config: dict
+    lineage_file: Path
 
     
 @dataclass(frozen=True)
@@ -26,6 +36,82 @@ class DataUploadConfig:
     STATUS_FILE: str
     index_info: dict
     batch_size: int
+    convergence: dict
+    index_readiness: dict
+    local_index_dir: Path
+    ledger_file: Path
+    upload_mode: dict
+    active_index_file: Path
+    blue_green: dict
+    upload_retry: dict
+    telemetry: dict
+    prometheus_textfile: Path
+    generation_file: Path
+    metadata_offload: dict
+    chunk_store_file: Path
+    sharding: dict
+    retention: dict
+    projection: dict
+
+@dataclass(frozen=True)
+class StreamingConfig:
+    enabled: bool
+    queue_size: int
+    embed_batch_size: int
+    embed_workers: int
+
+@dataclass(frozen=True)
+class RetrievalConfig:
+    root_dir: Path
+    embedding_cache_file: Path
+    index_info: dict
+    active_index_file: Path
+    local_index_dir: Path
+    embedding_model: str
+    top_k: int
+    lru_size: int
+    query_workers: int
+    sparse_enabled: bool
+    sparse_vocab_file: Path
+    hybrid_alpha: float
+    result_cache: dict
+    generation_file: Path
+    result_cache_textfile: Path
+    metadata_offload: dict
+    chunk_store_file: Path
+    sharding: dict
+    projection_enabled: bool
+    projection_file: Path
+
+@dataclass(frozen=True)
+class LocalSearchConfig:
+    root_dir: Path
+    read_data_dir: Path
+    ivf_index_file: Path
+    n_lists: int
+    n_probe: int
+    kmeans_iterations: int
+    seed: int
+
+@dataclass(frozen=True)
+class BenchmarkConfig:
+    root_dir: Path
+    local_data_file: Path
+    max_queries: int
+    k_values: list
+    n_probes: list
+    seed: int
+    include_backend: bool
+    run_parameters: dict
+
+@dataclass(frozen=True)
+class CostEstimateConfig:
+    root_dir: Path
+    report_file: Path
+    workers: int
+    count_batch_size: int
+    embedding: dict
+    summary: dict
 
 @dataclass(frozen=True)
 class CodeStructureConfig:
@@ -46,6 +132,11 @@ class ConfigFileChanges:
     state_file: Path
     updated_files: Path
     monitor_files: Path
+    workers: int
+    block_size: int
+    event_log: Path
+    debounce: float
+    max_delay: float
 
 @dataclass(frozen=True)
 class EditSummaryConfig:
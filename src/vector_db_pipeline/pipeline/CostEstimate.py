@@ -0,0 +1,53 @@
+from vector_db_pipeline.config.configuration import ConfigurationManager
+from vector_db_pipeline.components.data_ingestion import TextProcessor
+from vector_db_pipeline.components.cost_estimator import CostEstimator
+from vector_db_pipeline import logger
+
+import time
+
+STAGE_NAME = "Cost estimate stage"
+
+
+class CostEstimatePipeline:
+    """
+    A class to estimate the tokens, requests, cost and wall time of ingestion and summarization without calling any model.
+
+    Methods:
+        main(): Runs the estimate and writes its report.
+    """
+
+    def __init__(self):
+        """
+        Initializes the CostEstimatePipeline class.
+        """
+        pass
+
+    def main(self):
+        """
+        Runs the estimate and writes its report.
+
+        This method performs the following steps:
+        1. Retrieves the cost estimate, data ingestion, streaming and JSON summary configurations.
+        2. Streams and chunks the data files and counts the embedding tokens, predicting reused embeddings.
+        3. Counts the LLM tokens of the files to summarize and writes both estimates to a JSON report.
+
+        Returns:
+            None
+        """
+        config = ConfigurationManager()
+        text_processor = TextProcessor(config=config.get_data_ingestion_config())
+        CostEstimator(config.get_cost_estimate_config(), text_processor, config.get_streaming_config(),
+                      config.get_json_summary_config()).run()
+
+
+if __name__ =='__main__':
+    try:
+        start = time.time()
+        logger.info(f">>>>>>> stage {STAGE_NAME} started <<<<<<<<<<<<")
+        obj = CostEstimatePipeline()
+        obj.main()
+        logger.info(f">>>>>>> stage {STAGE_NAME} completed in  {(time.time() - start):.4f} seconds<<<<<<<<<<<<\n\nx===============x")
+
+    except Exception as e:
+        logger.exception(e)
+        raise(e)
@@ -1,6 +1,6 @@
 from vector_db_pipeline.config.configuration import ConfigurationManager
 from vector_db_pipeline.components.data_ingestion import TextProcessor
-from vector_db_pipeline.utils.common import list_files_in_directory, get_json
+from vector_db_pipeline.utils.common import list_files_in_directory, iter_sourced_records
 from vector_db_pipeline import logger
 from pathlib import Path
 
@@ -17,7 +17,7 @@ class DataIngestionPipeline:
 
         Retrieves data ingestion configuration from ConfigurationManager.
         Retrieves JSON files from the local data directory specified in the configuration.
-        Parses JSON files to extract data.
+        Parses JSON files to extract data and the provenance of every record.
         Initializes TextProcessor with data ingestion configuration.
         Splits text data into chunks and embeds them.
         Saves the processed data into a JSON file.
@@ -29,14 +29,17 @@ class DataIngestionPipeline:
         # Get JSON files from local data directory
         json_files = list_files_in_directory(Path(data_ingestion_config.local_data_file))
         
-        # Parse JSON files to extract data
-        data = get_json(json_files)
+        # Parse JSON files to extract data, keeping the file and index of every record for the lineage
+        sourced_records = list(iter_sourced_records(json_files))
+        data = [record for _, _, record in sourced_records]
+        sources = [(source_file, record_index) for source_file, record_index, _ in sourced_records]
+        logger.info(f"JSON files loaded successfully from: {json_files}")
         
         # Initialize TextProcessor with data ingestion configuration
         text_processor = TextProcessor(config=data_ingestion_config)
         
         # Split text data into chunks and embed them
-        splited_text_data = text_processor.split_text(data)
+        splited_text_data = text_processor.split_text(data, sources)
         
         
         # Save the processed data into a JSON file
@@ -15,13 +15,16 @@ class DataUploadPipeline:
         self.data_upload_config = self.config_manager.get_data_upload_config()
         self.should_restart_database = should_restart_database
 
-    def restart_database(self):
+    def restart_database(self, data_upload=None):
         """
         Restarts the database by deleting and recreating the index.
 
         Deletes the existing index and recreates it to start fresh.
+
+        Args:
+            data_upload (DataUpload, optional): Instance to reuse, so its index listing and handles stay cached.
         """
-        data_upload = DataUpload(config=self.data_upload_config)
+        data_upload = data_upload or DataUpload(config=self.data_upload_config)
         data_upload.del_index()
         data_upload.recreate_index()
 
@@ -31,28 +34,40 @@ class DataUploadPipeline:
 
         Initializes DataUpload with data upload configuration.
         Generates Pinecone vectors from the input data.
-        Uploads vectors to the Pinecone index in batches.
+        Uploads vectors to the Pinecone index in batches, only the changed ones in sync mode,
+        or into a new versioned target that replaces the active one in blue_green mode.
         """
+        upload_mode = self.data_upload_config.upload_mode.MODE
+
+        # Deleting the database takes precedence over sync mode, which then has nothing to compare against
+        if self.should_restart_database and upload_mode == 'sync':
+            logger.warning("UPLOAD_MODE.MODE is sync but DELETE_DATABSE.DELETE_DATABSE is True: the index is deleted "
+                           "and every vector uploaded again. Set DELETE_DATABSE to False for incremental syncs")
+
         # Initialize DataUpload with data upload configuration
         data_upload = DataUpload(config=self.data_upload_config)
-        
-        # Restart the database if needed
-        if self.should_restart_database:
+
+        # Restart the database if needed. Blue/green mode rebuilds next to the active index instead.
+        if self.should_restart_database and upload_mode != 'blue_green':
             logger.info(f"Restarting database")
-            self.restart_database()
+            self.restart_database(data_upload)
 
         # Generate Pinecone vectors from the input data
         pinecone_vector = data_upload.pinecon_vector()
         
         # Upload vectors to the Pinecone index in batches
-        data_upload.batch_upload(pinecone_vector)
+        if upload_mode == 'blue_green':
+            data_upload.blue_green_rebuild(pinecone_vector)
+        elif upload_mode == 'sync' and not self.should_restart_database:
+            data_upload.sync_upload(pinecone_vector)
+        else:
+            data_upload.upload(pinecone_vector, reset_ledger=self.should_restart_database)
 
 
 if __name__ =='__main__':
     try:
         logger.info(f">>>>>>> stage {STAGE_NAME} started <<<<<<<<<<<<")
         obj = DataUploadPipeline(should_restart_database=True)
-        obj.restart_database()
         obj.main()
         logger.info(f">>>>>>> stage {STAGE_NAME} completed <<<<<<<<<<<<\n\nx===============x")
 
@@ -0,0 +1,54 @@
+from vector_db_pipeline.config.configuration import ConfigurationManager
+from vector_db_pipeline.components.changes_in_files import FilesState
+from vector_db_pipeline.components.file_watcher import FileWatcher
+from vector_db_pipeline import logger
+
+import time
+
+STAGE_NAME = "File watch stage"
+
+class FileWatchPipeline:
+    """
+    A class to keep the state of the monitored files up to date with Linux inotify until interrupted.
+
+    Methods:
+        main(): Watches the monitored files and records their changes until interrupted.
+    """
+
+    def __init__(self):
+        """
+        Initializes the FileWatchPipeline class.
+        """
+        pass
+
+    def main(self):
+        """
+        Watches the monitored files and records their changes until interrupted.
+
+        This method performs the following steps:
+        1. Initializes the configuration manager and retrieves the file changes configuration.
+        2. Watches the parent directories of the monitored files, then runs one state scan so
+           changed_files.json starts from the changes since the last run.
+        3. Records debounced changes to the state file, changed_files.json and the event log until interrupted.
+
+        Returns:
+            None
+        """
+        config = ConfigurationManager()
+        file_changes_config = config.get_file_changes_config()
+        watcher = FileWatcher(file_changes_config, FilesState(file_changes_config))
+        watcher.run()
+
+if __name__ =='__main__':
+    try:
+        start = time.time()
+        logger.info(f">>>>>>> stage {STAGE_NAME} started <<<<<<<<<<<<")
+        obj = FileWatchPipeline()
+        obj.main()
+        logger.info(f">>>>>>> stage {STAGE_NAME} completed in  {(time.time() - start):.4f} seconds<<<<<<<<<<<<\n\nx===============x")
+
+
+
+    except Exception as e:
+        logger.exception(e)
+        raise(e)
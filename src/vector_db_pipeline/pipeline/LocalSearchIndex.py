@@ -0,0 +1,51 @@
+from vector_db_pipeline.config.configuration import ConfigurationManager
+from vector_db_pipeline.components.local_search import build_ivf_index
+from vector_db_pipeline import logger
+
+import time
+
+STAGE_NAME = "Local search index stage"
+
+
+class LocalSearchIndexPipeline:
+    """
+    A class to build the persisted approximate local search index from the ingestion artifact.
+
+    Methods:
+        main(): Builds and saves the IVF index.
+    """
+
+    def __init__(self):
+        """
+        Initializes the LocalSearchIndexPipeline class.
+        """
+        pass
+
+    def main(self):
+        """
+        Builds and saves the IVF index.
+
+        This method performs the following steps:
+        1. Initializes the configuration manager and retrieves the local search configuration.
+        2. Loads and normalizes the vectors of the ingestion artifact.
+        3. Clusters them into inverted lists and persists the index.
+
+        Returns:
+            None
+        """
+        config = ConfigurationManager()
+        local_search_config = config.get_local_search_config()
+        build_ivf_index(local_search_config)
+
+
+if __name__ =='__main__':
+    try:
+        start = time.time()
+        logger.info(f">>>>>>> stage {STAGE_NAME} started <<<<<<<<<<<<")
+        obj = LocalSearchIndexPipeline()
+        obj.main()
+        logger.info(f">>>>>>> stage {STAGE_NAME} completed in  {(time.time() - start):.4f} seconds<<<<<<<<<<<<\n\nx===============x")
+
+    except Exception as e:
+        logger.exception(e)
+        raise(e)
@@ -0,0 +1,54 @@
+from vector_db_pipeline.config.configuration import ConfigurationManager
+from vector_db_pipeline.components.retrieval import Retriever
+from vector_db_pipeline.components.retrieval_benchmark import RetrievalBenchmark
+from vector_db_pipeline import logger
+
+import time
+
+STAGE_NAME = "Retrieval benchmark stage"
+
+
+class RetrievalBenchmarkPipeline:
+    """
+    A class to measure recall, MRR and latency of the local and configured search backends.
+
+    Methods:
+        main(): Runs the benchmark and writes its report.
+    """
+
+    def __init__(self):
+        """
+        Initializes the RetrievalBenchmarkPipeline class.
+        """
+        pass
+
+    def main(self):
+        """
+        Runs the benchmark and writes its report.
+
+        This method performs the following steps:
+        1. Retrieves the benchmark, local search and retrieval configurations.
+        2. Builds the page title query set from the data directory and embeds it.
+        3. Queries the exact, IVF and configured backends and writes recall@k, MRR and latency to a JSON report.
+
+        Returns:
+            None
+        """
+        config = ConfigurationManager()
+        benchmark_config = config.get_benchmark_config()
+        local_search_config = config.get_local_search_config()
+        retriever = Retriever(config=config.get_retrieval_config())
+        RetrievalBenchmark(benchmark_config, local_search_config, retriever).run()
+
+
+if __name__ =='__main__':
+    try:
+        start = time.time()
+        logger.info(f">>>>>>> stage {STAGE_NAME} started <<<<<<<<<<<<")
+        obj = RetrievalBenchmarkPipeline()
+        obj.main()
+        logger.info(f">>>>>>> stage {STAGE_NAME} completed in  {(time.time() - start):.4f} seconds<<<<<<<<<<<<\n\nx===============x")
+
+    except Exception as e:
+        logger.exception(e)
+        raise(e)
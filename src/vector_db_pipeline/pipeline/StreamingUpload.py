@@ -0,0 +1,83 @@
+from vector_db_pipeline.config.configuration import ConfigurationManager
+from vector_db_pipeline.components.data_ingestion import TextProcessor
+from vector_db_pipeline.components.data_validation import BatchValidator
+from vector_db_pipeline.components.data_load import DataUpload
+from vector_db_pipeline.components.streaming import StreamingPipeline
+from vector_db_pipeline import logger
+
+import time
+
+STAGE_NAME = "Streaming ingestion to upload stage"
+
+
+class StreamingUploadPipeline:
+    """
+    A class to run ingestion, validation and upload as one streaming stage.
+
+    Methods:
+        main(): Streams records from the data directory to the vector index.
+    """
+
+    def __init__(self, should_restart_database=False):
+        """
+        Initializes the StreamingUploadPipeline.
+
+        Args:
+            should_restart_database (bool, optional): Whether to delete and recreate the index first. Defaults to False.
+        """
+        self.config_manager = ConfigurationManager()
+        self.should_restart_database = should_restart_database
+
+    def main(self):
+        """
+        Streams records from the data directory to the vector index.
+
+        This method performs the following steps:
+        1. Retrieves ingestion, validation, upload and streaming configurations.
+        2. Restarts the database if needed.
+        3. Runs the reader, chunker, embedder, validator and uploader stages concurrently.
+
+        Returns:
+            None
+        """
+        data_ingestion_config = self.config_manager.get_data_ingestion_config()
+        data_validation_config = self.config_manager.get_data_validation_config()
+        data_upload_config = self.config_manager.get_data_upload_config()
+        streaming_config = self.config_manager.get_streaming_config()
+
+        upload_mode = data_upload_config.upload_mode.MODE
+        if upload_mode == 'blue_green':
+            raise ValueError("Blue/green rebuilds are not supported in streaming mode, disable STREAMING.ENABLED")
+        # Deleting the database takes precedence over sync mode, which then has nothing to compare against
+        if self.should_restart_database and upload_mode == 'sync':
+            logger.warning("UPLOAD_MODE.MODE is sync but DELETE_DATABSE.DELETE_DATABSE is True: the index is deleted "
+                           "and every vector uploaded again. Set DELETE_DATABSE to False for incremental syncs")
+
+        data_upload = DataUpload(config=data_upload_config)
+        if self.should_restart_database:
+            logger.info(f"Restarting database")
+            data_upload.del_index()
+            data_upload.recreate_index()
+            for namespace in data_upload.namespaces_of():
+                data_upload.ledger.reset(namespace)
+
+        streaming = StreamingPipeline(
+            config=streaming_config,
+            text_processor=TextProcessor(config=data_ingestion_config),
+            validator=BatchValidator(config=data_validation_config),
+            data_upload=data_upload
+        )
+        streaming.run(sync=upload_mode == 'sync' and not self.should_restart_database)
+
+
+if __name__ =='__main__':
+    try:
+        start = time.time()
+        logger.info(f">>>>>>> stage {STAGE_NAME} started <<<<<<<<<<<<")
+        obj = StreamingUploadPipeline(should_restart_database=True)
+        obj.main()
+        logger.info(f">>>>>>> stage {STAGE_NAME} completed in  {(time.time() - start):.4f} seconds<<<<<<<<<<<<\n\nx===============x")
+
+    except Exception as e:
+        logger.exception(e)
+        raise(e)
@@ -0,0 +1,48 @@
+from vector_db_pipeline.config.configuration import ConfigurationManager
+from vector_db_pipeline.components.data_load import DataUpload
+from vector_db_pipeline import logger
+
+STAGE_NAME = "Vector expiry stage"
+
+
+class VectorExpiryPipeline:
+    """
+    A maintenance stage deleting the vectors that outlived the RETENTION policy.
+
+    Methods:
+        main(): Deletes the expired vectors of the active index and namespace.
+    """
+
+    def __init__(self):
+        """
+        Initializes the VectorExpiryPipeline.
+
+        Retrieves data upload configuration using ConfigurationManager.
+        """
+        self.config_manager = ConfigurationManager()
+        self.data_upload_config = self.config_manager.get_data_upload_config()
+
+    def main(self):
+        """
+        Deletes the expired vectors of the active index and namespace.
+
+        Expired ids are looked up in the upload ledger by the scrape time and host of their source,
+        then deleted in bulk. Nothing is deleted while RETENTION.ENABLED is off.
+        """
+        if not self.data_upload_config.retention.ENABLED:
+            logger.info("Retention policy disabled, no vector expires")
+            return
+        data_upload = DataUpload(config=self.data_upload_config)
+        data_upload.expire_vectors()
+
+
+if __name__ =='__main__':
+    try:
+        logger.info(f">>>>>>> stage {STAGE_NAME} started <<<<<<<<<<<<")
+        obj = VectorExpiryPipeline()
+        obj.main()
+        logger.info(f">>>>>>> stage {STAGE_NAME} completed <<<<<<<<<<<<\n\nx===============x")
+
+    except Exception as e:
+        logger.exception(e)
+        raise(e)
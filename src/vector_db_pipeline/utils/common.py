@@ -1,4 +1,11 @@
 import os
+import io
+import bz2
+import gzip
+import lzma
+import time
+import re
+from functools import lru_cache
 from box.exceptions import BoxValueError
 import yaml
 from vector_db_pipeline import logger
@@ -7,7 +14,7 @@ import joblib
 from ensure import ensure_annotations
 from box import ConfigBox
 from pathlib import Path
-from typing import Any, List
+from typing import Any, Callable, Iterator, List, Tuple
 
 
 
@@ -132,6 +139,171 @@ def get_size(path: Path) -> str:
     return f"~ {size_in_kb} KB"
 
 
+# Leading bytes of the supported compression formats, checked before the file extension
+_COMPRESSION_MAGIC = ((b'\x1f\x8b', 'gzip'), (b'\x28\xb5\x2f\xfd', 'zstd'), (b'BZh', 'bz2'),
+                      (b'\xfd7zXZ\x00', 'xz'))
+_COMPRESSION_EXTENSIONS = {'.gz': 'gzip', '.zst': 'zstd', '.bz2': 'bz2', '.xz': 'xz'}
+_JSON_LINES_EXTENSIONS = {'.jsonl', '.ndjson'}
+_READ_BLOCK_SIZE = 1 << 16
+
+
+def detect_compression(file_path: Path) -> str:
+    """
+    Detects the compression of a file from its magic bytes, falling back to its extension.
+
+    Args:
+        file_path (Path): File to inspect.
+
+    Returns:
+        str: 'gzip', 'zstd', 'bz2', 'xz' or 'none'.
+    """
+    with open(file_path, 'rb') as f:
+        head = f.read(8)
+    for magic, compression in _COMPRESSION_MAGIC:
+        if head.startswith(magic):
+            return compression
+    return _COMPRESSION_EXTENSIONS.get(Path(file_path).suffix.lower(), 'none')
+
+
+def open_text_stream(file_path: Path) -> io.TextIOBase:
+    """
+    Opens a possibly compressed file as a UTF-8 text stream, decompressing while it is read.
+
+    zstd support needs the optional zstandard package, imported on first use.
+
+    Args:
+        file_path (Path): File to open.
+
+    Returns:
+        io.TextIOBase: Text stream; the caller closes it.
+    """
+    compression = detect_compression(file_path)
+    if compression == 'gzip':
+        return gzip.open(file_path, 'rt', encoding='utf-8-sig')
+    if compression == 'bz2':
+        return bz2.open(file_path, 'rt', encoding='utf-8-sig')
+    if compression == 'xz':
+        return lzma.open(file_path, 'rt', encoding='utf-8-sig')
+    if compression == 'zstd':
+        try:
+            import zstandard
+        except ImportError as e:
+            raise ImportError(f"Reading {file_path} requires the zstandard package: pip install zstandard") from e
+        raw = open(file_path, 'rb')
+        return io.TextIOWrapper(zstandard.ZstdDecompressor().stream_reader(raw, closefd=True), encoding='utf-8-sig')
+    return open(file_path, 'r', encoding='utf-8-sig')
+
+
+def _iter_json_array(stream: io.TextIOBase) -> Iterator[Any]:
+    # Decodes the items of a top-level JSON array one at a time, keeping only the undecoded tail in memory
+    decoder = json.JSONDecoder()
+    buffer = ''
+    position = 0
+    started = False
+    exhausted = False
+    block_size = _READ_BLOCK_SIZE
+    while True:
+        while position < len(buffer) and (buffer[position].isspace() or (started and buffer[position] == ',')):
+            position += 1
+        if position < len(buffer):
+            if not started:
+                if buffer[position] != '[':
+                    raise ValueError("Expected a JSON array")
+                started = True
+                position += 1
+                continue
+            if buffer[position] == ']':
+                return
+            try:
+                item, end = decoder.raw_decode(buffer, position)
+                # A number at the end of the buffer may continue in the next block
+                if end < len(buffer) or exhausted:
+                    yield item
+                    position = end
+                    block_size = _READ_BLOCK_SIZE
+                    continue
+            except json.JSONDecodeError:
+                if exhausted:
+                    raise
+        elif exhausted:
+            if started:
+                raise ValueError("Unterminated JSON array")
+            return
+        block = stream.read(block_size)
+        # Items larger than a block are retried with growing reads, keeping the total work linear
+        block_size *= 2
+        exhausted = not block
+        buffer = buffer[position:] + block
+        position = 0
+
+
+def iter_file_records(file_path: Path) -> Iterator[dict]:
+    """
+    Yields the records of one data file without loading or decompressing it whole.
+
+    The compression is detected by detect_compression. Files ending in .jsonl or .ndjson (before the
+    compression suffix) hold one JSON record per line and other files a JSON array of records; files
+    with an unknown extension are treated as JSON Lines when their first character is '{'.
+
+    Args:
+        file_path (Path): Data file, e.g. data.json, data.json.gz or data.jsonl.zst.
+
+    Yields:
+        dict: One record.
+    """
+    path = Path(file_path)
+    suffixes = [suffix.lower() for suffix in path.suffixes]
+    if suffixes and suffixes[-1] in _COMPRESSION_EXTENSIONS:
+        suffixes = suffixes[:-1]
+    extension = suffixes[-1] if suffixes else ''
+    if extension in _JSON_LINES_EXTENSIONS:
+        json_lines = True
+    elif extension == '.json':
+        json_lines = False
+    else:
+        with open_text_stream(path) as stream:
+            json_lines = stream.read(_READ_BLOCK_SIZE).lstrip().startswith('{')
+
+    with open_text_stream(path) as stream:
+        if json_lines:
+            for line in stream:
+                if line.strip():
+                    yield json.loads(line)
+        else:
+            yield from _iter_json_array(stream)
+
+
+def iter_json_records(json_files: List):
+    """
+    Yield the records of data files one record at a time.
+
+    Plain, gzip, zstd, bz2 and xz compressed JSON arrays and JSON Lines files are supported, see iter_file_records.
+
+    Args:
+        json_files (List[str]): List of paths to data files.
+
+    Yields:
+        dict: One record.
+    """
+    for json_file in json_files:
+        yield from iter_file_records(json_file)
+
+
+def iter_sourced_records(json_files: List):
+    """
+    Yield the records of data files one record at a time, with their provenance.
+
+    Args:
+        json_files (List[str]): List of paths to data files.
+
+    Yields:
+        tuple: (data file, index of the record in the file, record).
+    """
+    for json_file in json_files:
+        for record_index, record in enumerate(iter_file_records(json_file)):
+            yield str(json_file), record_index, record
+
+
 @ensure_annotations
 def get_json(json_files: List) -> List:
     """
@@ -143,20 +315,8 @@ def get_json(json_files: List) -> List:
     Returns:
         ConfigBox: Data as class attributes instead of dict.
     """
-    # Initialize an empty list to store data from JSON files
-    all_data = []
-
-    # Iterate through each JSON file
-    for json_file in json_files:
-        # Open the JSON file
-        with open(json_file, 'r', encoding='utf-8') as file:
-            # Load the JSON data
-            data = json.load(file)
-        # Append the loaded data to the list
-        all_data.append(data)
-    
-    # Flatten the list of lists into a single list
-    flattened_list = [item for sublist in all_data for item in sublist]
+    # Load and flatten the records of every JSON file into a single list
+    flattened_list = list(iter_json_records(json_files))
     
     # Log a message indicating successful loading of JSON files
     logger.info(f"JSON files loaded successfully from: {json_files}")
@@ -164,6 +324,63 @@ def get_json(json_files: List) -> List:
     # Return the data as a ConfigBox object
     return flattened_list
 
+# Encoding used for models unknown to tiktoken, e.g. the Groq hosted Llama and Mixtral models
+_FALLBACK_TOKEN_ENCODING = 'cl100k_base'
+_WORD_OR_PUNCTUATION = re.compile(r"\w+|[^\w\s]")
+
+
+@lru_cache(maxsize=None)
+def get_token_encoder(model: str = ''):
+    """
+    Returns the tiktoken encoder of a model, loaded once per process and model.
+
+    Models unknown to tiktoken are counted with cl100k_base, an approximation of their tokenizer.
+
+    Args:
+        model (str, optional): Model name, e.g. 'text-embedding-ada-002'.
+
+    Returns:
+        tiktoken.Encoding or None: None when tiktoken is not installed or its encoding cannot be loaded.
+    """
+    try:
+        import tiktoken
+    except ImportError:
+        logger.warning("tiktoken is not installed, token counts are approximated")
+        return None
+    try:
+        try:
+            return tiktoken.encoding_for_model(model)
+        except KeyError:
+            return tiktoken.get_encoding(_FALLBACK_TOKEN_ENCODING)
+    except Exception as e:
+        # Encodings are downloaded on first use, which fails offline
+        logger.warning(f"tiktoken encoding of '{model}' cannot be loaded, token counts are approximated: {e}")
+        return None
+
+
+def count_tokens_batch(texts: List[str], model: str = '', workers: int = 1) -> List[int]:
+    """
+    Counts the tokens of many texts.
+
+    tiktoken encodes a batch on several threads outside the GIL. Without tiktoken, tokens are
+    approximated with word and punctuation counts.
+
+    Args:
+        texts (List[str]): Texts to count.
+        model (str, optional): Model whose tokenizer counts the texts.
+        workers (int, optional): Encoding threads. Defaults to 1.
+
+    Returns:
+        List[int]: Number of tokens per text.
+    """
+    encoder = get_token_encoder(model)
+    if encoder is None:
+        return [len(_WORD_OR_PUNCTUATION.findall(text)) for text in texts]
+    if workers <= 1 or len(texts) <= 1:
+        return [len(encoder.encode_ordinary(text)) for text in texts]
+    return [len(tokens) for tokens in encoder.encode_ordinary_batch(texts, num_threads=workers)]
+
+
 @ensure_annotations
 def list_files_in_directory(path: Path) -> List:
     """
@@ -296,4 +513,32 @@ def read_file_with_encodings(file_path: Path):
             return content
         except UnicodeDecodeError:
             logger.warning(f"Failed to read file with encoding: {encoding}")
-    return ""
\ No newline at end of file
+    return ""
+
+
+def poll_with_backoff(check: Callable[[], Tuple[bool, Any]], timeout: float, initial_delay: float = 1.0,
+                      max_delay: float = 15.0, backoff_factor: float = 2.0):
+    """
+    Calls check() until it reports success or the timeout is reached, sleeping with capped exponential backoff.
+
+    Args:
+        check (Callable): Function returning a tuple (done, value).
+        timeout (float): Maximum number of seconds to wait.
+        initial_delay (float, optional): First sleep in seconds. Defaults to 1.0.
+        max_delay (float, optional): Upper bound for a single sleep in seconds. Defaults to 15.0.
+        backoff_factor (float, optional): Multiplier applied to the delay after each attempt. Defaults to 2.0.
+
+    Returns:
+        tuple: (done, value, elapsed) where done is False if the timeout was reached.
+    """
+    start = time.monotonic()
+    delay = initial_delay
+    while True:
+        done, value = check()
+        elapsed = time.monotonic() - start
+        if done:
+            return True, value, elapsed
+        if elapsed >= timeout:
+            return False, value, elapsed
+        time.sleep(min(delay, max_delay, timeout - elapsed))
+        delay = delay * backoff_factor
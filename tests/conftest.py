@@ -0,0 +1,53 @@
+from pathlib import Path
+import random
+import sys
+
+import pytest
+import yaml
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR / 'src'))
+
+from vector_db_pipeline.config.configuration import ConfigurationManager
+
+
+@pytest.fixture
+def make_config_manager(tmp_path, monkeypatch):
+    """
+    Returns a factory of ConfigurationManager objects reading the repository configuration, with params.yaml
+    on the local backend and small vectors. Artifacts are written under tmp_path.
+    """
+    monkeypatch.chdir(tmp_path)
+
+    def make(**sections):
+        with open(ROOT_DIR / 'params.yaml') as f:
+            params = yaml.safe_load(f)
+        params['INDEX_INFO'].update(BACKEND='local', DIMENSIONS=8)
+        for section, values in sections.items():
+            params[section].update(values)
+        params_file = tmp_path / 'params.yaml'
+        with open(params_file, 'w') as f:
+            yaml.safe_dump(params, f)
+        return ConfigurationManager(config_filepath=ROOT_DIR / 'config' / 'config.yaml',
+                                    schema_filepath=ROOT_DIR / 'schema.yaml',
+                                    params_filepath=params_file,
+                                    models_filepath=ROOT_DIR / 'models.yaml',
+                                    prompt_template=ROOT_DIR / 'prompt_template.yaml',
+                                    files_to_ignore=ROOT_DIR / 'exhalation_ignore.yaml')
+
+    return make
+
+
+def make_vectors(urls, chunks_per_url=3, dimension=8, seed=0):
+    """
+    Returns vectors shaped like the ingestion output, ids being the url followed by the chunk ordinal.
+    """
+    rnd = random.Random(seed)
+    vectors = []
+    for url in urls:
+        for ordinal in range(chunks_per_url):
+            vectors.append({'id': f"{url}-{ordinal}",
+                            'values': [rnd.uniform(-1.0, 1.0) for _ in range(dimension)],
+                            'metadata': {'text': f"chunk {ordinal} of {url}", 'host': 'example.com',
+                                         'page_title': url, 'url': f"https://example.com/{url}"}})
+    return vectors
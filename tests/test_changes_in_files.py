@@ -0,0 +1,80 @@
+from vector_db_pipeline.components.changes_in_files import FilesState
+from vector_db_pipeline.components.file_watcher import FileWatcher
+from vector_db_pipeline.entity.config_entity import ConfigFileChanges
+import json
+import os
+import time
+
+import pytest
+
+
+@pytest.fixture
+def files_state(tmp_path):
+    monitor_files = tmp_path / 'files_to_monitor.json'
+    monitor_files.write_text(json.dumps([str(tmp_path / 'app.py')]))
+    config = ConfigFileChanges(dir_to_monitor=tmp_path, state_file=tmp_path / 'state.json',
+                               updated_files=tmp_path / 'changed_files.json', monitor_files=monitor_files,
+                               workers=1, block_size=4, event_log=tmp_path / 'events.jsonl',
+                               debounce=0.1, max_delay=1.0)
+    return FilesState(config)
+
+
+def write_old(path, content):
+    # Outside the racy window, so the modification time is kept in the entry
+    path.write_text(content)
+    old = time.time_ns() - 10 * 10**9
+    os.utime(path, ns=(old, old))
+
+
+def test_file_entry_of_a_missing_file_is_none(files_state, tmp_path):
+    assert files_state.file_entry(str(tmp_path / 'missing.py')) is None
+
+
+def test_file_entry_reuses_the_previous_entry_when_the_stat_is_unchanged(files_state, tmp_path):
+    path = tmp_path / 'app.py'
+    write_old(path, 'print(1)\n')
+    entry = files_state.file_entry(str(path))
+
+    assert entry['blake2b'] == FilesState.get_file_hash(path)
+    assert files_state.file_entry(str(path), entry) is entry
+
+
+def test_file_entry_rehashes_changed_and_legacy_entries(files_state, tmp_path):
+    path = tmp_path / 'app.py'
+    write_old(path, 'print(1)\n')
+    entry = files_state.file_entry(str(path))
+    write_old(path, 'print(22)\n')
+
+    assert files_state.file_entry(str(path), entry)['blake2b'] != entry['blake2b']
+    assert files_state.file_entry(str(path), FilesState.get_file_md5(path))['blake2b'] == FilesState.get_file_hash(path)
+
+
+def test_file_entry_drops_racy_modification_times(files_state, tmp_path):
+    path = tmp_path / 'app.py'
+    path.write_text('print(1)\n')
+
+    entry = files_state.file_entry(str(path))
+
+    assert entry['mtime_ns'] is None
+    assert files_state.file_entry(str(path), entry) is not entry
+
+
+def read_changes(files_state):
+    with open(files_state.config.updated_files) as f:
+        return json.load(f)
+
+
+def test_merge_changes_nets_out_changes_since_the_last_state_run(files_state):
+    watcher = FileWatcher(files_state.config, files_state)
+    watcher._merge_changes({'added_files': ['new.py'], 'deleted_files': ['old.py'], 'changed_files': ['app.py']})
+    watcher._merge_changes({'added_files': ['old.py'], 'deleted_files': ['new.py', 'app.py'], 'changed_files': []})
+
+    assert read_changes(files_state) == {'added_files': [], 'deleted_files': ['app.py'], 'changed_files': ['old.py']}
+
+
+def test_merge_changes_does_not_report_added_files_as_changed(files_state):
+    watcher = FileWatcher(files_state.config, files_state)
+    watcher._merge_changes({'added_files': ['new.py'], 'deleted_files': [], 'changed_files': []})
+    watcher._merge_changes({'added_files': [], 'deleted_files': [], 'changed_files': ['new.py']})
+
+    assert read_changes(files_state) == {'added_files': ['new.py'], 'deleted_files': [], 'changed_files': []}
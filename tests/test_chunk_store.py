@@ -0,0 +1,47 @@
+from vector_db_pipeline.components.chunk_store import ChunkStore
+import sqlite3
+import json
+import zlib
+
+
+def test_deletes_keep_the_entries_of_other_namespaces(tmp_path):
+    store = ChunkStore(tmp_path / 'chunks.db')
+    store.put_many({'a-0': {'text': 'blue'}}, 'index', 'docs-v1')
+    store.put_many({'a-0': {'text': 'green'}}, 'index', 'docs-v2')
+
+    store.delete_many(['a-0'], 'index', 'docs-v1')
+
+    assert store.get_many(['a-0'], 'index', ['docs-v1']) == {}
+    assert store.get_many(['a-0'], 'index', ['docs-v2']) == {'a-0': {'text': 'green'}}
+
+
+def test_reads_prefer_the_first_namespace(tmp_path):
+    store = ChunkStore(tmp_path / 'chunks.db')
+    store.put_many({'a-0': {'text': 'shard'}}, 'index', 'docs-1')
+    store.put_many({'a-0': {'text': 'queried'}}, 'index', 'docs')
+
+    assert store.get_many(['a-0'], 'index', ['docs', 'docs-1']) == {'a-0': {'text': 'queried'}}
+    assert store.get_many(['a-0'], 'other-index', ['docs']) == {}
+
+
+def test_deleting_an_index_drops_its_entries(tmp_path):
+    store = ChunkStore(tmp_path / 'chunks.db')
+    store.put_many({'a-0': {'text': 'old'}}, 'index-v1', 'docs')
+    store.put_many({'a-0': {'text': 'new'}}, 'index-v2', 'docs')
+
+    store.delete_namespaces('index-v1')
+
+    assert store.get_many(['a-0'], 'index-v1', ['docs']) == {}
+    assert store.get_many(['a-0'], 'index-v2', ['docs']) == {'a-0': {'text': 'new'}}
+
+
+def test_unscoped_entries_of_older_stores_are_still_read(tmp_path):
+    db = sqlite3.connect(str(tmp_path / 'chunks.db'))
+    db.execute("CREATE TABLE chunks (id TEXT PRIMARY KEY, payload BLOB)")
+    db.execute("INSERT INTO chunks VALUES (?, ?)", ('a-0', zlib.compress(json.dumps({'text': 'legacy'}).encode())))
+    db.commit()
+    db.close()
+    store = ChunkStore(tmp_path / 'chunks.db')
+    store.put_many({'a-1': {'text': 'scoped'}}, 'index', 'docs')
+
+    assert store.get_many(['a-0', 'a-1'], 'index', ['docs']) == {'a-0': {'text': 'legacy'}, 'a-1': {'text': 'scoped'}}
@@ -0,0 +1,44 @@
+from vector_db_pipeline.utils.common import iter_file_records, iter_sourced_records
+import gzip
+import json
+
+RECORDS = [{'url': 'https://example.com/a', 'text': 'first'}, {'url': 'https://example.com/b', 'text': 'second'}]
+
+
+def test_reads_json_arrays(tmp_path):
+    data_file = tmp_path / 'data.json'
+    data_file.write_text(json.dumps(RECORDS))
+
+    assert list(iter_file_records(data_file)) == RECORDS
+
+
+def test_reads_json_lines_and_skips_blank_lines(tmp_path):
+    data_file = tmp_path / 'data.jsonl'
+    data_file.write_text('\n'.join(json.dumps(record) for record in RECORDS) + '\n\n')
+
+    assert list(iter_file_records(data_file)) == RECORDS
+
+
+def test_reads_compressed_files(tmp_path):
+    data_file = tmp_path / 'data.json.gz'
+    with gzip.open(data_file, 'wt') as f:
+        json.dump(RECORDS, f)
+
+    assert list(iter_file_records(data_file)) == RECORDS
+
+
+def test_detects_json_lines_without_a_known_extension(tmp_path):
+    data_file = tmp_path / 'data.txt'
+    data_file.write_text('\n'.join(json.dumps(record) for record in RECORDS))
+
+    assert list(iter_file_records(data_file)) == RECORDS
+
+
+def test_sourced_records_keep_their_provenance(tmp_path):
+    first, second = tmp_path / 'first.json', tmp_path / 'second.jsonl'
+    first.write_text(json.dumps(RECORDS))
+    second.write_text(json.dumps(RECORDS[0]))
+
+    sources = [(path, index) for path, index, _ in iter_sourced_records([first, second])]
+
+    assert sources == [(str(first), 0), (str(first), 1), (str(second), 0)]
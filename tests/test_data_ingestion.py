@@ -0,0 +1,97 @@
+from vector_db_pipeline.components.data_ingestion import TextProcessor
+from vector_db_pipeline.components.text_chunking import SentenceSplitter, TextNormalizer
+import pytest
+
+
+def records(*names):
+    return [{'url': f"https://example.com/{name}", 'host': 'example.com', 'page_title': name,
+             'date_scraped_timestamp': 1700000000000, 'text': f"{name} first line\n{name} second line"}
+            for name in names]
+
+
+def chunk_ids(text_processor, data):
+    text_processor.reset_source_keys()
+    return {chunk['page_title']: chunk['id'] for record in data for chunk in text_processor.record_chunks(record)}
+
+
+@pytest.fixture
+def text_processor(make_config_manager):
+    # The sentence splitter does not need langchain
+    config_manager = make_config_manager(TEXT_SPLITER={'MODE': 'sentence', 'CHUNK_SIZE': 20, 'CHUNK_OVERLAP': 0})
+    return TextProcessor(config_manager.get_data_ingestion_config())
+
+
+def test_ids_do_not_depend_on_the_position_of_records(text_processor):
+    before = chunk_ids(text_processor, records('a', 'b', 'c'))
+    after = chunk_ids(text_processor, records('a', 'c'))
+
+    assert after == {title: chunk_id for title, chunk_id in before.items() if title != 'b'}
+
+
+def test_repeated_sources_get_distinct_ids(text_processor):
+    text_processor.reset_source_keys()
+    first, second = (text_processor.record_chunks(record) for record in records('a', 'a'))
+
+    assert {chunk['id'] for chunk in first}.isdisjoint(chunk['id'] for chunk in second)
+
+
+def test_sentence_splitter_keeps_whole_sentences():
+    splitter = SentenceSplitter(chunk_size=40)
+    text = "First sentence here. Second sentence here. Third one."
+
+    assert splitter.split_text(text) == ["First sentence here.", "Second sentence here. Third one."]
+
+
+def test_sentence_splitter_overlaps_trailing_sentences():
+    splitter = SentenceSplitter(chunk_size=25, overlap_size=20, overlap_sentences=1)
+
+    assert splitter.split_text("One two. Three four. Five six.") == ["One two. Three four.", "Three four. Five six."]
+    # The overlap is dropped when it would not fit the next chunk
+    assert splitter.split_text("One two. Three four. Five six seven.") == ["One two. Three four.",
+                                                                          "Five six seven."]
+
+
+def test_sentence_splitter_cuts_oversized_sentences_at_whitespace():
+    splitter = SentenceSplitter(chunk_size=10)
+
+    chunks = splitter.split_text("abcdef ghijkl mnop")
+
+    assert chunks == ["abcdef", "ghijkl", "mnop"]
+
+
+def test_normalizer_removes_boilerplate_lines_and_collapses_whitespace():
+    normalizer = TextNormalizer(boilerplate=[r'^[^\S\n]*read more[^\S\n]*$'])
+
+    text = "Title\u00a0 here\u200b\n\n  read more  \n\n\nBody\ttext"
+
+    assert normalizer.normalize(text) == "Title here\nBody text"
+
+
+def test_normalizer_reports_bytes_and_tokens_before_and_after():
+    normalizer = TextNormalizer()
+
+    normalized, stats = normalizer.normalize_with_stats("two   words")
+
+    assert normalized == "two words"
+    assert stats['bytes_before'] - stats['bytes_after'] == 2
+    assert stats['tokens_before'] == stats['tokens_after']
+
+
+def test_chunk_offsets_point_into_the_record_text(text_processor):
+    text = records('a')[0]['text']
+
+    chunks, _ = text_processor.chunk_record(records('a')[0])
+
+    assert [text[chunk['chunk_start']:chunk['chunk_end']] for chunk in chunks] == [chunk['text'] for chunk in chunks]
+
+
+def test_character_chunks_are_located_across_collapsed_separators(make_config_manager, monkeypatch):
+    # The character splitter needs langchain; only the offset lookup is under test
+    monkeypatch.setattr(TextProcessor, 'get_text_splitter', lambda self: None)
+    config_manager = make_config_manager(TEXT_SPLITER={'MODE': 'character', 'SEPARATOR': '\\n'})
+    text_processor = TextProcessor(config_manager.get_data_ingestion_config())
+    text = "first line\n\n\nsecond line\nthird line"
+
+    assert text_processor.locate_chunk(text, "first line\nsecond line", 0) == (0, 24)
+    assert text_processor.locate_chunk(text, "second line\nthird line", 1) == (13, 35)
+    assert text_processor.locate_chunk(text, "missing line", 0) is None
@@ -0,0 +1,146 @@
+from vector_db_pipeline.components.data_load import DataUpload
+from vector_db_pipeline.components.local_vector_store import LocalIndex, LocalIndexError
+from conftest import make_vectors
+import pytest
+
+
+def vector_count(upload):
+    return upload.namespace_vector_count(upload.lifecycle.index(upload.index_name), upload.namespace)
+
+
+def last_status(upload, prefix):
+    with open(upload.config.STATUS_FILE) as f:
+        return [line.strip() for line in f if line.startswith(prefix)][-1]
+
+
+@pytest.fixture
+def make_upload(make_config_manager):
+    def make(**upload_mode):
+        config_manager = make_config_manager(UPLOAD_MODE=upload_mode)
+        upload = DataUpload(config_manager.get_data_upload_config())
+        upload.recreate_index()
+        return upload
+    return make
+
+
+def test_upload_writes_every_vector(make_upload):
+    upload = make_upload()
+    vectors = make_vectors(['a', 'b', 'c'])
+    upload.upload(vectors, reset_ledger=True)
+
+    assert vector_count(upload) == len(vectors)
+    assert set(upload.ledger.entries(upload.namespace)) == {vector['id'] for vector in vectors}
+
+
+def test_sync_uploads_only_changes(make_upload):
+    upload = make_upload(MODE='sync')
+    vectors = make_vectors(['a', 'b', 'c'])
+    upload.sync_upload(vectors)
+    assert last_status(upload, 'Sync:') == f"Sync: {len(vectors)} upserted, 0 deleted, 0 unchanged"
+
+    # Source 'b' disappears and one chunk of 'c' is edited
+    remaining = [vector for vector in vectors if vector['metadata']['page_title'] != 'b']
+    remaining[-1] = dict(remaining[-1], metadata=dict(remaining[-1]['metadata'], text='edited'))
+    upload.sync_upload(remaining)
+
+    assert last_status(upload, 'Sync:') == f"Sync: 1 upserted, 3 deleted, {len(remaining) - 1} unchanged"
+    assert vector_count(upload) == len(remaining)
+
+
+def test_sync_after_sync_is_a_no_op(make_upload):
+    upload = make_upload(MODE='sync')
+    vectors = make_vectors(['a', 'b'])
+    upload.sync_upload(vectors)
+    upload.sync_upload(make_vectors(['a', 'b']))
+
+    assert last_status(upload, 'Sync:') == f"Sync: 0 upserted, 0 deleted, {len(vectors)} unchanged"
+
+
+def test_sync_keeps_values_rounded_by_the_artifact_unchanged(make_upload):
+    upload = make_upload(MODE='sync')
+    vectors = make_vectors(['a'])
+    upload.sync_upload(vectors)
+    # The JSON artifact stores 15 significant digits of the streamed float64 values
+    rounded = [dict(vector, values=[float(f"{value:.15g}") for value in vector['values']]) for vector in vectors]
+    upload.sync_upload(rounded)
+
+    assert last_status(upload, 'Sync:') == f"Sync: 0 upserted, 0 deleted, {len(vectors)} unchanged"
+
+
+def test_upload_keeps_removed_sources_by_default(make_upload):
+    upload = make_upload()
+    upload.upload(make_vectors(['a', 'b']), reset_ledger=True)
+    upload.upload(make_vectors(['a']))
+
+    assert vector_count(upload) == 6
+
+
+def test_upload_purges_removed_sources_when_enabled(make_upload):
+    upload = make_upload(PURGE_REMOVED_SOURCES=True)
+    upload.upload(make_vectors(['a', 'b']), reset_ledger=True)
+    upload.upload(make_vectors(['a']))
+
+    assert vector_count(upload) == 3
+    assert set(upload.ledger.entries(upload.namespace)) == {'a-0', 'a-1', 'a-2'}
+    assert last_status(upload, 'Removed sources purged:') == "Removed sources purged: 1 urls, 3 vectors"
+
+
+def test_sparse_vectors_require_a_dotproduct_index(make_config_manager):
+    with pytest.raises(ValueError):
+        make_config_manager(SPARSE={'ENABLED': True}, INDEX_INFO={'METRIC': 'cosine'}).get_data_upload_config()
+
+    index = LocalIndex('test', 2, 'cosine')
+    with pytest.raises(LocalIndexError):
+        index.upsert([{'id': 'a', 'values': [1.0, 0.0], 'sparse_values': {'indices': [0], 'values': [1.0]}}])
+
+
+def test_hybrid_query_adds_sparse_scores():
+    index = LocalIndex('test', 2, 'dotproduct')
+    index.upsert([{'id': 'dense', 'values': [1.0, 0.0]},
+                  {'id': 'sparse', 'values': [0.5, 0.0], 'sparse_values': {'indices': [7], 'values': [2.0]}}])
+
+    dense = index.query(vector=[1.0, 0.0], top_k=2)
+    hybrid = index.query(vector=[1.0, 0.0], top_k=2, sparse_vector={'indices': [7], 'values': [1.0]})
+
+    assert [match['id'] for match in dense['matches']] == ['dense', 'sparse']
+    assert [match['id'] for match in hybrid['matches']] == ['sparse', 'dense']
+    assert hybrid['matches'][0]['score'] == pytest.approx(2.5)
+
+
+def test_sharded_upload_writes_the_metrics_of_every_namespace(make_config_manager):
+    config_manager = make_config_manager(TELEMETRY={'PROMETHEUS': True}, SHARDING={'MODE': 'hash', 'HASH_BUCKETS': 4})
+    upload = DataUpload(config_manager.get_data_upload_config())
+    upload.recreate_index()
+    upload.upload(make_vectors([f"page{number}" for number in range(20)]), reset_ledger=True)
+
+    with open(upload.config.prometheus_textfile) as f:
+        metrics = f.read()
+    namespaces = {line.split('namespace="')[1].split('"')[0] for line in metrics.splitlines()
+                  if line.startswith('vector_upload_vectors{')}
+
+    assert namespaces == set(upload.namespaces_of()) - {upload.namespace}
+    assert len(namespaces) > 1
+
+
+def test_unknown_chunk_offsets_are_left_out_of_the_metadata():
+    # Artifact rows of chunks without offsets hold NaN once loaded with pandas
+    vector = make_vectors(['a'], chunks_per_url=1)[0]
+    row = dict(vector['metadata'], id=vector['id'], values=vector['values'], chunk_start=float('nan'),
+               chunk_end=float('nan'))
+
+    assert 'chunk_start' not in DataUpload.to_pinecone_vector(row)['metadata']
+    assert DataUpload.to_pinecone_vector(dict(row, chunk_start=3, chunk_end=9))['metadata']['chunk_end'] == 9
+
+
+def test_convergence_needs_the_uploaded_vectors_not_only_the_namespace_count(make_config_manager):
+    config_manager = make_config_manager(CONVERGENCE={'TIMEOUT': 0})
+    upload = DataUpload(config_manager.get_data_upload_config())
+    upload.recreate_index()
+    upload.upload(make_vectors(['a', 'b']), reset_ledger=True)
+    index = upload.lifecycle.index(upload.index_name)
+    # Same ids with new values, as if the upsert were not visible yet
+    changed = make_vectors(['a'], seed=1)
+
+    assert vector_count(upload) >= len(changed)
+    assert not upload.wait_for_convergence(index, upload.namespace, changed)
+    assert upload.wait_for_convergence(index, upload.namespace, make_vectors(['a']))
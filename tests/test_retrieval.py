@@ -0,0 +1,81 @@
+from vector_db_pipeline.components.data_load import DataUpload
+from vector_db_pipeline.components.retrieval import Retriever
+from vector_db_pipeline.components.projection import PCAProjector
+from conftest import make_vectors
+import numpy as np
+import pytest
+
+
+class HashEmbeddings:
+    # Deterministic stand-in for the embedding model, so no API key is needed
+    def embed_documents(self, texts):
+        return [[float((len(text) * (position + 1)) % 7) + 1.0 for position in range(8)] for text in texts]
+
+
+@pytest.mark.parametrize('target', ['namespace', 'index'])
+def test_retriever_follows_a_blue_green_switch(make_config_manager, target):
+    config_manager = make_config_manager(BLUE_GREEN={'TARGET': target, 'KEEP_PREVIOUS': False})
+    upload = DataUpload(config_manager.get_data_upload_config())
+    upload.recreate_index()
+    upload.upload(make_vectors(['old']), reset_ledger=True)
+    retriever = Retriever(config_manager.get_retrieval_config(), embed_model=HashEmbeddings())
+    query = make_vectors(['new'])[0]['values']
+    assert {result.page_title for result in retriever.query_vector(query)} == {'old'}
+
+    upload.blue_green_rebuild(make_vectors(['new']))
+    results = retriever.query_vector(query)
+
+    assert (retriever.index_name, retriever.namespace) == (upload.index_name, upload.namespace)
+    assert {result.page_title for result in results} == {'new'}
+
+
+def test_hybrid_queries_bypass_the_result_cache(make_config_manager):
+    config_manager = make_config_manager(RESULT_CACHE={'ENABLED': True}, INDEX_INFO={'METRIC': 'dotproduct'})
+    upload = DataUpload(config_manager.get_data_upload_config())
+    upload.recreate_index()
+    upload.upload(make_vectors(['a']), reset_ledger=True)
+    retriever = Retriever(config_manager.get_retrieval_config(), embed_model=HashEmbeddings())
+    query = make_vectors(['a'])[0]['values']
+
+    for sparse_vector in ({'indices': [1], 'values': [1.0]}, {'indices': [2], 'values': [1.0]}):
+        retriever.query_vector(query, sparse_vector=sparse_vector)
+    assert retriever.result_cache.stats()['entries'] == 0
+
+    retriever.query_vector(query)
+    retriever.query_vector(query)
+    assert retriever.result_cache.stats()['hits'] == 1
+
+
+def test_offloaded_text_of_the_previous_target_survives_a_namespace_rebuild(make_config_manager):
+    config_manager = make_config_manager(BLUE_GREEN={'TARGET': 'namespace', 'KEEP_PREVIOUS': True},
+                                         METADATA_OFFLOAD={'ENABLED': True})
+    upload = DataUpload(config_manager.get_data_upload_config())
+    upload.recreate_index()
+    upload.upload(make_vectors(['a']), reset_ledger=True)
+    old_index_name, old_namespace = upload.index_name, upload.namespace
+    rebuilt = make_vectors(['a'])
+    for vector in rebuilt:
+        vector['metadata']['text'] = 'rebuilt ' + vector['metadata']['text']
+    upload.blue_green_rebuild(rebuilt)
+    # Removing the ids from the new target must not drop the text the previous target still serves
+    upload.batch_delete(upload.lifecycle.index(upload.index_name), [vector['id'] for vector in rebuilt], upload.namespace)
+    retriever = Retriever(config_manager.get_retrieval_config(), embed_model=HashEmbeddings())
+
+    results = retriever.query_vector(rebuilt[0]['values'], namespace=old_namespace)
+
+    assert retriever.index_name == old_index_name
+    assert results and all(result.text.startswith('chunk') for result in results)
+
+
+def test_projected_queries_are_normalized_like_documents(make_config_manager):
+    config_manager = make_config_manager(PROJECTION={'ENABLED': True, 'TARGET_DIM': 4})
+    DataUpload(config_manager.get_data_upload_config()).recreate_index()
+    config = config_manager.get_retrieval_config()
+    corpus = [vector['values'] for vector in make_vectors(['a', 'b', 'c'])]
+    PCAProjector.fit(corpus, 4).save(config.projection_file)
+    retriever = Retriever(config, embed_model=HashEmbeddings())
+
+    vectors = retriever.embed_queries(['short query', 'a somewhat longer query'])
+
+    assert np.asarray(vectors).shape == (2, 4)
+    assert np.linalg.norm(vectors, axis=1) == pytest.approx([1.0, 1.0])
@@ -0,0 +1,73 @@
+from vector_db_pipeline.components.sparse_encoder import BM25Encoder
+import json
+
+CORPUS = ['the product roadmap sets priorities',
+          'a roadmap is not a release plan',
+          'discovery finds the product worth building']
+
+
+def dot(query, document):
+    weights = dict(zip(document['indices'], document['values']))
+    return sum(value * weights.get(index, 0.0) for index, value in zip(query['indices'], query['values']))
+
+
+def test_term_indices_are_append_only():
+    encoder = BM25Encoder()
+    encoder.fit(CORPUS[:1])
+    indices = dict(encoder.vocabulary)
+    encoder.fit(CORPUS)
+
+    assert all(encoder.vocabulary[term] == index for term, index in indices.items())
+
+
+def test_query_scores_rank_matching_documents_first():
+    encoder = BM25Encoder()
+    encoder.fit(CORPUS)
+    documents = encoder.encode_documents(CORPUS)
+    query = encoder.encode_queries(['release plan'])[0]
+
+    scores = [dot(query, document) for document in documents]
+
+    assert max(range(len(scores)), key=scores.__getitem__) == 1
+    assert scores[0] == scores[2] == 0.0
+
+
+def test_queries_skip_unknown_terms():
+    encoder = BM25Encoder()
+    encoder.fit(CORPUS)
+
+    assert encoder.encode_queries(['unknown words'])[0] == {'indices': [], 'values': []}
+
+
+def test_document_vectors_stay_unchanged_when_the_corpus_grows(tmp_path):
+    encoder = BM25Encoder()
+    encoder.fit(CORPUS[:2])
+    before = encoder.encode_documents(CORPUS[:1])
+    encoder.save(tmp_path / 'vocab.json')
+
+    reloaded = BM25Encoder.load(tmp_path / 'vocab.json')
+    reloaded.reset_statistics()
+    reloaded.fit(CORPUS + ['a much longer document ' * 20])
+
+    assert reloaded.encode_documents(CORPUS[:1]) == before
+
+    reloaded.refit()
+    reloaded.fit(CORPUS + ['a much longer document ' * 20])
+
+    assert reloaded.encode_documents(CORPUS[:1]) != before
+
+
+def test_load_reads_files_without_a_frozen_length(tmp_path):
+    encoder = BM25Encoder()
+    encoder.fit(CORPUS)
+    encoder.save(tmp_path / 'vocab.json')
+    with open(tmp_path / 'vocab.json') as f:
+        payload = json.load(f)
+    del payload['document_avg_length']
+    with open(tmp_path / 'vocab.json', 'w') as f:
+        json.dump(payload, f)
+
+    reloaded = BM25Encoder.load(tmp_path / 'vocab.json')
+
+    assert reloaded.document_avg_length == encoder.avg_length
+    assert reloaded.encode_documents(CORPUS) == encoder.encode_documents(CORPUS)
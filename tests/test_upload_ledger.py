@@ -0,0 +1,54 @@
+from vector_db_pipeline.components.upload_ledger import UploadLedger
+from conftest import make_vectors
+import numpy as np
+
+
+def test_diff_splits_new_changed_stale_and_unchanged(tmp_path):
+    ledger = UploadLedger(tmp_path / 'ledger.json')
+    vectors = make_vectors(['a', 'b'])
+    ledger.record(vectors, 'blog')
+
+    edited = dict(vectors[0], metadata=dict(vectors[0]['metadata'], text='edited'))
+    current = [edited] + vectors[1:3] + make_vectors(['c'], chunks_per_url=1)
+    changed, stale_ids = ledger.diff(current, 'blog')
+
+    assert [vector['id'] for vector in changed] == ['a-0', 'c-0']
+    assert sorted(stale_ids) == ['b-0', 'b-1', 'b-2']
+
+
+def test_diff_is_scoped_to_the_namespace(tmp_path):
+    ledger = UploadLedger(tmp_path / 'ledger.json')
+    vectors = make_vectors(['a'])
+    ledger.record(vectors, 'blog')
+
+    changed, stale_ids = ledger.diff(vectors, 'blog--01')
+
+    assert len(changed) == len(vectors)
+    assert stale_ids == []
+
+
+def test_content_hash_uses_float32_precision():
+    vector = make_vectors(['a'], chunks_per_url=1)[0]
+    float32 = dict(vector, values=np.asarray(vector['values'], dtype=np.float32).astype(float).tolist())
+
+    assert UploadLedger.content_hash(vector) == UploadLedger.content_hash(float32)
+
+
+def test_content_hash_covers_metadata_and_sparse_values():
+    vector = make_vectors(['a'], chunks_per_url=1)[0]
+    sparse = dict(vector, sparse_values={'indices': [3], 'values': [0.5]})
+    hashes = {UploadLedger.content_hash(vector), UploadLedger.content_hash(sparse),
+              UploadLedger.content_hash(dict(vector, metadata=dict(vector['metadata'], url='other')))}
+
+    assert len(hashes) == 3
+
+
+def test_ledger_round_trips_through_its_file(tmp_path):
+    ledger = UploadLedger(tmp_path / 'ledger.json')
+    vectors = make_vectors(['a'])
+    ledger.record(vectors, 'blog')
+    ledger.save()
+
+    changed, stale_ids = UploadLedger(tmp_path / 'ledger.json').diff(vectors, 'blog')
+
+    assert changed == [] and stale_ids == []